@@ -0,0 +1,102 @@
+"""
+性能基准入口
+用合成标题测试逐层与端到端吞吐量，结果保存为 JSON，可与基线对比并在吞吐量回退时失败退出
+"""
+import argparse
+import json
+import os
+import sys
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.benchmark import (compare_results, find_regressions, load_results, run_benchmarks,
+                           save_results)
+from src.classifier import GlobalLightClassifier
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='全球灯光类目分类引擎 - 性能基准',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  # 完整基准（10k/100k/1M 行），保存为基线
+  python benchmark.py --output benchmarks/baseline.json
+
+  # 快速基准，与基线对比，吞吐量下降超过20%时以非零状态退出
+  python benchmark.py --rows 10000 100000 --baseline benchmarks/baseline.json
+
+  # 放宽回退容忍度
+  python benchmark.py --baseline benchmarks/baseline.json --tolerance 0.3
+        '''
+    )
+
+    parser.add_argument('--config-dir', default='config', help='配置文件目录 (默认: config)')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help='端到端基准的行数 (默认: 10000 100000 1000000)')
+    parser.add_argument('--layer-rows', type=int, default=20000, help='逐层基准的行数 (默认: 20000)')
+    parser.add_argument('--row-mode-max', type=int, default=10000,
+                        help='逐行模式只在不超过该行数时测试 (默认: 10000)')
+    parser.add_argument('--repeat', type=int, default=3, help='每项重复次数，取最短耗时 (默认: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='合成数据随机种子 (默认: 0)')
+    parser.add_argument('--output', default='benchmarks/results.json',
+                        help='结果文件路径 (默认: benchmarks/results.json)')
+    parser.add_argument('--baseline', help='基线结果文件，提供时对比吞吐量')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='允许的吞吐量下降比例 (默认: 0.2)')
+    parser.add_argument('--word-boundary', type=int, default=0, metavar='N',
+                        help='长度不超过N的纯英文关键词按词边界匹配 (默认: 0，全部子串匹配)')
+
+    args = parser.parse_args()
+
+    signals_path = os.path.join(args.config_dir, 'signals.json')
+    scoring_path = os.path.join(args.config_dir, 'scoring_models.json')
+    filters_path = os.path.join(args.config_dir, 'hard_filters.json')
+    for path in (signals_path, scoring_path, filters_path):
+        if not os.path.exists(path):
+            print(f"错误: 配置文件不存在: {path}")
+            sys.exit(1)
+    if args.baseline and not os.path.exists(args.baseline):
+        print(f"错误: 基线文件不存在: {args.baseline}")
+        sys.exit(1)
+
+    classifier = GlobalLightClassifier(signals_path, scoring_path, filters_path,
+                                       word_boundary_max_len=args.word_boundary)
+    with open(signals_path, 'r', encoding='utf-8') as f:
+        signals = json.load(f)
+
+    report = run_benchmarks(classifier, signals, classifier.hard_filters['accessories'], args.rows,
+                            layer_rows=args.layer_rows, row_mode_max=args.row_mode_max,
+                            repeat=args.repeat, seed=args.seed, log=lambda m: print(f'  {m}'))
+
+    print(f"\n{'项目':<32} {'行数':>9} {'耗时(s)':>10} {'行/秒':>12}")
+    print('-' * 66)
+    for name, result in report['results'].items():
+        print(f"{name:<32} {result['rows']:>9} {result['seconds']:>10.3f} {result['rows_per_sec']:>12,.0f}")
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    save_results(report, args.output)
+    print(f'\n结果已保存: {args.output}')
+
+    if args.baseline:
+        comparison = compare_results(report, load_results(args.baseline))
+        print(f"\n基线对比: {args.baseline}")
+        print(f"{'项目':<32} {'基线 行/秒':>12} {'本次 行/秒':>12} {'比值':>7}")
+        print('-' * 66)
+        for name, before, after, ratio in comparison:
+            print(f'{name:<32} {before:>12,.0f} {after:>12,.0f} {ratio:>7.2f}')
+
+        regressions = find_regressions(comparison, args.tolerance)
+        if regressions:
+            names = ', '.join(row[0] for row in regressions)
+            print(f'\n错误: 吞吐量低于基线 {1 - args.tolerance:.0%}: {names}')
+            sys.exit(1)
+        print(f'\n无吞吐量回退 (容忍度 {args.tolerance:.0%})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+配置编译入口
+把三个配置文件编译为可直接加载的分类器快照（部署或修改配置后运行一次）
+"""
+import argparse
+import os
+import sys
+import time
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.snapshot import compile_snapshot, default_snapshot_path
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='全球灯光类目分类引擎 - 编译配置快照',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  # 编译到默认位置 config/.compiled/engine-wb0.pickle
+  python compile_config.py
+
+  # 之后的运行直接加载快照
+  python main.py --data 日本灯光类.csv --snapshot config/.compiled/engine-wb0.pickle
+        '''
+    )
+
+    parser.add_argument('--config-dir', default='config', help='配置文件目录 (默认: config)')
+    parser.add_argument('--output', help='快照文件路径 (默认: <配置目录>/.compiled/engine-wb<N>.pickle)')
+    parser.add_argument('--word-boundary', type=int, default=0, metavar='N',
+                        help='长度不超过N的纯英文关键词按词边界匹配 (默认: 0，全部子串匹配)')
+
+    args = parser.parse_args()
+
+    signals_path = os.path.join(args.config_dir, 'signals.json')
+    scoring_path = os.path.join(args.config_dir, 'scoring_models.json')
+    filters_path = os.path.join(args.config_dir, 'hard_filters.json')
+    for path in (signals_path, scoring_path, filters_path):
+        if not os.path.exists(path):
+            print(f"错误: 配置文件不存在: {path}")
+            sys.exit(1)
+
+    output = args.output or default_snapshot_path(args.config_dir, args.word_boundary)
+    started = time.perf_counter()
+    try:
+        classifier = compile_snapshot(signals_path, scoring_path, filters_path, output,
+                                      word_boundary_max_len=args.word_boundary)
+    except Exception as e:
+        print(f"错误: 编译失败: {e}")
+        sys.exit(1)
+
+    print(f'快照已保存: {output} ({os.path.getsize(output)} 字节, '
+          f'{len(classifier.tags)} 个标签, {len(classifier.scoring_engine.categories)} 个品类, '
+          f'{time.perf_counter() - started:.3f}s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+SQL 编译入口
+把三个配置文件编译为等价的 SQL 查询，直接在数仓内完成分类（无需导出数据）
+"""
+import argparse
+import os
+import sys
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.classifier import GlobalLightClassifier
+from src.sqlgen import DIALECTS, compile_sql
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='全球灯光类目分类引擎 - 编译为 SQL',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  # 输出到标准输出（输入表 items 需包含 clean_title、site、raw_* 规格列）
+  python compile_sql.py --source items
+
+  # 编译为通用 SQL 并保存
+  python compile_sql.py --source dw.light_titles --dialect ansi --output classify.sql
+
+说明:
+  sqlite 方言经过测试，输出与 Python 分类器逐行一致。
+  ansi 方言的 decision_reason 中得分由 CAST(... AS VARCHAR) 转为文本，浮点数格式因引擎而异
+  （科学计数法、末尾 .0 等），不保证与 Python 输出的裁决原因字符串一致；预测品类与得分列不受影响。
+        '''
+    )
+
+    parser.add_argument('--config-dir', default='config', help='配置文件目录 (默认: config)')
+    parser.add_argument('--source', default='items', help='输入表名、视图名或带括号的子查询 (默认: items)')
+    parser.add_argument('--dialect', choices=list(DIALECTS), default='sqlite',
+                        help='SQL 方言：sqlite 使用 INSTR 并物化中间结果；ansi 使用 POSITION，'
+                             '裁决原因中的得分格式因引擎而异 (默认: sqlite)')
+    parser.add_argument('--output', help='SQL 文件路径 (默认: 输出到标准输出)')
+
+    args = parser.parse_args()
+
+    signals_path = os.path.join(args.config_dir, 'signals.json')
+    scoring_path = os.path.join(args.config_dir, 'scoring_models.json')
+    filters_path = os.path.join(args.config_dir, 'hard_filters.json')
+    for path in (signals_path, scoring_path, filters_path):
+        if not os.path.exists(path):
+            print(f"错误: 配置文件不存在: {path}")
+            sys.exit(1)
+
+    try:
+        classifier = GlobalLightClassifier(signals_path, scoring_path, filters_path)
+        sql = compile_sql(classifier, source=args.source, dialect=args.dialect)
+    except Exception as e:
+        print(f"错误: 编译失败: {e}")
+        sys.exit(1)
+
+    if args.output is None:
+        sys.stdout.write(sql)
+        return
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(sql)
+    print(f'SQL 已保存: {args.output} ({len(sql)} 字符, {len(classifier.tags)} 个标签, '
+          f'{len(classifier.scoring_engine.categories)} 个品类)')
+
+
+if __name__ == '__main__':
+    main()
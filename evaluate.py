@@ -0,0 +1,130 @@
+"""
+评估入口
+用整列引擎分类标注数据，输出混淆矩阵、各品类精确率/召回率、GMV 加权准确率与裁决原因分布
+"""
+import argparse
+import os
+import sys
+import time
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.classifier import INPUT_COLUMNS
+from src.evaluation import compare_reports, evaluate, load_report, print_report, save_report
+from src.parallel import ParallelProcessor
+from src.pipeline import read_input
+from src.snapshot import load_classifier
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='全球灯光类目分类引擎 - 标注数据评估',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  # 以 子类目(中文) 列为标注评估全量数据，按 GMV 加权
+  python evaluate.py --data 全市场灯光类.csv --gmv-column gmv --output data/eval/report.json
+
+  # 人工整理的真值表
+  python evaluate.py --data ground_truth.csv --label-column expected_category
+
+  # 修改配置后与上一次的报告对比，并导出误判行
+  python evaluate.py --data 全市场灯光类.csv --config-dir config_new --baseline data/eval/report.json \\
+      --errors data/eval/errors.csv
+        '''
+    )
+
+    parser.add_argument('--data', required=True, help='标注数据文件路径 (CSV/Excel/Parquet)')
+    parser.add_argument('--label-column', default='子类目(中文)', help='标注品类列 (默认: 子类目(中文))')
+    parser.add_argument('--gmv-column', help='GMV 列，提供时计算 GMV 加权准确率')
+    parser.add_argument('--config-dir', default='config', help='配置文件目录 (默认: config)')
+    parser.add_argument('--sample', type=int, help='只评估前N条数据')
+    parser.add_argument('--workers', type=int, default=1, help='并行进程数 (默认: 1，单进程)')
+    parser.add_argument('--word-boundary', type=int, default=0, metavar='N',
+                        help='长度不超过N的纯英文关键词按词边界匹配 (默认: 0，全部子串匹配)')
+    parser.add_argument('--snapshot', metavar='PATH', help='编译配置快照文件（见 compile_config.py）')
+    parser.add_argument('--output', help='评估报告 JSON 路径')
+    parser.add_argument('--baseline', help='基线评估报告 JSON，打印各项指标的变化')
+    parser.add_argument('--errors', metavar='PATH', help='导出误判行 CSV（标题、站点、标注、预测、裁决原因）')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.data):
+        print(f"错误: 输入文件不存在: {args.data}")
+        sys.exit(1)
+    signals_path = os.path.join(args.config_dir, 'signals.json')
+    scoring_path = os.path.join(args.config_dir, 'scoring_models.json')
+    filters_path = os.path.join(args.config_dir, 'hard_filters.json')
+    for path in (signals_path, scoring_path, filters_path):
+        if not os.path.exists(path):
+            print(f"错误: 配置文件不存在: {path}")
+            sys.exit(1)
+    if args.baseline and not os.path.exists(args.baseline):
+        print(f"错误: 基线报告不存在: {args.baseline}")
+        sys.exit(1)
+
+    try:
+        classifier, _ = load_classifier(signals_path, scoring_path, filters_path, snapshot_path=args.snapshot,
+                                        word_boundary_max_len=args.word_boundary)
+    except Exception as e:
+        print(f"错误: 分类器初始化失败: {e}")
+        sys.exit(1)
+
+    print(f'加载数据: {args.data}')
+    columns = INPUT_COLUMNS + [args.label_column] + ([args.gmv_column] if args.gmv_column else [])
+    started = time.perf_counter()
+    try:
+        df = read_input(args.data, sample=args.sample, columns=columns)
+    except Exception as e:
+        print(f"错误: 数据加载失败: {e}")
+        sys.exit(1)
+    for col in [args.label_column, args.gmv_column]:
+        if col and col not in df.columns:
+            print(f"错误: 数据中没有列: {col}")
+            sys.exit(1)
+    print(f'  {len(df)} 条 ({time.perf_counter() - started:.2f}s)')
+
+    started = time.perf_counter()
+    try:
+        with ParallelProcessor(classifier, args.workers, stage=2, mode='columnar') as processor:
+            result = processor.process(df)
+    except Exception as e:
+        print(f"错误: 分类失败: {e}")
+        sys.exit(1)
+    print(f'分类: {time.perf_counter() - started:.2f}s')
+
+    started = time.perf_counter()
+    report = evaluate(df[args.label_column], result['predicted_category'], result['decision_reason'],
+                      weights=df[args.gmv_column] if args.gmv_column else None,
+                      categories=classifier.scoring_engine.categories)
+    report['config_hash'] = classifier.config_hash
+    print(f'评估: {time.perf_counter() - started:.2f}s')
+    print_report(report)
+
+    if args.baseline:
+        print('\n与基线对比:')
+        for name, before, after, delta in compare_reports(report, load_report(args.baseline)):
+            if delta:
+                print(f'  {name:<28} {before:>8.2%} → {after:>8.2%} ({delta:+.2%})')
+
+    if args.output:
+        output_dir = os.path.dirname(args.output)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        save_report(report, args.output)
+        print(f'\n评估报告已保存: {args.output}')
+
+    if args.errors:
+        labels = df[args.label_column].astype(object).str.strip().to_numpy()
+        wrong = (df[args.label_column].notna().to_numpy() & (labels != '')
+                 & (labels != result['predicted_category'].to_numpy()))
+        errors = result.loc[wrong, ['SKU标题', 'site', 'clean_title', 'predicted_category', 'decision_reason']]
+        errors.insert(2, args.label_column + '_标注', labels[wrong])
+        errors.to_csv(args.errors, index=False, encoding='utf-8-sig')
+        print(f'误判行已保存: {args.errors} ({len(errors)} 条)')
+
+
+if __name__ == '__main__':
+    main()
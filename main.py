@@ -3,7 +3,6 @@
 支持命令行参数，支持CSV/Excel输入，支持采样模式
 """
 import argparse
-import pandas as pd
 import json
 import os
 import sys
@@ -11,7 +10,19 @@ import sys
 # 添加src目录到路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.classifier import GlobalLightClassifier
+from src.classifier import INPUT_COLUMNS
+from src.features import FeatureWriter
+from src.parallel import ParallelProcessor
+from src.pipeline import (RunningStats, excel_sidecar, iter_input_chunks, make_writer, read_input,
+                          resolve_output_path)
+from src.profiler import LayerProfiler
+from src.snapshot import load_classifier
+from src.store import ClassificationStore
+
+
+def _parse_stage(value):
+    """--stage 参数：1 / 2 / both"""
+    return value if value == 'both' else int(value)
 
 
 def main():
@@ -27,11 +38,41 @@ def main():
   # Stage1: 原始标签输出（验证关键词转换）
   python main.py --data 日本灯光类.csv --stage 1 --output data/processed/stage1_raw.csv
 
+  # 验证运行：第一至三层只算一次，同一文件同时输出 Stage1 与 Stage2 列
+  python main.py --data 日本灯光类.csv --stage both --output data/processed/validation.csv
+
   # 快速测试（只处理前1000条）
   python main.py --data 日本灯光类.csv --sample 1000
 
-  # Excel输入
+  # 多进程并行（8个进程）
+  python main.py --data 日本灯光类.csv --workers 8
+
+  # 流式处理超大文件（每块10万条）
+  python main.py --data 全市场灯光类.csv --chunksize 100000
+
+  # 持久化缓存：重复运行只分类新标题（配置变更自动失效）
+  python main.py --data 日本灯光类.csv --cache-dir data/cache
+
+  # Parquet 输出（定类型列，站点/品类为类别型），按站点分区
+  python main.py --data 日本灯光类.csv --output-format parquet --partition-by site
+
+  # 保存特征快照，之后只改评分模型/裁决规则时用 rescore.py 秒级重跑
+  python main.py --data 日本灯光类.csv --save-features data/features
+
+  # 分层剖析：打印各层耗时与内存快照，并保存为 output_profile.json
+  python main.py --data 日本灯光类.csv --profile
+
+  # 短任务冷启动：复用编译后的配置快照（配置变更时自动重新编译）
+  python main.py --data 日本灯光类.csv --snapshot config/.compiled/engine-wb0.pickle
+
+  # Excel输入（只读模式流式读取）
   python main.py --data data.xlsx --output output.csv
+
+  # Excel 首次运行转换为 Parquet 旁路文件（按文件哈希命名），之后的运行直接读取
+  python main.py --data data.xlsx --excel-cache data/cache --chunksize 100000
+
+  # 惰性求值：配件/形态锁定/得分上下界已能确定结果的标题跳过规格提取与评分
+  python main.py --data 日本灯光类.csv --lazy
         '''
     )
 
@@ -39,10 +80,57 @@ def main():
     parser.add_argument('--config-dir', default='config', help='配置文件目录 (默认: config)')
     parser.add_argument('--output', default='data/processed/output.csv', help='输出文件路径 (默认: data/processed/output.csv)')
     parser.add_argument('--sample', type=int, help='只处理前N条数据（用于快速测试）')
-    parser.add_argument('--stage', type=int, default=2, choices=[1, 2], help='输出阶段: 1=原始标签, 2=归一化+分类 (默认: 2)')
+    parser.add_argument('--stage', type=_parse_stage, default=2, choices=[1, 2, 'both'],
+                        help='输出阶段: 1=原始标签, 2=归一化+分类, both=两阶段列一次输出 (默认: 2)')
+    parser.add_argument('--mode', default='columnar', choices=['row', 'columnar'],
+                        help='执行模式: row=逐行, columnar=整列批量 (默认: columnar，结果与逐行一致)')
+    parser.add_argument('--workers', type=int, default=1, help='并行进程数 (默认: 1，单进程)')
+    parser.add_argument('--chunksize', type=int, help='流式模式：每次读取并处理N条，逐块追加写出（内存占用恒定）')
+    parser.add_argument('--cache-size', type=int, default=100000,
+                        help='逐行模式(--mode row)下标题级LRU缓存的最大条目数，0为关闭 (默认: 100000)；整列模式始终按标题去重')
+    parser.add_argument('--cache-dir',
+                        help='持久化分类缓存目录（SQLite），跨运行复用已分类标题，仅 Stage2 整列模式生效')
+    parser.add_argument('--output-format', default='csv', choices=['csv', 'parquet'],
+                        help='输出格式: csv=字典列, parquet=定类型列（得分float32/标签uint8/规格float32），仅整列模式 (默认: csv)')
+    parser.add_argument('--partition-by', choices=['site', 'predicted_category'],
+                        help='Parquet 输出按该列分区（输出路径为目录）')
+    parser.add_argument('--save-features', metavar='DIR',
+                        help='保存第一至三层特征快照到目录，供 rescore.py 只重跑评分与裁决，仅 Stage2 整列模式生效')
+    parser.add_argument('--word-boundary', type=int, default=0, metavar='N',
+                        help='长度不超过N的纯英文关键词按词边界匹配，如 pad/ring/ttl (默认: 0，全部子串匹配)')
+    parser.add_argument('--excel-cache', metavar='DIR',
+                        help='Excel 输入转换为 Parquet 旁路文件的目录（按文件哈希复用，需要 pyarrow）')
+    parser.add_argument('--snapshot', metavar='PATH',
+                        help='编译配置快照文件：有效时直接加载，不存在或配置已变更时重新编译并写入')
+    parser.add_argument('--lazy', action='store_true',
+                        help='惰性求值：先做配件拦截/形态锁定，再按得分上下界裁决，结果已确定的标题跳过规格提取与评分'
+                             '（这些行的 scores_all/features_num 为 NaN），仅 Stage2')
+    parser.add_argument('--profile', action='store_true',
+                        help='分层剖析：统计五层耗时与每块内存快照，打印汇总表并保存为 <输出名>_profile.json，仅单进程')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='剖析时另用 tracemalloc 记录每块的分配峰值（明显拖慢运行）')
 
     args = parser.parse_args()
 
+    if args.output_format == 'parquet' and args.mode != 'columnar':
+        print('错误: --output-format parquet 仅支持整列模式 (--mode columnar)')
+        sys.exit(1)
+    if args.partition_by and args.output_format != 'parquet':
+        print('错误: --partition-by 需要 --output-format parquet')
+        sys.exit(1)
+    if args.partition_by == 'predicted_category' and args.stage == 1:
+        print('错误: 按 predicted_category 分区不支持 Stage1')
+        sys.exit(1)
+    args.output = resolve_output_path(args.output, args.output_format, args.partition_by)
+    if args.profile_memory:
+        args.profile = True
+    if args.lazy and (args.stage != 2 or args.cache_dir or args.save_features):
+        print('错误: --lazy 仅支持 Stage2，且不能与 --cache-dir / --save-features 同时使用')
+        sys.exit(1)
+    if args.profile and args.workers > 1:
+        print('错误: --profile 仅支持单进程 (--workers 1)')
+        sys.exit(1)
+
     # 验证输入文件
     if not os.path.exists(args.data):
         print(f"错误: 输入文件不存在: {args.data}")
@@ -68,6 +156,16 @@ def main():
             print(f"错误: 配置文件不存在: {path}")
             sys.exit(1)
 
+    # Excel 旁路文件：首次转换，之后直接读取
+    if args.excel_cache and (args.data.endswith('.xlsx') or args.data.endswith('.xls')):
+        try:
+            sidecar = excel_sidecar(args.data, args.excel_cache)
+        except Exception as e:
+            print(f"错误: Excel 转换失败: {e}")
+            sys.exit(1)
+        print(f'Excel 旁路文件: {sidecar}')
+        args.data = sidecar
+
     # 初始化分类器
     print('初始化分类器...')
     print(f'  - 信号词典: {signals_path}')
@@ -75,81 +173,143 @@ def main():
     print(f'  - 硬拦截规则: {filters_path}')
 
     try:
-        classifier = GlobalLightClassifier(signals_path, scoring_path, filters_path)
+        classifier, loaded = load_classifier(signals_path, scoring_path, filters_path,
+                                             snapshot_path=args.snapshot,
+                                             word_boundary_max_len=args.word_boundary,
+                                             cache_size=args.cache_size, lazy=args.lazy)
     except Exception as e:
         print(f"错误: 分类器初始化失败: {e}")
         sys.exit(1)
+    if args.snapshot:
+        print(f"  - 编译快照: {args.snapshot} ({'已加载' if loaded else '已重新编译'})")
 
-    # 加载数据
-    print(f'\n加载数据: {args.data}')
-    try:
-        if args.data.endswith('.xlsx') or args.data.endswith('.xls'):
-            df = pd.read_excel(args.data)
-        else:
-            df = pd.read_csv(args.data)
-    except Exception as e:
-        print(f"错误: 数据加载失败: {e}")
-        sys.exit(1)
-
-    # 采样
-    if args.sample:
-        total_rows = len(df)
-        df = df.head(args.sample)
-        print(f'采样模式: {args.sample} / {total_rows} 条')
-
-    print(f'数据总量: {len(df)} 条')
-
-    # 执行分类
-    print(f'\n开始分类 (Stage {args.stage})...')
+    if args.profile:
+        classifier.profiler = LayerProfiler(trace_memory=args.profile_memory)
 
     def progress_callback(current, total):
         """进度回调函数"""
         print(f'  进度: {current}/{total} ({current*100//total}%)')
 
-    try:
-        df_result = classifier.process(df, progress_callback=progress_callback, stage=args.stage)
-    except Exception as e:
-        print(f"错误: 分类失败: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    # 持久化缓存
+    store = None
+    if args.cache_dir:
+        if args.mode != 'columnar' or args.stage != 2:
+            print('错误: --cache-dir 仅支持 Stage2 整列模式 (--mode columnar --stage 2)')
+            sys.exit(1)
+        store = ClassificationStore(args.cache_dir, classifier.config_hash)
+        print(f'  - 持久化缓存: {store.path}')
 
-    # 保存结果
-    print(f'\n保存结果: {args.output}')
-    try:
-        # 确保输出目录存在
-        output_dir = os.path.dirname(args.output)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir, exist_ok=True)
+    # 特征快照
+    feature_writer = None
+    if args.save_features:
+        if args.mode != 'columnar' or args.stage == 1:
+            print('错误: --save-features 仅支持 Stage2 整列模式 (--mode columnar --stage 2/both)')
+            sys.exit(1)
+        feature_writer = FeatureWriter(args.save_features, classifier)
+        print(f'  - 特征快照: {args.save_features}')
+
+    stats = RunningStats()
+    processor = ParallelProcessor(classifier, args.workers, stage=args.stage, mode=args.mode,
+                                  store=store, return_features=feature_writer is not None,
+                                  typed=args.output_format == 'parquet')
 
-        df_result.to_csv(args.output, index=False, encoding='utf-8-sig')
+    if args.chunksize:
+        # 流式模式：分块读取 → 分类 → 追加写出，内存占用与文件大小无关
+        print(f'\n流式分类 (Stage {args.stage}, 每块 {args.chunksize} 条, 进程数 {args.workers})...')
+        print(f'  输入: {args.data}')
+        print(f'  输出: {args.output}')
+        try:
+            writer = make_writer(args.output, args.output_format, args.partition_by)
+            with processor:
+                for chunk in iter_input_chunks(args.data, args.chunksize, sample=args.sample,
+                                               columns=INPUT_COLUMNS):
+                    df_result = processor.process(chunk)
+                    if feature_writer is not None:
+                        df_result, features = df_result
+                        feature_writer.write(features)
+                    writer.write(df_result)
+                    stats.update(df_result)
+                    print(f'  已处理: {writer.rows_written} 条')
+            writer.close()
+        except Exception as e:
+            print(f"错误: 流式分类失败: {e}")
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
         print('  结果已保存')
-    except Exception as e:
-        print(f"错误: 结果保存失败: {e}")
-        sys.exit(1)
+    else:
+        # 加载数据
+        print(f'\n加载数据: {args.data}')
+        try:
+            # 只读取分类用到的列（Arrow 多线程解析，字符串以 Arrow 存储，site 为分类类型）
+            df = read_input(args.data, columns=INPUT_COLUMNS)
+        except Exception as e:
+            print(f"错误: 数据加载失败: {e}")
+            sys.exit(1)
+
+        # 采样
+        if args.sample:
+            total_rows = len(df)
+            df = df.head(args.sample)
+            print(f'采样模式: {args.sample} / {total_rows} 条')
+
+        print(f'数据总量: {len(df)} 条')
+
+        # 执行分类
+        print(f'\n开始分类 (Stage {args.stage}, 进程数 {args.workers})...')
+
+        try:
+            with processor:
+                df_result = processor.process(df, progress_callback=progress_callback)
+            if feature_writer is not None:
+                df_result, features = df_result
+                feature_writer.write(features)
+        except Exception as e:
+            print(f"错误: 分类失败: {e}")
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
+
+        # 保存结果
+        print(f'\n保存结果: {args.output}')
+        try:
+            writer = make_writer(args.output, args.output_format, args.partition_by)
+            writer.write(df_result)
+            writer.close()
+            print('  结果已保存')
+        except Exception as e:
+            print(f"错误: 结果保存失败: {e}")
+            sys.exit(1)
+
+        stats.update(df_result)
+
+    if feature_writer is not None:
+        feature_writer.close()
+        print(f'\n特征快照已保存: {args.save_features} '
+              f'({feature_writer.n_rows} 行, {feature_writer.n_keys} 个唯一标题)')
 
     # 输出分类统计
-    if args.stage == 2:
-        print('\n=== 分类统计 ===')
-        print(df_result['predicted_category'].value_counts().to_string())
-    else:
-        print('\n=== Stage1 原始标签统计 ===')
-        # 显示布尔标签的非零统计
-        bool_cols = [c for c in df_result.columns if c.startswith('tag_')]
-        for col in bool_cols:
-            count = (df_result[col] == 1).sum()
-            if count > 0:
-                print(f'  {col}: {count}')
-
-        # 显示原始规格值的非零统计
-        print('\n原始规格值统计:')
-        spec_cols = ['raw_wattage', 'raw_kelvin_min', 'raw_kelvin_max', 'raw_cri', 'raw_lumens', 'raw_lux']
-        for col in spec_cols:
-            if col in df_result.columns:
-                count = (df_result[col] > 0).sum()
-                if count > 0:
-                    non_zero = df_result[df_result[col] > 0][col]
-                    print(f'  {col}: {count}条, 范围[{non_zero.min()}-{non_zero.max()}]')
+    stats.print_summary(args.stage)
+    if args.lazy:
+        stats.print_shortcuts()
+
+    if classifier.profiler is not None:
+        classifier.profiler.print_summary()
+        profile_path = os.path.splitext(args.output.rstrip('/\\'))[0] + '_profile.json'
+        classifier.profiler.save(profile_path)
+        print(f'  剖析结果已保存: {profile_path}')
+
+    if args.mode == 'row' and args.workers <= 1:
+        info = classifier.cache_info()
+        lookups = info['hits'] + info['misses']
+        if lookups:
+            print(f"\n标题缓存: 命中 {info['hits']} / {lookups} ({info['hits']*100//lookups}%)")
+
+    if store is not None and args.workers <= 1:
+        lookups = store.hits + store.misses
+        if lookups:
+            print(f"\n持久化缓存: 命中 {store.hits} / {lookups} ({store.hits*100//lookups}%)")
+        store.close()
 
     print('\n完成!')
 
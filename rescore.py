@@ -0,0 +1,92 @@
+"""
+增量重评分入口
+读取 main.py --save-features 保存的特征快照，只重跑第四、五层（评分 + 裁决），
+用于调整 scoring_models.json / hard_filters.json 后快速查看结果
+"""
+import argparse
+import os
+import sys
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.classifier import GlobalLightClassifier
+from src.features import FeatureSet, rescore
+from src.pipeline import RunningStats, resolve_output_path
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='全球灯光类目分类引擎 - 基于特征快照的增量重评分',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  # 首次运行时保存特征快照
+  python main.py --data 日本灯光类.csv --save-features data/features
+
+  # 修改评分模型/裁决规则后只重跑第四、五层
+  python rescore.py --features data/features --output data/processed/rescored.csv
+
+  # Parquet 输出（定类型列），按品类分区
+  python rescore.py --features data/features --output-format parquet \\
+      --partition-by predicted_category --output data/processed/rescored
+        '''
+    )
+
+    parser.add_argument('--features', required=True, help='特征快照目录 (main.py --save-features)')
+    parser.add_argument('--config-dir', default='config', help='配置文件目录 (默认: config)')
+    parser.add_argument('--output', default='data/processed/rescored.csv',
+                        help='输出文件路径 (默认: data/processed/rescored.csv)')
+    parser.add_argument('--output-format', default='csv', choices=['csv', 'parquet'],
+                        help='输出格式: csv=字典列, parquet=定类型列 (默认: csv)')
+    parser.add_argument('--partition-by', choices=['site', 'predicted_category'],
+                        help='Parquet 输出按该列分区（输出路径为目录）')
+    parser.add_argument('--word-boundary', type=int, default=0, metavar='N',
+                        help='须与保存快照时的 --word-boundary 一致 (默认: 0)')
+
+    args = parser.parse_args()
+
+    if args.partition_by and args.output_format != 'parquet':
+        print('错误: --partition-by 需要 --output-format parquet')
+        sys.exit(1)
+    output = resolve_output_path(args.output, args.output_format, args.partition_by)
+
+    if not os.path.exists(args.features):
+        print(f"错误: 特征快照不存在: {args.features}")
+        sys.exit(1)
+
+    signals_path = os.path.join(args.config_dir, 'signals.json')
+    scoring_path = os.path.join(args.config_dir, 'scoring_models.json')
+    filters_path = os.path.join(args.config_dir, 'hard_filters.json')
+    for path in (signals_path, scoring_path, filters_path):
+        if not os.path.exists(path):
+            print(f"错误: 配置文件不存在: {path}")
+            sys.exit(1)
+
+    try:
+        classifier = GlobalLightClassifier(signals_path, scoring_path, filters_path,
+                                           word_boundary_max_len=args.word_boundary)
+        feature_set = FeatureSet(args.features)
+    except Exception as e:
+        print(f"错误: 初始化失败: {e}")
+        sys.exit(1)
+
+    print(f'重评分: {args.features} ({len(feature_set)} 行)')
+    stats = RunningStats()
+    try:
+        rows = rescore(classifier, feature_set, output, stats=stats,
+                       output_format=args.output_format, partition_by=args.partition_by)
+    except (ValueError, ImportError, FileExistsError) as e:
+        print(f"错误: {e}")
+        sys.exit(1)
+    print(f'  结果已保存: {output} ({rows} 行)')
+
+    # 输出分类统计
+    stats.print_summary(2)
+
+    print('\n完成!')
+
+
+if __name__ == '__main__':
+    main()
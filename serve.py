@@ -0,0 +1,112 @@
+"""
+常驻分类服务入口
+配置只加载一次，通过本地 HTTP/JSON 接口提供单条与批量分类；配置更新后热切换，无需重启
+"""
+import argparse
+import os
+import sys
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.registry import ModelRegistry, config_paths, list_versions
+from src.service import ClassificationService
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='全球灯光类目分类引擎 - 常驻分类服务',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  # 启动服务
+  python serve.py --port 8765
+
+  # 复用编译后的配置快照，缩短启动时间
+  python serve.py --snapshot config/.compiled/engine-wb0.pickle
+
+  # 单条分类
+  curl -s localhost:8765/classify -d '{"title": "NEEWER リングライト 18インチ", "site": "JP"}'
+
+  # 批量分类
+  curl -s localhost:8765/classify/batch -d '{"items": [{"title": "Godox TT685 Speedlite", "site": "US"}]}'
+
+  # 延迟分位数与微批统计
+  curl -s localhost:8765/stats
+
+  # 版本目录：每个子目录是一个配置版本（先写入 .tmp-xxx 再重命名发布），
+  # 每30秒检查一次，加载名称最大的新版本，编译完成后切换
+  python serve.py --config-root data/config_versions --watch 30
+
+  # 手动触发加载（原地修改 --config-dir 下的配置后同样适用）、查看版本、回滚
+  curl -s -X POST localhost:8765/reload
+  curl -s localhost:8765/version
+  curl -s localhost:8765/activate -d '{"version": "2026-10-17.1"}'
+        '''
+    )
+
+    parser.add_argument('--config-dir', default='config', help='配置文件目录 (默认: config)')
+    parser.add_argument('--config-root', metavar='DIR',
+                        help='版本目录：每个子目录为一个配置版本，使用名称最大者（取代 --config-dir）')
+    parser.add_argument('--watch', type=float, default=0.0, metavar='SECONDS',
+                        help='每隔N秒检查新配置版本并热切换 (默认: 0，只在 POST /reload 时检查)')
+    parser.add_argument('--keep', type=int, default=3, help='内存中保留的版本数，用于回滚 (默认: 3)')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址 (默认: 127.0.0.1，仅本机)')
+    parser.add_argument('--port', type=int, default=8765, help='监听端口 (默认: 8765)')
+    parser.add_argument('--max-batch-size', type=int, default=256, help='微批最大记录数 (默认: 256)')
+    parser.add_argument('--max-wait-ms', type=float, default=0.0,
+                        help='微批收集并发请求的最长等待时间，毫秒；0为只合并已排队的请求 (默认: 0)')
+    parser.add_argument('--word-boundary', type=int, default=0, metavar='N',
+                        help='长度不超过N的纯英文关键词按词边界匹配 (默认: 0，全部子串匹配)')
+    parser.add_argument('--snapshot', metavar='PATH',
+                        help='编译配置快照文件：有效时直接加载，不存在或配置已变更时重新编译并写入')
+    parser.add_argument('--verbose', action='store_true', help='打印访问日志')
+
+    args = parser.parse_args()
+
+    if args.config_root:
+        if args.snapshot:
+            print('错误: --snapshot 只能与 --config-dir 一起使用')
+            sys.exit(1)
+        if not os.path.isdir(args.config_root):
+            print(f"错误: 版本目录不存在: {args.config_root}")
+            sys.exit(1)
+        versions = list_versions(args.config_root)
+        if not versions:
+            print(f"错误: 版本目录中没有配置齐全的版本: {args.config_root}")
+            sys.exit(1)
+    else:
+        for path in config_paths(args.config_dir):
+            if not os.path.exists(path):
+                print(f"错误: 配置文件不存在: {path}")
+                sys.exit(1)
+
+    registry = ModelRegistry(args.config_root, word_boundary_max_len=args.word_boundary, keep=args.keep)
+    try:
+        if args.config_root:
+            registry.load(os.path.join(args.config_root, versions[-1]), version=versions[-1])
+        else:
+            registry.load(args.config_dir, snapshot_path=args.snapshot)
+        service = ClassificationService(registry, host=args.host, port=args.port,
+                                        max_batch_size=args.max_batch_size,
+                                        max_wait_ms=args.max_wait_ms, verbose=args.verbose)
+    except Exception as e:
+        print(f"错误: 服务初始化失败: {e}")
+        sys.exit(1)
+
+    host, port = service.address
+    print(f'分类服务已启动: http://{host}:{port} (微批 {args.max_batch_size} 条 / {args.max_wait_ms}ms)')
+    print(f'  配置版本: {registry.active.version} (编译 {registry.active.compile_seconds * 1000:.1f}ms)')
+    if args.watch > 0:
+        registry.watch(args.watch)
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        print('\n服务已停止')
+    finally:
+        registry.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+"""
+性能基准模块
+包含合成标题生成器、逐层/端到端基准测试，以及与基线结果的吞吐量对比
+"""
+import json
+import platform
+import random
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .utils import normalize_text, normalize_series, extract_specs, extract_specs_columns
+
+
+# 合成标题使用的品牌与型号前缀（不参与信号匹配）
+BRANDS = ['Godox', 'NEEWER', 'Aputure', 'amaran', 'Ulanzi', 'SmallRig', 'Nanlite', 'Zhiyun',
+          'Yongnuo', 'Pixel']
+MODEL_PREFIXES = ['SL', 'VL', 'LS', 'FS', 'TT', 'RGB', 'PT', 'MC', 'CL', 'AD']
+
+# 各国站点的填充词
+FILLERS = {
+    'JP': ['ライト', '撮影用', '日本語説明書付き', '【PSE認証済】', '送料無料', 'led'],
+    'US': ['Light', 'LED', 'for Photography', 'Video', 'Kit', 'Professional'],
+    'CN': ['补光灯', '摄影灯', '直播', '套装', 'led', '专业'],
+}
+
+# 站点分布（与线上数据大致相当）
+SITE_WEIGHTS = {'JP': 0.5, 'US': 0.35, 'CN': 0.15}
+
+
+def _spec_string(rng):
+    """随机生成一个规格字符串（色温区间、色温、显色指数、功率、流明、照度）"""
+    kind = rng.randrange(6)
+    if kind == 0:
+        low = rng.choice([2500, 2700, 3000, 3200])
+        high = rng.choice([5600, 6500, 8500, 10000])
+        return rng.choice([f'{low}k-{high}k', f'{low}K~{high}K', f'{low}-{high}k'])
+    if kind == 1:
+        return f'{rng.choice([3200, 4300, 5600, 6000])}K'
+    if kind == 2:
+        cri = rng.randrange(90, 99)
+        return rng.choice([f'CRI {cri}', f'CRI{cri}+', f'{cri}cri', f'TLCI:{cri}'])
+    if kind == 3:
+        watt = rng.choice([10, 20, 60, 100, 200, 300, 600, 1200])
+        return rng.choice([f'{watt}W', f'{watt} watt', f'{watt}ｗ'])
+    if kind == 4:
+        return f'{rng.randrange(1, 60) * 500:,}lm'
+    return f'{rng.randrange(1, 40) * 500} lux'
+
+
+def generate_titles(signals, accessories, n, seed=0, accessory_rate=0.03, duplicate_rate=0.1):
+    """
+    按 signals.json / hard_filters.json 的词表生成合成商品标题
+
+    每条标题 = 品牌 + 型号 + 1~3 个信号词（按站点语言取词）+ 0~3 个规格字符串 + 填充词，
+    少量标题附加配件词，部分标题重复出现以模拟线上数据的重复率。同一 seed 结果完全相同。
+
+    Args:
+        signals: signals.json 内容（{tag: {country: [keywords]}}）
+        accessories: hard_filters.json 的 accessories 列表
+        n: 生成行数
+        seed: 随机种子
+        accessory_rate: 附加配件词的比例
+        duplicate_rate: 重复已有标题的比例
+
+    Returns:
+        DataFrame，列为 SKU标题、site、产品URL
+    """
+    rng = random.Random(seed)
+    tags = list(signals.keys())
+    sites = rng.choices(list(SITE_WEIGHTS), weights=list(SITE_WEIGHTS.values()), k=n)
+
+    titles = []
+    for site in sites:
+        if titles and rng.random() < duplicate_rate:
+            titles.append(titles[rng.randrange(len(titles))])
+            continue
+
+        parts = []
+        for tag in rng.sample(tags, rng.randint(1, 3)):
+            keywords = signals[tag].get(site) or signals[tag].get('US', [])
+            if keywords:
+                parts.append(rng.choice(keywords))
+        parts.extend(_spec_string(rng) for _ in range(rng.randint(0, 3)))
+        parts.append(rng.choice(FILLERS[site]))
+        if accessories and rng.random() < accessory_rate:
+            parts.append(rng.choice(accessories))
+        rng.shuffle(parts)
+
+        model = f'{rng.choice(MODEL_PREFIXES)}{rng.randrange(10, 1000)}'
+        titles.append(' '.join([rng.choice(BRANDS), model] + parts))
+
+    return pd.DataFrame({'SKU标题': titles, 'site': sites,
+                         '产品URL': [f'https://example.com/item/{i}' for i in range(n)]})
+
+
+def _best_time(fn, repeat):
+    """运行 repeat 次，返回 (最短耗时秒数, 最后一次的返回值)"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _record(results, name, rows, seconds):
+    results[name] = {'rows': rows, 'seconds': round(seconds, 6),
+                     'rows_per_sec': round(rows / seconds, 1) if seconds > 0 else float('inf')}
+
+
+def benchmark_layers(classifier, df, repeat=3):
+    """
+    逐层基准：每层以上一层的结果为输入单独计时
+
+    layer/* 为逐条函数（normalize_text、extract_signals、extract_specs、calculate_scores、
+    arbitrate），batch/* 为对应的整列实现。
+
+    Args:
+        classifier: GlobalLightClassifier
+        df: 含 SKU标题、site 列的 DataFrame
+        repeat: 每项重复次数（取最短耗时）
+
+    Returns:
+        {名称: {'rows', 'seconds', 'rows_per_sec'}} 字典
+    """
+    results = {}
+    n = len(df)
+    titles = df['SKU标题'].tolist()
+    countries = [classifier._row_country({'site': site}) for site in df['site']]
+
+    # 第一层
+    seconds, clean_titles = _best_time(lambda: [normalize_text(t) for t in titles], repeat)
+    _record(results, 'layer/normalize_text', n, seconds)
+    seconds, clean_series = _best_time(lambda: normalize_series(df['SKU标题']), repeat)
+    _record(results, 'batch/normalize_series', n, seconds)
+
+    # 第二层
+    seconds, signals = _best_time(
+        lambda: [classifier.extract_signals(t, c) for t, c in zip(clean_titles, countries)], repeat)
+    _record(results, 'layer/extract_signals', n, seconds)
+    seconds, tag_masks = _best_time(
+        lambda: classifier.extract_signal_masks_batch(clean_series, countries), repeat)
+    _record(results, 'batch/extract_signal_masks', n, seconds)
+
+    # 第三层
+    seconds, specs = _best_time(lambda: [extract_specs(t) for t in clean_titles], repeat)
+    _record(results, 'layer/extract_specs', n, seconds)
+    seconds, spec_matrix = _best_time(lambda: extract_specs_columns(clean_series), repeat)
+    _record(results, 'batch/extract_specs_columns', n, seconds)
+
+    # 第四层
+    feature_vectors = [{**s, **p} for s, p in zip(signals, specs)]
+    seconds, scores = _best_time(
+        lambda: [classifier.calculate_scores(fv) for fv in feature_vectors], repeat)
+    _record(results, 'layer/calculate_scores', n, seconds)
+    X = classifier.feature_matrix(tag_masks, spec_matrix)
+    seconds, (_, _, _, score_matrix) = _best_time(
+        lambda: classifier.calculate_scores_batch(X, return_all=True), repeat)
+    _record(results, 'batch/calculate_scores', n, seconds)
+
+    # 第五层
+    masks = [int(m) for m in tag_masks]
+    seconds, _ = _best_time(
+        lambda: [classifier.arbitrate(s, fv, t, tag_mask=m)
+                 for s, fv, t, m in zip(scores, feature_vectors, clean_titles, masks)], repeat)
+    _record(results, 'layer/arbitrate', n, seconds)
+    seconds, _ = _best_time(
+        lambda: classifier.arbitrate_batch(score_matrix, X, titles=clean_series, tag_masks=tag_masks),
+        repeat)
+    _record(results, 'batch/arbitrate', n, seconds)
+
+    return results
+
+
+def benchmark_process(classifier, df, mode='columnar', repeat=3):
+    """
+    端到端基准：classifier.process 第二阶段（每次运行前清空标题缓存）
+
+    Args:
+        classifier: GlobalLightClassifier
+        df: 输入 DataFrame
+        mode: 'row' 或 'columnar'
+        repeat: 重复次数（取最短耗时）
+
+    Returns:
+        最短耗时（秒）
+    """
+    def run():
+        classifier.title_cache.clear()
+        return classifier.process(df, mode=mode)
+
+    seconds, _ = _best_time(run, repeat)
+    return seconds
+
+
+def run_benchmarks(classifier, signals, accessories, sizes, layer_rows=20000, row_mode_max=10000,
+                   repeat=3, seed=0, log=None):
+    """
+    完整基准：逐层基准 + 各数据量下的端到端基准
+
+    Args:
+        classifier: GlobalLightClassifier
+        signals: signals.json 内容（合成数据词表）
+        accessories: 配件词列表（合成数据词表）
+        sizes: 端到端基准的行数列表
+        layer_rows: 逐层基准的行数
+        row_mode_max: 逐行模式只在不超过该行数时测试（逐行模式较慢）
+        repeat: 每项重复次数
+        seed: 合成数据随机种子
+        log: 进度输出函数（如 print），None 时不输出
+
+    Returns:
+        {'meta': {...}, 'results': {名称: {'rows', 'seconds', 'rows_per_sec'}}}
+    """
+    log = log or (lambda message: None)
+    results = {}
+
+    log(f'逐层基准: {layer_rows} 行')
+    results.update(benchmark_layers(classifier, generate_titles(signals, accessories, layer_rows, seed),
+                                    repeat=repeat))
+
+    for size in sizes:
+        df = generate_titles(signals, accessories, size, seed)
+        modes = ['columnar', 'row'] if size <= row_mode_max else ['columnar']
+        for mode in modes:
+            log(f'端到端基准: {mode} {size} 行')
+            _record(results, f'process/{mode}/{size}', size,
+                    benchmark_process(classifier, df, mode=mode, repeat=repeat))
+
+    meta = {'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'pandas': pd.__version__, 'numpy': np.__version__,
+            'config_hash': classifier.config_hash, 'seed': seed, 'repeat': repeat,
+            'layer_rows': layer_rows, 'sizes': list(sizes)}
+    return {'meta': meta, 'results': results}
+
+
+def save_results(report, path):
+    """保存基准结果（JSON）"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def load_results(path):
+    """读取基准结果（JSON）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(current, baseline):
+    """
+    与基线对比吞吐量（只比较两次结果中都存在的项）
+
+    Args:
+        current: 本次 run_benchmarks 结果
+        baseline: 基线结果
+
+    Returns:
+        [(名称, 基线 rows/s, 本次 rows/s, 本次/基线)] 列表，按名称排序
+    """
+    rows = []
+    for name in sorted(set(current['results']) & set(baseline['results'])):
+        before = baseline['results'][name]['rows_per_sec']
+        after = current['results'][name]['rows_per_sec']
+        rows.append((name, before, after, after / before if before else float('inf')))
+    return rows
+
+
+def find_regressions(comparison, tolerance=0.2):
+    """从 compare_results 结果中筛出吞吐量低于基线 (1 - tolerance) 倍的项"""
+    return [row for row in comparison if row[3] < 1.0 - tolerance]
@@ -0,0 +1,67 @@
+"""
+缓存模块
+标题级分类结果的有界LRU缓存
+"""
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    有界LRU缓存
+
+    超过 maxsize 时淘汰最久未使用的条目；maxsize=0 表示不缓存（只计数）。
+    命中/未命中次数通过 hits、misses 暴露给调用方。
+    """
+
+    def __init__(self, maxsize=0):
+        """
+        Args:
+            maxsize: 最大条目数，0 表示关闭缓存
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """
+        查询缓存
+
+        Returns:
+            缓存值，未命中返回 None
+        """
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """写入缓存，必要时淘汰最久未使用的条目"""
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """清空缓存并重置计数"""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """
+        缓存统计
+
+        Returns:
+            {'hits', 'misses', 'size', 'maxsize'} 字典
+        """
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._data), 'maxsize': self.maxsize}
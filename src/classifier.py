@@ -1,10 +1,113 @@
 """
 分类器核心模块
 实现五层解耦向量化分类引擎
+
+pandas 只在 DataFrame 接口（process 等）中按需导入，纯标题分类（classify_titles）不加载 pandas
 """
 import json
-import pandas as pd
-from .utils import normalize_text, extract_specs, extract_raw_specs
+import numpy as np
+from .cache import LRUCache
+from .matcher import KeywordMatcher
+from .scoring import ScoringEngine
+from .profiler import NULL_TIMER
+from .store import config_hash
+from .utils import (SPEC_FEATURES, SPEC_FEATURE_MAX, normalize_text, extract_spec_values, normalize_series,
+                    extract_specs_columns, extract_raw_specs_columns, extract_spec_values_columns)
+
+
+# 输出中原样保留的输入列
+PASSTHROUGH_COLUMNS = ['产品标题(中文)', 'SKU标题', 'site', '产品URL', '子类目(中文)', 'std_brand_name']
+# 分类引擎读取的全部输入列（输出原样保留的列 + 备用标题列），读取输入时只需投影这些列
+INPUT_COLUMNS = PASSTHROUGH_COLUMNS + ['产品标题']
+
+# 惰性求值按得分上下界裁决时的余量：覆盖两位小数取整与累加误差
+BOUND_MARGIN = 0.01
+
+# 惰性求值的捷径（跳过第三、四层），按 decision_reason 区分
+SHORTCUTS = ['Accessory Kill', 'Form Lock', 'Score Bound']
+
+# 整列模式提供进度回调时，每块唯一标题数（每块完成后报告一次进度）
+PROGRESS_BLOCK = 20000
+
+
+def shortcut_kind(reason):
+    """
+    裁决原因 → 惰性求值的捷径（SHORTCUTS 之一），完整计算的行为 None
+
+    上下界裁决的原因写作 'High Score: 环形灯 (>=182.5)' / 'Low Score: <=12.0 < 30'
+    """
+    if not isinstance(reason, str):
+        return None
+    if reason.startswith('Accessory Kill:'):
+        return 'Accessory Kill'
+    if reason.startswith('Form Lock:'):
+        return 'Form Lock'
+    if reason.startswith('Low Score: <=') or (reason.startswith('High Score:') and ' (>=' in reason):
+        return 'Score Bound'
+    return None
+
+
+class _TitleAnalysis:
+    """单个标题的五层分析结果（标题缓存条目）"""
+
+    __slots__ = ('clean_title', 'tag_mask', 'raw_specs', 'spec_signals',
+                 'scores', 'category', 'audit', 'lazy')
+
+    def __init__(self, clean_title, tag_mask, raw_specs, spec_signals):
+        self.clean_title = clean_title
+        # 布尔标签以位掩码保存（位 = self.tags 中的下标），输出时再展开为字典
+        self.tag_mask = tag_mask
+        self.raw_specs = raw_specs
+        self.spec_signals = spec_signals
+        # 第四、五层结果：第二阶段首次使用时填充
+        self.scores = None
+        self.category = None
+        self.audit = None
+        # 是否由惰性求值的捷径裁决（规格与得分未计算，为 NaN）
+        self.lazy = False
+
+
+def _unique_rows(titles, countries):
+    """
+    按 (原始标题, 国家) 去重
+
+    Returns:
+        (unique_idx, inverse): 每个唯一键首次出现的行号，以及每行对应的唯一键下标
+    """
+    import pandas as pd
+
+    title_codes, _ = pd.factorize(pd.Series(titles, dtype=object), use_na_sentinel=False)
+    country_codes, country_values = pd.factorize(countries)
+    keys = title_codes.astype(np.int64) * max(len(country_values), 1) + country_codes
+    _, unique_idx, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    return unique_idx, inverse.reshape(-1)
+
+
+def _unique_blocks(inverse, n_unique, progress_callback):
+    """
+    整列模式的唯一标题分块
+
+    未提供进度回调时只有一块；提供时每 PROGRESS_BLOCK 个唯一标题一块，
+    每块处理完成后以已覆盖的输入行数调用 progress_callback(current, total)。
+
+    Yields:
+        唯一标题下标的 slice
+    """
+    if progress_callback is None or n_unique <= PROGRESS_BLOCK:
+        yield slice(0, n_unique)
+        if progress_callback and len(inverse):
+            progress_callback(len(inverse), len(inverse))
+        return
+    covered = np.cumsum(np.bincount(inverse, minlength=n_unique))
+    for start in range(0, n_unique, PROGRESS_BLOCK):
+        stop = min(start + PROGRESS_BLOCK, n_unique)
+        yield slice(start, stop)
+        progress_callback(int(covered[stop - 1]), len(inverse))
+
+
+def _concat_columns(parts):
+    """按块计算的 {列名: 数组} 字典逐列拼接"""
+    return {col: np.concatenate([part[col] for part in parts]) for col in parts[0]}
 
 
 class GlobalLightClassifier:
@@ -19,14 +122,20 @@ class GlobalLightClassifier:
     5. 冲突裁决层
     """
 
-    def __init__(self, signals_path, scoring_path, filters_path):
+    def __init__(self, signals_path, scoring_path, filters_path, word_boundary_max_len=0,
+                 cache_size=0, lazy=False):
         """
-        初始化：加载配置文件
+        初始化：加载配置文件，并预编译各国家的关键词匹配器
 
         Args:
             signals_path: 信号词典JSON文件路径
             scoring_path: 评分模型JSON文件路径
             filters_path: 硬拦截规则JSON文件路径
+            word_boundary_max_len: 长度不超过该值的纯ASCII关键词按词边界匹配
+                （如 "pad"、"ring"、"ttl"），默认0表示全部子串匹配
+            cache_size: 逐行处理时标题级LRU缓存的最大条目数，默认0表示不缓存
+            lazy: 第二阶段惰性求值：先做配件拦截与形态锁定，再按规格特征的取值范围求得分上下界，
+                结果已确定的标题跳过规格提取与评分（这些行的规格特征与得分为 NaN）
         """
         with open(signals_path, 'r', encoding='utf-8') as f:
             self.signals = json.load(f)
@@ -35,6 +144,90 @@ class GlobalLightClassifier:
         with open(filters_path, 'r', encoding='utf-8') as f:
             self.hard_filters = json.load(f)
 
+        # 标签位置：按 signals.json 中的顺序分配（位 = 下标）
+        self.tags = list(self.signals.keys())
+        self.tag_bits = {tag: 1 << bit for bit, tag in enumerate(self.tags)}
+        # 整列模式的标签掩码数组类型（标签不超过32个时用 uint32）
+        self.tag_mask_dtype = np.uint32 if len(self.tags) <= 32 else np.uint64
+
+        # 配件列表预编译为单个匹配器：位 j = 第 j 个配件，首个命中的配件即最低置位
+        self._accessory_matcher = KeywordMatcher(
+            (acc.lower(), 1 << j) for j, acc in enumerate(self.hard_filters['accessories']))
+        self._accessory_reasons = np.array(
+            [f'Accessory Kill: {acc}' for acc in self.hard_filters['accessories']], dtype=object)
+
+        # 形态锁定预编译为 (位掩码, 强制品类, 标签)；不是布尔标签的锁定键掩码为 0，按特征值判断
+        self._form_locks = [(self.tag_bits.get(tag, 0), forced_category, tag)
+                            for tag, forced_category in self.hard_filters.get('form_factor_lock', {}).items()]
+        self.word_boundary_max_len = word_boundary_max_len
+
+        # 每个国家一个匹配器：该国关键词 + US通用关键词
+        countries = {'US'}
+        for lang_map in self.signals.values():
+            countries.update(lang_map.keys())
+        self._keyword_matchers = {}
+        for country in sorted(countries):
+            self._keyword_matchers[country] = self._build_keyword_matcher(country)
+
+        # 评分模型编译为权重矩阵：列顺序 = 布尔标签 + 规格特征
+        self.scoring_engine = ScoringEngine(self.scoring_models, self.tags + SPEC_FEATURES)
+
+        # 惰性求值：规格特征的列与取值上限；按规格特征锁定的规则要等规格提取后才能判断，
+        # 只有排在它之前的标签锁定可以提前裁决，且此时不能按上下界裁决
+        self.lazy = lazy
+        self._spec_columns = np.arange(len(self.tags), len(self.tags) + len(SPEC_FEATURES))
+        self._spec_maxima = np.array([SPEC_FEATURE_MAX[feature] for feature in SPEC_FEATURES])
+        self._lazy_form_locks = []
+        self._spec_form_lock = False
+        for lock in self._form_locks:
+            if lock[0]:
+                self._lazy_form_locks.append(lock)
+            elif lock[2] in SPEC_FEATURES:
+                self._spec_form_lock = True
+                break
+        # 单条上下界：各品类的基础分、按配置顺序的标签权重项与规格特征贡献范围（与整列累加顺序一致）
+        self._tag_terms = [[(self.tag_bits[feature], float(weight))
+                            for feature, weight in model['weights'].items() if feature in self.tag_bits]
+                           for model in self.scoring_models.values()]
+        low_offsets, high_offsets = self.scoring_engine.bound_offsets(self._spec_columns, self._spec_maxima)
+        self._bound_offsets = list(zip(self.scoring_engine.base_scores.tolist(), low_offsets.tolist(),
+                                       high_offsets.tolist()))
+
+        # 标题级缓存：键为 (原始标题, 国家)
+        self.title_cache = LRUCache(cache_size)
+
+        # 分层剖析器（LayerProfiler），默认关闭
+        self.profiler = None
+
+        # 配置指纹：持久化缓存按此区分不同配置下的结果
+        self.config_hash = config_hash(signals_path, scoring_path, filters_path,
+                                       extra=f'word_boundary={word_boundary_max_len}')
+        # 特征快照只依赖信号词典（第二层）与词边界设置
+        self.signals_hash = config_hash(signals_path, extra=f'word_boundary={word_boundary_max_len}')
+
+    def _build_keyword_matcher(self, country):
+        """为指定国家编译关键词匹配器（该国关键词 + US通用关键词）"""
+        keyword_masks = []
+        for bit, tag in enumerate(self.tags):
+            lang_map = self.signals[tag]
+            for kw in lang_map.get(country, []) + lang_map.get('US', []):
+                keyword_masks.append((kw, 1 << bit))
+        return KeywordMatcher(keyword_masks, self.word_boundary_max_len)
+
+    def _get_keyword_matcher(self, country):
+        """获取国家对应的匹配器，未配置的国家按需编译并缓存"""
+        matcher = self._keyword_matchers.get(country)
+        if matcher is None:
+            matcher = self._build_keyword_matcher(country)
+            self._keyword_matchers[country] = matcher
+        return matcher
+
+    def _measure(self, layer, rows=1):
+        """剖析计时上下文；未设置 self.profiler 时为空操作"""
+        if self.profiler is None:
+            return NULL_TIMER
+        return self.profiler.measure(layer, rows)
+
     def extract_signals(self, text, country='US'):
         """
         第二层：信号感知层
@@ -47,23 +240,81 @@ class GlobalLightClassifier:
         Returns:
             布尔特征向量字典
         """
-        bool_signals = {}
+        return self.mask_to_signals(self.extract_signal_mask(text, country))
 
-        for tag, lang_map in self.signals.items():
-            # 获取对应语言的关键词（降级使用US作为通用）
-            keywords = lang_map.get(country, []) + lang_map.get('US', [])
+    def extract_signal_mask(self, text, country='US'):
+        """
+        第二层（位掩码）：标签命中以整数位掩码返回，位 = self.tags 中的下标
 
-            # 检查标题中是否包含任一关键词
-            # 使用部分匹配（kw in text）而非精确匹配
-            has_keyword = 0
-            for kw in keywords:
-                if kw in text:
-                    has_keyword = 1
-                    break
+        Args:
+            text: 清洗后的商品标题
+            country: 国家代码（CN/US/JP），默认US
 
-            bool_signals[tag] = float(has_keyword)
+        Returns:
+            int 位掩码
+        """
+        # 对应语言的关键词（降级使用US作为通用）已预编译为单个匹配器
+        # 标题只扫描一次，所有标签命中以位掩码形式返回
+        return self._get_keyword_matcher(country).match(text)
+
+    def mask_to_signals(self, mask):
+        """位掩码 → 布尔特征向量字典（0.0/1.0）"""
+        return {tag: float((mask >> bit) & 1) for bit, tag in enumerate(self.tags)}
+
+    def signals_to_mask(self, feature_vector):
+        """特征向量字典 → 位掩码（值为 1.0 的布尔标签置位）"""
+        mask = 0
+        for tag, bit in self.tag_bits.items():
+            if feature_vector.get(tag, 0) == 1.0:
+                mask |= bit
+        return mask
+
+    def extract_signals_batch(self, texts, countries):
+        """
+        第二层（整列）：按国家分组，每组只选取一次关键词匹配器
+
+        Args:
+            texts: 清洗后的标题序列
+            countries: 与 texts 等长的国家代码数组
+
+        Returns:
+            (N × T) float64 布尔特征矩阵，列顺序为 self.tags
+        """
+        return self.unpack_tag_masks(self.extract_signal_masks_batch(texts, countries))
+
+    def extract_signal_masks_batch(self, texts, countries):
+        """
+        第二层（整列位掩码）：每行一个标签位掩码
+
+        Args:
+            texts: 清洗后的标题序列
+            countries: 与 texts 等长的国家代码数组
+
+        Returns:
+            (N,) 位掩码数组（self.tag_mask_dtype）
+        """
+        texts = list(texts)
+        countries = np.asarray(countries, dtype=object)
+        masks = np.zeros(len(texts), dtype=self.tag_mask_dtype)
 
-        return bool_signals
+        for country in dict.fromkeys(countries.tolist()):
+            rows = np.flatnonzero(countries == country)
+            match = self._get_keyword_matcher(country).match
+            masks[rows] = [match(texts[i]) for i in rows]
+
+        return masks
+
+    def unpack_tag_masks(self, masks):
+        """位掩码数组 → (N × T) float64 布尔特征矩阵"""
+        masks = np.asarray(masks, dtype=np.uint64)
+        bits = np.arange(len(self.tags), dtype=np.uint64)
+        return ((masks[:, np.newaxis] >> bits) & np.uint64(1)).astype(np.float64)
+
+    def pack_tag_matrix(self, tag_matrix):
+        """(N × T) 布尔特征矩阵 → 位掩码数组（值为 1.0 的位置位）"""
+        weights = np.left_shift(np.uint64(1), np.arange(len(self.tags), dtype=np.uint64))
+        packed = ((np.asarray(tag_matrix) == 1.0) * weights).sum(axis=1, dtype=np.uint64)
+        return packed.astype(self.tag_mask_dtype)
 
     def calculate_scores(self, feature_vector):
         """
@@ -79,22 +330,22 @@ class GlobalLightClassifier:
         Returns:
             11个品类的得分字典
         """
-        scores = {}
-
-        for category, model in self.scoring_models.items():
-            base_score = model['base_score']
-            weights = model['weights']
-            total_score = base_score
+        return self.scoring_engine.score(feature_vector)
 
-            for feature, weight in weights.items():
-                feature_val = feature_vector.get(feature, 0.0)
-                total_score += feature_val * weight
+    def calculate_scores_batch(self, X, return_all=False):
+        """
+        第四层（批量）：对 N 条特征同时评分（按配置顺序逐项累加，见 ScoringEngine）
 
-            scores[category] = round(total_score, 2)
+        Args:
+            X: (N × F) 特征矩阵，列顺序为 self.scoring_engine.features
+            return_all: 是否同时返回 (N × C) 完整得分矩阵
 
-        return scores
+        Returns:
+            (top_scores, winners, margins[, scores])，详见 ScoringEngine.score_batch
+        """
+        return self.scoring_engine.score_batch(X, return_all=return_all)
 
-    def arbitrate(self, scores, feature_vector, title):
+    def arbitrate(self, scores, feature_vector, title, tag_mask=None):
         """
         第五层：冲突裁决层
         通过硬规则解决评分引擎无法处理的边界情况，输出最终分类结果
@@ -109,19 +360,22 @@ class GlobalLightClassifier:
             scores: 11个品类的得分字典
             feature_vector: 完整的特征向量
             title: 清洗后的商品标题
+            tag_mask: 布尔标签位掩码（未提供时由 feature_vector 计算）
 
         Returns:
             (final_category, reason): 最终分类和裁决原因
         """
-        # 1. 配件一票否决
-        for acc in self.hard_filters['accessories']:
-            if acc.lower() in title.lower():
-                return '灯光类-其他', f'Accessory Kill: {acc}'
-
-        # 2. 形态锁定
-        form_lock = self.hard_filters.get('form_factor_lock', {})
-        for tag, forced_category in form_lock.items():
-            if feature_vector.get(tag, 0) == 1.0:
+        # 1. 配件一票否决（标题只转小写并扫描一次，按配置顺序取第一个命中的配件）
+        accessory_mask = self._accessory_matcher.match(title.lower())
+        if accessory_mask:
+            first = (accessory_mask & -accessory_mask).bit_length() - 1
+            return '灯光类-其他', self._accessory_reasons[first]
+
+        # 2. 形态锁定（布尔标签按位与判断）
+        if tag_mask is None:
+            tag_mask = self.signals_to_mask(feature_vector)
+        for bit, forced_category, tag in self._form_locks:
+            if (tag_mask & bit) if bit else feature_vector.get(tag, 0) == 1.0:
                 return forced_category, f'Form Lock: {tag}'
 
         # 3. 最高分归属
@@ -135,106 +389,330 @@ class GlobalLightClassifier:
 
         return winner, f'High Score: {winner} ({max_score})'
 
-    def process_row(self, row):
+    def accessory_hits_batch(self, titles):
         """
-        处理单条数据（第二阶段：归一化 + 分类判决）
+        配件命中矩阵（整列）
 
         Args:
-            row: pandas DataFrame的一行数据
+            titles: 清洗后的标题序列
 
         Returns:
-            包含分类结果的字典（精简列）
+            (N × A) bool 矩阵，列顺序与 hard_filters['accessories'] 一致
         """
-        # 获取标题（优先使用SKU标题，fallback到产品标题）
-        title = row.get('SKU标题', row.get('产品标题', ''))
-        if pd.isna(title):
-            title = ''
+        n_acc = len(self.hard_filters['accessories'])
+        match = self._accessory_matcher.match
+        masks = [match(title.lower()) for title in titles]
+        if n_acc <= 64:
+            bits = np.arange(n_acc, dtype=np.uint64)
+            masks = np.array(masks, dtype=np.uint64).reshape(-1, 1)
+            return ((masks >> bits) & np.uint64(1)).astype(bool)
+        return np.array([[(mask >> j) & 1 for j in range(n_acc)] for mask in masks],
+                        dtype=bool).reshape(len(masks), n_acc)
+
+    def arbitrate_batch(self, scores, X, titles=None, accessory_hits=None, tag_masks=None):
+        """
+        第五层（整列）：以掩码方式完成冲突裁决，结果与逐条 arbitrate 一致
 
-        # 第一层：标准化
-        clean_title = normalize_text(title)
+        Args:
+            scores: (N × C) 得分矩阵
+            X: (N × F) 特征矩阵，列顺序为 self.scoring_engine.features
+            titles: 清洗后的标题序列（未提供 accessory_hits 时使用）
+            accessory_hits: 预先计算的配件命中矩阵（accessory_hits_batch），提供时无需标题
+            tag_masks: 布尔标签位掩码数组（未提供时由 X 的标签列计算）
 
-        # 第二层：信号提取
-        # 根据站点判断国家代码
-        site = row.get('site', '').upper()
-        if site == 'JP':
-            country = 'JP'
-        elif site == 'CN':
-            country = 'CN'
-        else:
-            country = 'US'
+        Returns:
+            (categories, reasons): 两个 object 数组
+        """
+        n = len(scores)
+        if accessory_hits is None:
+            accessory_hits = self.accessory_hits_batch(titles)
+        decided, categories, reasons = self.hard_decisions_batch(X, accessory_hits, tag_masks)
+
+        # 3. 最高分归属
+        winners = np.argmax(scores, axis=1)
+        top_scores = scores[np.arange(n), winners]
 
-        bool_signals = self.extract_signals(clean_title, country)
+        # 4. 门限过滤
+        min_threshold = self.hard_filters.get('min_score_threshold', 30)
+        low = ~decided & (top_scores < min_threshold)
+        categories[low] = '灯光类-其他'
+        reasons[low] = [f'Low Score: {s} < {min_threshold}'
+                        for s in self.scoring_engine.top_values(top_scores[low], winners[low])]
 
-        # 第三层：规格提取
-        spec_signals = extract_specs(clean_title)
+        high = ~decided & ~low
+        names = np.asarray(self.scoring_engine.categories, dtype=object)[winners[high]]
+        categories[high] = names
+        reasons[high] = [f'High Score: {c} ({s})' for c, s in
+                         zip(names, self.scoring_engine.top_values(top_scores[high], winners[high]))]
 
-        # 合并特征向量
-        feature_vector = {**bool_signals, **spec_signals}
+        return categories, reasons
 
-        # 第四层：计算得分
-        scores = self.calculate_scores(feature_vector)
+    def hard_decisions_batch(self, X, accessory_hits, tag_masks=None, form_locks=None):
+        """
+        第五层前两步（整列）：配件拦截与形态锁定，结果与得分无关
 
-        # 第五层：裁决
-        category, audit = self.arbitrate(scores, feature_vector, clean_title)
+        Args:
+            X: (N × F) 特征矩阵，列顺序为 self.scoring_engine.features
+            accessory_hits: 配件命中矩阵（accessory_hits_batch）
+            tag_masks: 布尔标签位掩码数组（未提供时由 X 的标签列计算）
+            form_locks: 参与判断的形态锁定（默认全部）
 
-        # 精简输出列：只保留用户关注的列
-        result_row = {
-            '产品标题(中文)': row.get('产品标题(中文)', ''),
-            'SKU标题': row.get('SKU标题', ''),
-            'site': row.get('site', ''),
-            '产品URL': row.get('产品URL', ''),
-            '子类目(中文)': row.get('子类目(中文)', ''),
-            'std_brand_name': row.get('std_brand_name', ''),
-            'clean_title': clean_title,
-            'predicted_category': category,
-            'decision_reason': audit,
-            'scores_all': scores,
-            'features_bool': bool_signals,
-            'features_num': spec_signals
-        }
+        Returns:
+            (decided, categories, reasons)：已裁决的行掩码，以及两个 object 数组（未裁决的行为 None）
+        """
+        n = len(X)
+        categories = np.empty(n, dtype=object)
+        reasons = np.empty(n, dtype=object)
 
-        return result_row
+        # 1. 配件一票否决（按配置顺序取第一个命中的配件）
+        decided = accessory_hits.any(axis=1)
+        if decided.any():
+            categories[decided] = '灯光类-其他'
+            reasons[decided] = self._accessory_reasons[accessory_hits[decided].argmax(axis=1)]
 
-    def process_row_stage1(self, row):
+        # 2. 形态锁定
+        if tag_masks is None:
+            tag_masks = self.pack_tag_matrix(X[:, :len(self.tags)])
+        tag_masks = np.asarray(tag_masks, dtype=np.uint64)
+        feature_index = self.scoring_engine.feature_index
+        for bit, forced_category, tag in self._form_locks if form_locks is None else form_locks:
+            if bit:
+                hit = ((tag_masks & np.uint64(bit)) != 0) & ~decided
+            elif tag in feature_index:
+                hit = (X[:, feature_index[tag]] == 1.0) & ~decided
+            else:
+                continue
+            categories[hit] = forced_category
+            reasons[hit] = f'Form Lock: {tag}'
+            decided |= hit
+        return decided, categories, reasons
+
+    def bound_decisions_batch(self, X):
         """
-        第一阶段输出：原始标签（未归一化，未分类）
+        第四、五层的上下界裁决（整列）：规格特征未提取时，由其取值范围求各品类得分的上下界，
+        判断结果是否已经确定
 
-        用于验证：日文关键词 → 布尔标签 的转换是否正确
-        输出：原始规格值 + 布尔标签
+        - 某品类得分下界高于其余品类的上界、且不低于最低分门限 → 该品类胜出
+        - 全部品类的上界都低于最低分门限 → 灯光类-其他
+        两种判断都留有 BOUND_MARGIN 的余量，结果与完整评分后的裁决一致。
+
+        Args:
+            X: (N × F) 特征矩阵（规格特征列被忽略）
+
+        Returns:
+            (categories, reasons)：两个 object 数组，结果未确定的行为 None
         """
-        # 获取标题
+        if self._spec_form_lock or len(X) == 0:
+            return np.full(len(X), None, dtype=object), np.full(len(X), None, dtype=object)
+        low, high = self.scoring_engine.score_bounds(X, self._spec_columns, self._spec_maxima)
+        return self._bound_outcomes(low, high)
+
+    def _bound_outcome(self, low, high):
+        """单条的 _bound_outcomes（low / high 为各品类上下界的列表）；结果未确定时返回 (None, None)"""
+        winner = max(range(len(low)), key=low.__getitem__)
+        floor = low[winner]
+        rival = max((value for j, value in enumerate(high) if j != winner), default=-np.inf)
+        min_threshold = self.hard_filters.get('min_score_threshold', 30)
+        if floor - BOUND_MARGIN > rival + BOUND_MARGIN and floor - BOUND_MARGIN >= min_threshold:
+            category = self.scoring_engine.categories[winner]
+            return category, f'High Score: {category} (>={round(floor, 2)})'
+        ceiling = max(high)
+        if ceiling + BOUND_MARGIN < min_threshold:
+            return '灯光类-其他', f'Low Score: <={round(ceiling, 2)} < {min_threshold}'
+        return None, None
+
+    def _bound_outcomes(self, low, high):
+        """得分上下界 (N × C) → (categories, reasons)，见 bound_decisions_batch"""
+        n = len(low)
+        categories = np.empty(n, dtype=object)
+        reasons = np.empty(n, dtype=object)
+        rows = np.arange(n)
+        winners = np.argmax(low, axis=1)
+        floors = low[rows, winners]
+        rivals = high.copy()
+        rivals[rows, winners] = -np.inf
+        min_threshold = self.hard_filters.get('min_score_threshold', 30)
+        wins = ((floors - BOUND_MARGIN > rivals.max(axis=1) + BOUND_MARGIN)
+                & (floors - BOUND_MARGIN >= min_threshold))
+        ceilings = high.max(axis=1)
+        lows = ceilings + BOUND_MARGIN < min_threshold
+
+        names = np.asarray(self.scoring_engine.categories, dtype=object)[winners[wins]]
+        categories[wins] = names
+        reasons[wins] = [f'High Score: {c} (>={round(s, 2)})' for c, s in zip(names, floors[wins].tolist())]
+        categories[lows] = '灯光类-其他'
+        reasons[lows] = [f'Low Score: <={round(s, 2)} < {min_threshold}' for s in ceilings[lows].tolist()]
+        return categories, reasons
+
+    def _row_title(self, row):
+        """获取标题（优先使用SKU标题，fallback到产品标题）"""
+        import pandas as pd
+
         title = row.get('SKU标题', row.get('产品标题', ''))
         if pd.isna(title):
             title = ''
+        return title
 
-        # 第一层：标准化
-        clean_title = normalize_text(title)
-
-        # 第二层：信号提取（布尔标签）
+    def _row_country(self, row):
+        """根据站点判断国家代码"""
         site = row.get('site', '').upper()
         if site == 'JP':
-            country = 'JP'
+            return 'JP'
         elif site == 'CN':
-            country = 'CN'
+            return 'CN'
+        return 'US'
+
+    def _analyze_title(self, title, country, decide=True, lazy=False):
+        """
+        对单个标题执行五层分析，结果按 (原始标题, 国家) 缓存
+
+        Args:
+            title: 原始商品标题
+            country: 国家代码
+            decide: 是否需要第四、五层（评分与裁决）结果
+            lazy: 惰性求值（见 __init__ 的 lazy），只用于第二阶段；已完整计算的缓存条目直接使用
+
+        Returns:
+            _TitleAnalysis 缓存条目（调用方不得修改其中的字典）
+        """
+        key = (title, country)
+        entry = self.title_cache.get(key)
+        if entry is None:
+            # 第一层：标准化
+            with self._measure('normalize_text'):
+                clean_title = normalize_text(title)
+            # 第二层：信号提取（位掩码）
+            with self._measure('extract_signals'):
+                tag_mask = self.extract_signal_mask(clean_title, country)
+            entry = _TitleAnalysis(clean_title, tag_mask, None, None)
+            self.title_cache.put(key, entry)
+        elif entry.lazy and not lazy:
+            # 惰性裁决的条目缺少规格与得分，完整结果需要重新计算第三至五层
+            entry.scores = None
+            entry.lazy = False
+
+        if lazy and decide and entry.scores is None:
+            with self._measure('arbitrate'):
+                self._arbitrate_lazy(entry)
+
+        if entry.raw_specs is None and not entry.lazy:
+            # 第三层：规格提取（原始值与归一化值一次扫描得到）
+            with self._measure('extract_specs'):
+                entry.raw_specs, entry.spec_signals = extract_spec_values(entry.clean_title)
+
+        if decide and entry.scores is None:
+            with self._measure('calculate_scores'):
+                # 合并特征向量
+                feature_vector = {**self.mask_to_signals(entry.tag_mask), **entry.spec_signals}
+                # 第四层：计算得分
+                entry.scores = self.calculate_scores(feature_vector)
+            # 第五层：裁决
+            with self._measure('arbitrate'):
+                entry.category, entry.audit = self.arbitrate(entry.scores, feature_vector,
+                                                             entry.clean_title, tag_mask=entry.tag_mask)
+
+        return entry
+
+    def _arbitrate_lazy(self, entry):
+        """
+        惰性求值（单条）：配件拦截 → 可提前判断的形态锁定 → 得分上下界，任一能确定结果时
+        不再提取规格与评分，条目的规格特征与得分记为 NaN；都不能确定时条目保持不变
+
+        与整列的 _classify_columns_lazy 结果一致。
+        """
+        category = None
+        accessory_mask = self._accessory_matcher.match(entry.clean_title.lower())
+        if accessory_mask:
+            first = (accessory_mask & -accessory_mask).bit_length() - 1
+            category, reason = '灯光类-其他', self._accessory_reasons[first]
         else:
-            country = 'US'
+            for bit, forced_category, tag in self._lazy_form_locks:
+                if entry.tag_mask & bit:
+                    category, reason = forced_category, f'Form Lock: {tag}'
+                    break
+        if category is None:
+            if self._spec_form_lock:
+                return
+            low, high = [], []
+            for terms, (base, low_offset, high_offset) in zip(self._tag_terms, self._bound_offsets):
+                partial = base
+                for bit, weight in terms:
+                    if entry.tag_mask & bit:
+                        partial += weight
+                low.append(partial + low_offset)
+                high.append(partial + high_offset)
+            category, reason = self._bound_outcome(low, high)
+            if category is None:
+                return
+
+        entry.spec_signals = dict.fromkeys(SPEC_FEATURES, np.nan)
+        entry.scores = dict.fromkeys(self.scoring_engine.categories, np.nan)
+        entry.category, entry.audit = category, reason
+        entry.lazy = True
+
+    def classify_titles(self, titles, sites):
+        """
+        轻量批量分类：直接对标题列表执行五层（不构造 DataFrame），供常驻服务使用
 
-        bool_signals = self.extract_signals(clean_title, country)
+        Args:
+            titles: 原始商品标题列表
+            sites: 与 titles 等长的站点列表（JP/CN/其他→US）
 
-        # 第三层：规格提取（原始值，未归一化）
-        raw_specs = extract_raw_specs(clean_title)
+        Returns:
+            结果字典列表，字段与第二阶段输出一致（不含透传列）
+        """
+        countries = np.array([self._row_country({'site': site if isinstance(site, str) else ''})
+                              for site in sites], dtype=object)
+        clean_titles = [normalize_text(title) for title in titles]
+        accessory_hits = self.accessory_hits_batch(clean_titles)
+        X, _, scores, categories, reasons = self._classify_columns(clean_titles, countries, accessory_hits)
+        columns = self.stage2_columns(X, scores, categories, reasons, np.arange(len(clean_titles)))
+        return [{'clean_title': clean_title, 'predicted_category': category, 'decision_reason': reason,
+                 'scores_all': scores_all, 'features_bool': features_bool, 'features_num': features_num}
+                for clean_title, category, reason, scores_all, features_bool, features_num
+                in zip(clean_titles, columns['predicted_category'], columns['decision_reason'],
+                       columns['scores_all'], columns['features_bool'], columns['features_num'])]
+
+    def cache_info(self):
+        """
+        标题缓存统计
+
+        Returns:
+            {'hits', 'misses', 'size', 'maxsize'} 字典
+        """
+        return self.title_cache.info()
+
+    def process_row(self, row):
+        """
+        处理单条数据（第二阶段：归一化 + 分类判决）
+
+        Args:
+            row: pandas DataFrame的一行数据
+
+        Returns:
+            包含分类结果的字典（精简列）
+        """
+        return self.process_row_stage2(row)
+
+    def _row_passthrough(self, row):
+        """输出中原样保留的输入列"""
+        return {col: row.get(col, '') for col in PASSTHROUGH_COLUMNS}
+
+    def process_row_stage1(self, row):
+        """
+        第一阶段输出：原始标签（未归一化，未分类）
+
+        用于验证：日文关键词 → 布尔标签 的转换是否正确
+        输出：原始规格值 + 布尔标签
+        """
+        entry = self._analyze_title(self._row_title(row), self._row_country(row), decide=False)
 
         # 合并结果
         result_row = {
-            '产品标题(中文)': row.get('产品标题(中文)', ''),
-            'SKU标题': row.get('SKU标题', ''),
-            'site': row.get('site', ''),
-            '产品URL': row.get('产品URL', ''),
-            '子类目(中文)': row.get('子类目(中文)', ''),
-            'std_brand_name': row.get('std_brand_name', ''),
-            'clean_title': clean_title,
-            **bool_signals,
-            **raw_specs
+            **self._row_passthrough(row),
+            'clean_title': entry.clean_title,
+            **self.mask_to_signals(entry.tag_mask),
+            **entry.raw_specs
         }
 
         return result_row
@@ -245,71 +723,87 @@ class GlobalLightClassifier:
 
         用于验证：归一化后的指标是否能正确区分品类
         """
-        # 获取标题
-        title = row.get('SKU标题', row.get('产品标题', ''))
-        if pd.isna(title):
-            title = ''
-
-        # 第一层：标准化
-        clean_title = normalize_text(title)
-
-        # 第二层：信号提取
-        site = row.get('site', '').upper()
-        if site == 'JP':
-            country = 'JP'
-        elif site == 'CN':
-            country = 'CN'
-        else:
-            country = 'US'
-
-        bool_signals = self.extract_signals(clean_title, country)
-
-        # 第三层：规格提取（归一化）
-        spec_signals = extract_specs(clean_title)
-
-        # 合并特征向量
-        feature_vector = {**bool_signals, **spec_signals}
-
-        # 第四层：计算得分
-        scores = self.calculate_scores(feature_vector)
-
-        # 第五层：裁决
-        category, audit = self.arbitrate(scores, feature_vector, clean_title)
+        entry = self._analyze_title(self._row_title(row), self._row_country(row), lazy=self.lazy)
 
+        # 精简输出列：只保留用户关注的列（缓存中的字典复制后输出）
         result_row = {
-            '产品标题(中文)': row.get('产品标题(中文)', ''),
-            'SKU标题': row.get('SKU标题', ''),
-            'site': row.get('site', ''),
-            '产品URL': row.get('产品URL', ''),
-            '子类目(中文)': row.get('子类目(中文)', ''),
-            'std_brand_name': row.get('std_brand_name', ''),
-            'clean_title': clean_title,
-            'predicted_category': category,
-            'decision_reason': audit,
-            'scores_all': scores,
-            'features_bool': bool_signals,
-            'features_num': spec_signals
+            **self._row_passthrough(row),
+            'clean_title': entry.clean_title,
+            'predicted_category': entry.category,
+            'decision_reason': entry.audit,
+            'scores_all': dict(entry.scores),
+            'features_bool': self.mask_to_signals(entry.tag_mask),
+            'features_num': dict(entry.spec_signals)
         }
 
         return result_row
 
-    def process(self, df, progress_callback=None, stage=2):
+    def process_row_both(self, row):
+        """
+        两阶段合并输出：第一至三层只计算一次
+
+        列 = 第一阶段全部列（原始标签 + 原始规格值）+ 第二阶段分类列，
+        两部分分别与 process_row_stage1 / process_row_stage2 的结果一致
+        """
+        entry = self._analyze_title(self._row_title(row), self._row_country(row))
+        features_bool = self.mask_to_signals(entry.tag_mask)
+
+        return {
+            **self._row_passthrough(row),
+            'clean_title': entry.clean_title,
+            **features_bool,
+            **entry.raw_specs,
+            'predicted_category': entry.category,
+            'decision_reason': entry.audit,
+            'scores_all': dict(entry.scores),
+            'features_bool': dict(features_bool),
+            'features_num': dict(entry.spec_signals)
+        }
+
+    def process(self, df, progress_callback=None, stage=2, mode='row', store=None,
+                return_features=False, typed=False):
         """
         批量处理
 
         Args:
             df: pandas DataFrame
             progress_callback: 进度回调函数
-            stage: 输出阶段 (1=原始标签, 2=归一化+分类)
+            stage: 输出阶段 (1=原始标签, 2=归一化+分类, 'both'=两阶段列一次输出)
+            mode: 执行模式 ('row'=逐行, 'columnar'=整列批量，结果逐行一致)
+            store: 持久化分类缓存（ClassificationStore），仅整列模式支持
+            return_features: 同时返回特征快照（FeatureBatch），仅整列模式支持
+            typed: 输出定类型列代替字典列（用于 Parquet 输出），仅整列模式支持
 
         Returns:
-            处理后的DataFrame
+            处理后的DataFrame；return_features=True 时为 (DataFrame, FeatureBatch)
         """
+        if self.profiler is not None:
+            # 剖析模式：整块计时并记录内存快照
+            with self.profiler.chunk(len(df)):
+                return self._process(df, progress_callback, stage, mode, store, return_features, typed)
+        return self._process(df, progress_callback, stage, mode, store, return_features, typed)
+
+    def _process(self, df, progress_callback, stage, mode, store, return_features, typed):
+        """process 的实现（参数同 process）"""
+        if mode == 'columnar':
+            return self.process_columnar(df, progress_callback=progress_callback, stage=stage,
+                                         store=store, return_features=return_features, typed=typed)
+        if store is not None:
+            raise ValueError("持久化缓存仅支持 mode='columnar'")
+        if return_features:
+            raise ValueError("特征快照仅支持 mode='columnar'")
+        if typed:
+            raise ValueError("定类型输出仅支持 mode='columnar'")
+
+        import pandas as pd
+
         results = []
 
         # 选择处理方法
         if stage == 1:
             process_row = self.process_row_stage1
+        elif stage == 'both':
+            process_row = self.process_row_both
         else:
             process_row = self.process_row_stage2
 
@@ -322,3 +816,358 @@ class GlobalLightClassifier:
                 progress_callback(idx + 1, len(df))
 
         return pd.DataFrame(results)
+
+    def process_columnar(self, df, progress_callback=None, stage=2, store=None,
+                         return_features=False, typed=False):
+        """
+        整列批量处理：五层全部按列执行，输出与逐行 process 完全一致
+
+        Args:
+            df: pandas DataFrame
+            progress_callback: 进度回调函数；提供时每 PROGRESS_BLOCK 个唯一标题报告一次已完成的行数
+            stage: 输出阶段 (1=原始标签, 2=归一化+分类, 'both'=两阶段列一次输出)
+            store: 持久化分类缓存（ClassificationStore），仅第二阶段使用
+            return_features: 同时返回第一至三层结果（FeatureBatch），第一阶段不支持
+            typed: 输出定类型列（见 stage2_columns；第一阶段标签列为 uint8）
+
+        Returns:
+            处理后的DataFrame；return_features=True 时为 (DataFrame, FeatureBatch)
+        """
+        if return_features and stage == 1:
+            raise ValueError('特征快照仅支持第二阶段')
+        if self.lazy and stage == 2 and (store is not None or return_features):
+            raise ValueError('惰性求值跳过的标题没有规格与得分，不能写入持久化缓存或特征快照')
+
+        import pandas as pd
+        from .features import FeatureBatch
+
+        total = len(df)
+
+        # 获取标题（优先使用SKU标题，fallback到产品标题）
+        if 'SKU标题' in df.columns:
+            titles = df['SKU标题']
+        elif '产品标题' in df.columns:
+            titles = df['产品标题']
+        else:
+            titles = pd.Series([''] * total, index=df.index, dtype=object)
+
+        # 根据站点判断国家代码
+        if 'site' in df.columns:
+            sites = df['site'].astype(object).str.upper().to_numpy()
+        else:
+            sites = np.full(total, '', dtype=object)
+        countries = np.where(sites == 'JP', 'JP', np.where(sites == 'CN', 'CN', 'US'))
+
+        # 按 (原始标题, 国家) 去重：每个唯一标题只分类一次，最后按行展开
+        with self._measure('dedup', total):
+            unique_idx, inverse = _unique_rows(titles, countries)
+            unique_titles = titles.iloc[unique_idx]
+            unique_countries = countries[unique_idx]
+        n_unique = len(unique_idx)
+
+        # 第一层：标准化
+        with self._measure('normalize_text', n_unique):
+            clean_titles = normalize_series(unique_titles)
+
+        columns = {}
+        for col in PASSTHROUGH_COLUMNS:
+            columns[col] = df[col].to_numpy() if col in df.columns else np.full(total, '', dtype=object)
+        columns['clean_title'] = clean_titles.to_numpy()[inverse]
+
+        # 第二至五层按唯一标题分块执行（只在提供进度回调时分多块），各块结果拼接后按行展开
+        blocks = _unique_blocks(inverse, n_unique, progress_callback)
+        if stage == 1:
+            tag_parts, spec_parts = [], []
+            for block in blocks:
+                block_titles = clean_titles.iloc[block]
+                # 第二层：信号提取（按国家分组）
+                with self._measure('extract_signals', len(block_titles)):
+                    tag_parts.append(self.extract_signals_batch(block_titles, unique_countries[block]))
+                # 第三层：规格提取（原始值，未归一化）
+                with self._measure('extract_specs', len(block_titles)):
+                    spec_parts.append(extract_raw_specs_columns(block_titles))
+            tag_rows = np.concatenate(tag_parts)[inverse]
+            if typed:
+                tag_rows = tag_rows.astype(np.uint8)
+            for i, tag in enumerate(self.tags):
+                columns[tag] = tag_rows[:, i]
+            for col, values in _concat_columns(spec_parts).items():
+                columns[col] = values[inverse]
+        else:
+            parts, spec_parts = [], []
+            for block in blocks:
+                block_titles = clean_titles.iloc[block]
+                block_countries = unique_countries[block]
+                # 配件命中（第五层使用，标题只扫描一次）
+                with self._measure('arbitrate', len(block_titles)):
+                    block_hits = self.accessory_hits_batch(block_titles)
+                if stage == 'both':
+                    # 第二、三层只计算一次：同时展开第一阶段列，并直接用于评分
+                    with self._measure('extract_signals', len(block_titles)):
+                        block_masks = self.extract_signal_masks_batch(block_titles, block_countries)
+                    with self._measure('extract_specs', len(block_titles)):
+                        raw_specs, spec_matrix = extract_spec_values_columns(block_titles)
+                    spec_parts.append(raw_specs)
+                    classified = self._classify_columns(block_titles, block_countries, block_hits,
+                                                        tag_masks=block_masks, spec_matrix=spec_matrix)
+                elif store is None:
+                    classified = self._classify_columns(block_titles, block_countries, block_hits)
+                else:
+                    classified = self._classify_columns_cached(block_titles, block_countries, block_hits,
+                                                               store)
+                parts.append((block_hits,) + classified)
+            accessory_hits, X, tag_masks, scores, categories, reasons = [
+                np.concatenate(arrays) for arrays in zip(*parts)]
+            if stage == 'both':
+                tag_rows = self.unpack_tag_masks(tag_masks)[inverse]
+                if typed:
+                    tag_rows = tag_rows.astype(np.uint8)
+                for i, tag in enumerate(self.tags):
+                    columns[tag] = tag_rows[:, i]
+                for col, values in _concat_columns(spec_parts).items():
+                    columns[col] = values[inverse]
+            with self._measure('output', total):
+                columns.update(self.stage2_columns(X, scores, categories, reasons, inverse, typed=typed))
+
+        with self._measure('output', total):
+            result = pd.DataFrame(columns)
+        if return_features:
+            features = FeatureBatch(
+                rows=result[PASSTHROUGH_COLUMNS],
+                keys=pd.DataFrame({'clean_title': clean_titles.to_numpy(), 'country': unique_countries}),
+                row_index=inverse.astype(np.int64),
+                tag_masks=tag_masks,
+                specs=X[:, len(self.tags):len(self.tags) + len(SPEC_FEATURES)],
+                accessory_hits=accessory_hits,
+            )
+            return result, features
+        return result
+
+    def stage2_columns(self, X, scores, categories, reasons, index, typed=False):
+        """
+        组装第二阶段输出列（按 index 从去重后的结果展开到行）
+
+        Args:
+            X: (U × F) 特征矩阵，列顺序为 self.scoring_engine.features
+            scores: (U × C) 得分矩阵
+            categories, reasons: (U,) 预测品类与裁决原因
+            index: 每个输出行对应的去重行下标
+            typed: True 时输出定类型列（score_<品类> float32、标签 uint8、规格 float32），
+                代替 scores_all / features_bool / features_num 字典列
+
+        Returns:
+            列名 → 列值 的字典
+        """
+        n_tags = len(self.tags)
+        if typed:
+            columns = {'predicted_category': categories[index], 'decision_reason': reasons[index]}
+            score_rows = scores[index].astype(np.float32)
+            for j, category in enumerate(self.scoring_engine.categories):
+                columns[f'score_{category}'] = score_rows[:, j]
+            feature_rows = X[index, :n_tags + len(SPEC_FEATURES)]
+            for j, tag in enumerate(self.tags):
+                columns[tag] = feature_rows[:, j].astype(np.uint8)
+            for j, feature in enumerate(SPEC_FEATURES):
+                columns[feature] = feature_rows[:, n_tags + j].astype(np.float32)
+            return columns
+        return {
+            'predicted_category': categories[index],
+            'decision_reason': reasons[index],
+            'scores_all': [dict(zip(self.scoring_engine.categories, row))
+                           for row in self.scoring_engine.to_python(scores[index])],
+            'features_bool': [dict(zip(self.tags, row)) for row in X[index, :n_tags].tolist()],
+            'features_num': [dict(zip(SPEC_FEATURES, row))
+                             for row in X[index, n_tags:n_tags + len(SPEC_FEATURES)].tolist()],
+        }
+
+    def rescore_features(self, feature_set):
+        """
+        第四、五层（特征快照）：不读取标题，直接对保存的特征矩阵评分与裁决
+
+        Args:
+            feature_set: FeatureSet（或任何带 meta / spec_features / accessories /
+                tag_masks / specs / accessory_hits 属性的对象）
+
+        Returns:
+            (X, scores, categories, reasons)，行与快照的特征行一一对应
+
+        Raises:
+            ValueError: 信号词典与快照不一致，或配件列表新增了快照中没有的配件
+        """
+        X, tag_masks, accessory_hits = self.snapshot_matrices(feature_set)
+        _, _, _, scores = self.calculate_scores_batch(X, return_all=True)
+        categories, reasons = self.arbitrate_batch(scores, X, accessory_hits=accessory_hits,
+                                                   tag_masks=tag_masks)
+        return X, scores, categories, reasons
+
+    def snapshot_matrices(self, feature_set):
+        """
+        由特征快照组装当前配置下的特征矩阵与配件命中矩阵
+
+        Args:
+            feature_set: FeatureSet（同 rescore_features）
+
+        Returns:
+            (X, tag_masks, accessory_hits)，行与快照的特征行一一对应
+
+        Raises:
+            ValueError: 同 rescore_features
+        """
+        if feature_set.meta['signals_hash'] != self.signals_hash:
+            raise ValueError('信号词典或词边界设置与特征快照不一致，需要重新提取特征')
+        missing = [acc for acc in self.hard_filters['accessories'] if acc not in feature_set.accessories]
+        if missing:
+            raise ValueError(f'配件列表新增了快照中没有的配件 {missing}，需要重新提取特征')
+
+        # 信号词典一致 → 标签位一致；规格特征按名称映射（评分模型新增的特征名为0）
+        tag_masks = np.asarray(feature_set.tag_masks)
+        stored_specs = {name: j for j, name in enumerate(feature_set.spec_features)}
+        spec_matrix = np.zeros((len(tag_masks), len(SPEC_FEATURES)), dtype=np.float64)
+        for j, name in enumerate(SPEC_FEATURES):
+            if name in stored_specs:
+                spec_matrix[:, j] = feature_set.specs[:, stored_specs[name]]
+        X = self.feature_matrix(tag_masks, spec_matrix)
+
+        # 配件命中按当前配件列表顺序重排
+        stored = {acc: j for j, acc in enumerate(feature_set.accessories)}
+        order = [stored[acc] for acc in self.hard_filters['accessories']]
+        accessory_hits = np.asarray(feature_set.accessory_hits)[:, order]
+        return X, tag_masks, accessory_hits
+
+    def _classify_columns(self, clean_titles, countries, accessory_hits, tag_masks=None,
+                          spec_matrix=None):
+        """
+        第二至五层（整列）
+
+        Args:
+            clean_titles: 清洗后的标题序列（pandas Series）
+            countries: 国家代码数组
+            accessory_hits: 配件命中矩阵（accessory_hits_batch）
+            tag_masks: 已计算的第二层标签位掩码（提供时跳过第二层）
+            spec_matrix: 已计算的第三层规格矩阵（提供时跳过第三层，且不做惰性求值）
+
+        Returns:
+            (X, tag_masks, scores, categories, reasons): 特征矩阵、标签位掩码、得分矩阵、
+            预测品类、裁决原因
+        """
+        n = len(clean_titles)
+        # 第二层：信号提取（按国家分组，位掩码）
+        if tag_masks is None:
+            with self._measure('extract_signals', n):
+                tag_masks = self.extract_signal_masks_batch(clean_titles, countries)
+
+        if self.lazy and spec_matrix is None:
+            return self._classify_columns_lazy(clean_titles, accessory_hits, tag_masks)
+
+        # 第三层：规格提取（归一化）
+        if spec_matrix is None:
+            with self._measure('extract_specs', n):
+                spec_matrix = extract_specs_columns(clean_titles)
+
+        with self._measure('calculate_scores', n):
+            # 合并特征矩阵（列顺序与权重矩阵一致）
+            X = self.feature_matrix(tag_masks, spec_matrix)
+            # 第四层：计算得分
+            _, _, _, scores = self.calculate_scores_batch(X, return_all=True)
+
+        # 第五层：裁决
+        with self._measure('arbitrate', n):
+            categories, reasons = self.arbitrate_batch(scores, X, accessory_hits=accessory_hits,
+                                                       tag_masks=tag_masks)
+        return X, tag_masks, scores, categories, reasons
+
+    def _classify_columns_lazy(self, clean_titles, accessory_hits, tag_masks):
+        """
+        第三至五层（整列，惰性）：先做配件拦截与可提前判断的形态锁定，再对其余标题按得分上下界裁决，
+        只对结果仍未确定的标题提取规格并评分；跳过的标题规格特征与得分为 NaN
+
+        Args:
+            clean_titles: 清洗后的标题序列
+            accessory_hits: 配件命中矩阵（accessory_hits_batch）
+            tag_masks: 第二层标签位掩码
+
+        Returns:
+            同 _classify_columns
+        """
+        n = len(clean_titles)
+        spec_matrix = np.full((n, len(SPEC_FEATURES)), np.nan)
+        scores = np.full((n, len(self.scoring_engine.categories)), np.nan)
+
+        with self._measure('arbitrate', n):
+            X = self.feature_matrix(tag_masks, spec_matrix)
+            decided, categories, reasons = self.hard_decisions_batch(X, accessory_hits, tag_masks,
+                                                                     form_locks=self._lazy_form_locks)
+        pending = np.flatnonzero(~decided)
+        with self._measure('calculate_scores', len(pending)):
+            bound_categories, bound_reasons = self.bound_decisions_batch(X[pending])
+            bounded = np.not_equal(bound_categories, None)
+            categories[pending[bounded]] = bound_categories[bounded]
+            reasons[pending[bounded]] = bound_reasons[bounded]
+        pending = pending[~bounded]
+
+        if len(pending):
+            titles = np.asarray(clean_titles, dtype=object)[pending]
+            with self._measure('extract_specs', len(pending)):
+                spec_matrix[pending] = extract_specs_columns(titles)
+            X[pending] = self.feature_matrix(tag_masks[pending], spec_matrix[pending])
+            with self._measure('calculate_scores', len(pending)):
+                _, _, _, scores[pending] = self.calculate_scores_batch(X[pending], return_all=True)
+            with self._measure('arbitrate', len(pending)):
+                categories[pending], reasons[pending] = self.arbitrate_batch(
+                    scores[pending], X[pending], accessory_hits=accessory_hits[pending],
+                    tag_masks=tag_masks[pending])
+        return X, tag_masks, scores, categories, reasons
+
+    def feature_matrix(self, tag_masks, spec_matrix):
+        """
+        由标签位掩码与规格特征组装评分用的特征矩阵
+
+        Args:
+            tag_masks: (N,) 标签位掩码
+            spec_matrix: (N × S) 规格特征，列顺序为 SPEC_FEATURES
+
+        Returns:
+            (N × F) float64 特征矩阵，列顺序为 self.scoring_engine.features
+        """
+        X = np.zeros((len(tag_masks), len(self.scoring_engine.features)), dtype=np.float64)
+        X[:, :len(self.tags)] = self.unpack_tag_masks(tag_masks)
+        X[:, len(self.tags):len(self.tags) + len(SPEC_FEATURES)] = spec_matrix
+        return X
+
+    def _classify_columns_cached(self, clean_titles, countries, accessory_hits, store):
+        """
+        第二至五层（整列），先查持久化缓存，只对未命中的标题运行引擎并回写
+
+        Args:
+            clean_titles: 清洗后的标题序列（pandas Series）
+            countries: 国家代码数组
+            accessory_hits: 配件命中矩阵（accessory_hits_batch）
+            store: ClassificationStore
+
+        Returns:
+            同 _classify_columns
+        """
+        n_tags = len(self.tags)
+        with self._measure('store', len(clean_titles)):
+            found, tag_masks, specs, scores, categories, reasons = store.lookup(
+                clean_titles.tolist(), countries.tolist(), len(SPEC_FEATURES),
+                len(self.scoring_engine.categories))
+        tag_masks = tag_masks.astype(self.tag_mask_dtype)
+
+        miss = np.flatnonzero(~found)
+        if len(miss):
+            miss_titles = clean_titles.iloc[miss].reset_index(drop=True)
+            miss_countries = countries[miss]
+            X_miss, masks_miss, scores_miss, categories_miss, reasons_miss = self._classify_columns(
+                miss_titles, miss_countries, accessory_hits[miss])
+            specs_miss = X_miss[:, n_tags:n_tags + len(SPEC_FEATURES)]
+            tag_masks[miss] = masks_miss
+            specs[miss] = specs_miss
+            scores[miss] = scores_miss
+            categories[miss] = categories_miss
+            reasons[miss] = reasons_miss
+            with self._measure('store', len(miss)):
+                store.save(miss_titles.tolist(), miss_countries.tolist(),
+                           masks_miss, specs_miss, scores_miss, categories_miss, reasons_miss)
+
+        return self.feature_matrix(tag_masks, specs), tag_masks, scores, categories, reasons
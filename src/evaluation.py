@@ -0,0 +1,214 @@
+"""
+评估模块
+以标注数据（如 子类目(中文) 列或人工整理的真值表）评估分类结果：
+混淆矩阵、各品类精确率/召回率、GMV 加权准确率、按裁决原因分组的准确率，全部以整列运算完成
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+
+# 裁决原因的类别（decision_reason 冒号前的部分）
+REASON_KINDS = ['Accessory Kill', 'Form Lock', 'Low Score', 'High Score']
+
+
+def _ratio(numerator, denominator):
+    """逐元素相除，分母为0时取0"""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator != 0)
+
+
+def _factorize(values, func):
+    """
+    对去重后的取值应用 func（标签、裁决原因的唯一值远少于行数）
+
+    Returns:
+        (codes, mapped): 每行对应的唯一值下标（缺失值为 -1），以及各唯一值经 func 映射后的列表
+    """
+    codes, uniques = pd.factorize(pd.Series(values))
+    return codes, [func(value) for value in uniques.tolist()]
+
+
+def _label(value):
+    """标签去除首尾空白；非字符串与空白字符串为 None"""
+    if not isinstance(value, str):
+        return None
+    return value.strip() or None
+
+
+def _reason_kind(reason):
+    return reason.split(':', 1)[0] if isinstance(reason, str) else None
+
+
+def reason_kinds(reasons):
+    """
+    裁决原因 → 原因类别（'High Score: 平板灯 (187.0)' → 'High Score'）
+
+    Args:
+        reasons: decision_reason 序列
+
+    Returns:
+        object 数组
+    """
+    codes, kinds = _factorize(reasons, _reason_kind)
+    return np.array(kinds + [None], dtype=object)[codes]
+
+
+def evaluate(actual, predicted, reasons=None, weights=None, categories=()):
+    """
+    评估预测结果
+
+    只统计有标注的行（标注缺失或为空的行计入 unlabelled）；所有统计量由 np.bincount 一次算出，
+    百万行在秒级完成。
+
+    Args:
+        actual: 标注品类序列
+        predicted: 预测品类序列
+        reasons: decision_reason 序列（可选，用于按裁决原因分组）
+        weights: GMV 序列（可选，缺失或无法解析为数值的按0计）
+        categories: 品类顺序（通常为分类器的品类列表），标注中出现的其他标签按名称排序追加在后
+
+    Returns:
+        报告字典（可直接保存为 JSON）：
+        rows / labelled / unlabelled / accuracy / gmv_accuracy / categories /
+        confusion（行 = 标注，列 = 预测）/ per_category / reasons / top_confusions
+    """
+    # 标签先去重再映射到品类下标：标注缺失为 -1，预测缺失（理论上不会出现）为 k，不与任何标注相等
+    actual_codes, actual_labels = _factorize(actual, _label)
+    predicted_codes, predicted_labels = _factorize(predicted, _label)
+    extra = (set(actual_labels) | set(predicted_labels)) - set(categories) - {None}
+    labels = list(categories) + sorted(extra)
+    k = len(labels)
+    index = {label: i for i, label in enumerate(labels)}
+    actual_lut = np.array([index.get(label, -1) for label in actual_labels] + [-1], dtype=np.int64)
+    predicted_lut = np.array([index.get(label, k) for label in predicted_labels] + [k], dtype=np.int64)
+    actual_codes = actual_lut[actual_codes]
+    predicted_codes = predicted_lut[predicted_codes]
+
+    labelled = actual_codes >= 0
+    actual_codes = actual_codes[labelled]
+    predicted_codes = predicted_codes[labelled]
+    correct = actual_codes == predicted_codes
+    pairs = actual_codes * (k + 1) + predicted_codes
+    confusion = np.bincount(pairs, minlength=k * (k + 1)).reshape(k, k + 1)
+
+    support = confusion.sum(axis=1)
+    predicted_counts = confusion[:, :k].sum(axis=0)
+    hits = np.diagonal(confusion[:, :k])
+    precision = _ratio(hits, predicted_counts)
+    recall = _ratio(hits, support)
+    f1 = _ratio(2 * precision * recall, precision + recall)
+
+    n = int(labelled.sum())
+    report = {
+        'rows': len(labelled),
+        'labelled': n,
+        'unlabelled': len(labelled) - n,
+        'accuracy': float(correct.mean()) if n else 0.0,
+        'gmv_accuracy': None,
+        'categories': labels,
+        'confusion': confusion[:, :k].tolist(),
+    }
+
+    per_category = {}
+    for i, label in enumerate(labels):
+        per_category[label] = {'support': int(support[i]), 'predicted': int(predicted_counts[i]),
+                               'precision': float(precision[i]), 'recall': float(recall[i]),
+                               'f1': float(f1[i])}
+
+    if weights is not None:
+        gmv = pd.to_numeric(pd.Series(weights), errors='coerce').to_numpy(dtype=np.float64, na_value=0.0)
+        gmv = np.nan_to_num(gmv)[labelled]
+        gmv_support = np.bincount(actual_codes, weights=gmv, minlength=k)
+        gmv_hits = np.bincount(actual_codes[correct], weights=gmv[correct], minlength=k)
+        report['gmv_total'] = float(gmv.sum())
+        report['gmv_accuracy'] = float(_ratio(gmv[correct].sum(), gmv.sum()))
+        gmv_recall = _ratio(gmv_hits, gmv_support)
+        for i, label in enumerate(labels):
+            per_category[label]['gmv'] = float(gmv_support[i])
+            per_category[label]['gmv_recall'] = float(gmv_recall[i])
+    report['per_category'] = per_category
+
+    if reasons is not None:
+        reason_codes, kinds = _factorize(reasons, _reason_kind)
+        kind_values = list(dict.fromkeys(kinds + [None]))
+        kind_lut = np.array([kind_values.index(kind) for kind in kinds + [None]], dtype=np.int64)
+        kind_codes = kind_lut[reason_codes][labelled]
+        kind_rows = np.bincount(kind_codes, minlength=len(kind_values))
+        kind_correct = np.bincount(kind_codes, weights=correct, minlength=len(kind_values))
+        order = sorted((j for j in range(len(kind_values)) if kind_rows[j]), key=lambda j: (
+            REASON_KINDS.index(kind_values[j]) if kind_values[j] in REASON_KINDS else len(REASON_KINDS),
+            str(kind_values[j])))
+        report['reasons'] = {
+            str(kind_values[j]): {'rows': int(kind_rows[j]), 'share': float(_ratio(kind_rows[j], n)),
+                                  'accuracy': float(_ratio(kind_correct[j], kind_rows[j]))}
+            for j in order}
+
+    # 非对角线上最多的混淆对
+    off_diagonal = confusion[:, :k].copy()
+    np.fill_diagonal(off_diagonal, 0)
+    flat = np.argsort(off_diagonal, axis=None, kind='stable')[::-1][:20]
+    report['top_confusions'] = [
+        {'actual': labels[idx // k], 'predicted': labels[idx % k], 'rows': int(off_diagonal.flat[idx])}
+        for idx in flat.tolist() if off_diagonal.flat[idx] > 0]
+    return report
+
+
+def compare_reports(current, baseline):
+    """
+    与基线报告对比整体与各品类指标
+
+    Returns:
+        [(指标名, 基线值, 当前值, 差值)] 列表；任一方缺失的指标跳过
+    """
+    rows = []
+    for key in ['accuracy', 'gmv_accuracy']:
+        if current.get(key) is not None and baseline.get(key) is not None:
+            rows.append((key, baseline[key], current[key], current[key] - baseline[key]))
+    for label, stats in current['per_category'].items():
+        before = baseline.get('per_category', {}).get(label)
+        if before is None:
+            continue
+        for key in ['precision', 'recall']:
+            rows.append((f'{label}/{key}', before[key], stats[key], stats[key] - before[key]))
+    return rows
+
+
+def print_report(report, top=10):
+    """打印评估汇总"""
+    print(f"\n=== 评估结果 ===")
+    print(f"标注行数: {report['labelled']} / {report['rows']} (未标注 {report['unlabelled']})")
+    print(f"准确率: {report['accuracy']:.2%}")
+    if report['gmv_accuracy'] is not None:
+        print(f"GMV 加权准确率: {report['gmv_accuracy']:.2%} (GMV 合计 {report['gmv_total']:,.0f})")
+
+    print(f"\n{'品类':<12} {'标注':>8} {'预测':>8} {'精确率':>8} {'召回率':>8} {'F1':>8}")
+    for label, stats in report['per_category'].items():
+        if stats['support'] == 0 and stats['predicted'] == 0:
+            continue
+        print(f"{label:<12} {stats['support']:>8} {stats['predicted']:>8} {stats['precision']:>8.2%} "
+              f"{stats['recall']:>8.2%} {stats['f1']:>8.2%}")
+
+    if report.get('reasons'):
+        print('\n裁决原因:')
+        for kind, stats in report['reasons'].items():
+            print(f"  {kind:<16} {stats['rows']:>8} 条 ({stats['share']:.1%}), 准确率 {stats['accuracy']:.2%}")
+
+    if report['top_confusions']:
+        print('\n主要混淆 (标注 → 预测):')
+        for item in report['top_confusions'][:top]:
+            print(f"  {item['actual']} → {item['predicted']}: {item['rows']} 条")
+
+
+def save_report(report, path):
+    """报告保存为 JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def load_report(path):
+    """读取 JSON 报告"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,233 @@
+"""
+特征快照模块
+保存第一至三层的特征（标签位掩码 + 规格特征，.npy，可内存映射）、行键与配件命中，
+供只修改评分模型/裁决规则时跳过特征提取，直接重跑第四、五层
+"""
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .pipeline import CsvChunkWriter, make_writer
+from .utils import SPEC_FEATURES
+
+
+# 快照目录内的文件
+META_FILE = 'meta.json'
+ROWS_FILE = 'rows.csv'
+KEYS_FILE = 'keys.csv'
+TAG_MASKS_FILE = 'tag_masks.npy'
+SPECS_FILE = 'specs.npy'
+ACCESSORY_FILE = 'accessory_hits.npy'
+ROW_INDEX_FILE = 'row_index.npy'
+
+
+class FeatureBatch:
+    """
+    一批数据的第一至三层结果
+
+    特征按 (清洗后标题, 国家) 去重存储，row_index 把每个输入行映射到去重后的特征行。
+    """
+
+    __slots__ = ('rows', 'keys', 'row_index', 'tag_masks', 'specs', 'accessory_hits')
+
+    def __init__(self, rows, keys, row_index, tag_masks, specs, accessory_hits):
+        """
+        Args:
+            rows: 每行的透传列（DataFrame）
+            keys: 每个特征行的键（DataFrame: clean_title, country）
+            row_index: (N,) int64，输入行 → 特征行
+            tag_masks: (U,) 布尔标签位掩码（位 = 信号词典中的标签下标）
+            specs: (U × S) 规格特征，列顺序为 SPEC_FEATURES
+            accessory_hits: (U × A) bool，按配件列表顺序的命中矩阵
+        """
+        self.rows = rows
+        self.keys = keys
+        self.row_index = row_index
+        self.tag_masks = tag_masks
+        self.specs = specs
+        self.accessory_hits = accessory_hits
+
+    def __len__(self):
+        return len(self.row_index)
+
+    @staticmethod
+    def concat(batches):
+        """按顺序拼接多批结果（row_index 自动平移）"""
+        offsets = np.cumsum([0] + [len(b.keys) for b in batches[:-1]])
+        return FeatureBatch(
+            pd.concat([b.rows for b in batches], ignore_index=True),
+            pd.concat([b.keys for b in batches], ignore_index=True),
+            np.concatenate([b.row_index + offset for b, offset in zip(batches, offsets)]),
+            np.concatenate([b.tag_masks for b in batches]),
+            np.concatenate([b.specs for b in batches]),
+            np.concatenate([b.accessory_hits for b in batches]),
+        )
+
+
+def _write_npy(path, raw_path, dtype, n_rows, n_cols):
+    """把追加写出的原始二进制转为 .npy（只写文件头，数据流式拷贝）"""
+    shape = (n_rows,) if n_cols is None else (n_rows, n_cols)
+    header = {'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+              'fortran_order': False, 'shape': shape}
+    with open(path, 'wb') as out, open(raw_path, 'rb') as raw:
+        np.lib.format.write_array_header_1_0(out, header)
+        shutil.copyfileobj(raw, out)
+    os.remove(raw_path)
+
+
+class FeatureWriter:
+    """
+    特征快照写出器
+
+    逐批追加，close() 时生成 .npy 文件与 meta.json，内存占用与数据量无关。
+    """
+
+    def __init__(self, path, classifier):
+        """
+        Args:
+            path: 快照目录（已存在的快照文件会被覆盖）
+            classifier: 生成特征的 GlobalLightClassifier
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.tag_mask_dtype = np.dtype(classifier.tag_mask_dtype)
+        self.meta = {
+            'signals_hash': classifier.signals_hash,
+            'tags': list(classifier.tags),
+            'spec_features': list(SPEC_FEATURES),
+            'accessories': list(classifier.hard_filters['accessories']),
+        }
+        self.n_rows = 0
+        self.n_keys = 0
+        self._rows_writer = CsvChunkWriter(os.path.join(path, ROWS_FILE))
+        self._keys_writer = CsvChunkWriter(os.path.join(path, KEYS_FILE))
+        self._raw = {name: open(os.path.join(path, name + '.part'), 'wb')
+                     for name in (TAG_MASKS_FILE, SPECS_FILE, ACCESSORY_FILE, ROW_INDEX_FILE)}
+
+    def write(self, batch):
+        """追加一批特征"""
+        self._rows_writer.write(batch.rows)
+        self._keys_writer.write(batch.keys)
+        self._raw[TAG_MASKS_FILE].write(np.ascontiguousarray(batch.tag_masks, dtype=self.tag_mask_dtype).tobytes())
+        self._raw[SPECS_FILE].write(np.ascontiguousarray(batch.specs, dtype=np.float64).tobytes())
+        self._raw[ACCESSORY_FILE].write(np.ascontiguousarray(batch.accessory_hits, dtype=bool).tobytes())
+        self._raw[ROW_INDEX_FILE].write((batch.row_index + self.n_keys).astype(np.int64).tobytes())
+        self.n_rows += len(batch.row_index)
+        self.n_keys += len(batch.keys)
+
+    def close(self):
+        """生成 .npy 与 meta.json"""
+        for f in self._raw.values():
+            f.close()
+        n_acc = len(self.meta['accessories'])
+        for name, dtype, n_cols in [(TAG_MASKS_FILE, self.tag_mask_dtype, None),
+                                    (SPECS_FILE, np.float64, len(SPEC_FEATURES)),
+                                    (ACCESSORY_FILE, bool, n_acc),
+                                    (ROW_INDEX_FILE, np.int64, None)]:
+            n = self.n_rows if name == ROW_INDEX_FILE else self.n_keys
+            _write_npy(os.path.join(self.path, name), os.path.join(self.path, name + '.part'),
+                       dtype, n, n_cols)
+
+        self.meta.update({'n_rows': self.n_rows, 'n_keys': self.n_keys})
+        with open(os.path.join(self.path, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class FeatureSet:
+    """
+    已保存的特征快照（标签位掩码、规格特征与配件命中以内存映射方式打开）
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: 快照目录
+        """
+        self.path = path
+        with open(os.path.join(path, META_FILE), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.tags = self.meta['tags']
+        self.spec_features = self.meta['spec_features']
+        self.accessories = self.meta['accessories']
+        self.tag_masks = np.load(os.path.join(path, TAG_MASKS_FILE), mmap_mode='r')
+        self.specs = np.load(os.path.join(path, SPECS_FILE), mmap_mode='r')
+        self.accessory_hits = np.load(os.path.join(path, ACCESSORY_FILE), mmap_mode='r')
+        self.row_index = np.load(os.path.join(path, ROW_INDEX_FILE), mmap_mode='r')
+
+    def __len__(self):
+        return self.meta['n_rows']
+
+    def keys(self):
+        """特征行键（clean_title, country）"""
+        return pd.read_csv(os.path.join(self.path, KEYS_FILE), dtype=str, keep_default_na=False)
+
+    def read_columns(self, columns):
+        """
+        读取透传列中的指定列（如 子类目(中文) 标注）
+
+        Raises:
+            ValueError: 快照中没有该列
+        """
+        return pd.read_csv(os.path.join(self.path, ROWS_FILE), dtype=str, keep_default_na=False,
+                           usecols=columns)
+
+    def iter_rows(self, chunksize):
+        """
+        分块读取透传列
+
+        Yields:
+            (start, DataFrame)：块起始行号与透传列
+        """
+        start = 0
+        with pd.read_csv(os.path.join(self.path, ROWS_FILE), dtype=str, keep_default_na=False,
+                         chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield start, chunk
+                start += len(chunk)
+
+
+def rescore(classifier, feature_set, output_path, chunksize=100000, stats=None,
+            output_format='csv', partition_by=None):
+    """
+    只重跑第四、五层：读取特征快照，用当前评分模型与裁决规则重新分类
+
+    输出与 main.py 第二阶段整列模式逐字节一致（在相同配置下）。
+
+    Args:
+        classifier: GlobalLightClassifier（信号词典须与快照一致）
+        feature_set: FeatureSet
+        output_path: 输出CSV路径
+        chunksize: 每次写出的行数
+        stats: RunningStats，逐块累加统计（可选）
+        output_format: 'csv'（字典列）或 'parquet'（定类型列）
+        partition_by: Parquet 分区列（可选）
+
+    Returns:
+        输出行数
+    """
+    # 第四、五层：对去重后的特征行整体评分与裁决
+    X, scores, categories, reasons = classifier.rescore_features(feature_set)
+    clean_titles = feature_set.keys()['clean_title'].to_numpy(dtype=object)
+
+    typed = output_format == 'parquet'
+    writer = make_writer(output_path, output_format, partition_by)
+    for start, rows in feature_set.iter_rows(chunksize):
+        index = np.asarray(feature_set.row_index[start:start + len(rows)])
+        columns = {col: rows[col].to_numpy() for col in rows.columns}
+        columns['clean_title'] = clean_titles[index]
+        columns.update(classifier.stage2_columns(X, scores, categories, reasons, index, typed=typed))
+        df_result = pd.DataFrame(columns)
+        writer.write(df_result)
+        if stats is not None:
+            stats.update(df_result)
+    writer.close()
+    return writer.rows_written
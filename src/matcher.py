@@ -0,0 +1,128 @@
+"""
+多模式关键词匹配模块
+将一组关键词预编译为单个匹配器，一次扫描即可得到全部命中
+"""
+import re
+
+
+# 短英文关键词的词边界：前后不能紧邻ASCII字母或数字
+# 不使用 \b，因为 \b 会把日文假名视为单词字符（"ringライト" 将无法命中）
+_ASCII_WORD = 'a-z0-9'
+_BOUNDARY_BEFORE = r'(?<![' + _ASCII_WORD + r'])'
+_BOUNDARY_AFTER = r'(?![' + _ASCII_WORD + r'])'
+_ASCII_WORD_RE = re.compile(r'[' + _ASCII_WORD + r']')
+
+
+def _is_ascii_word_char(ch):
+    return bool(_ASCII_WORD_RE.match(ch))
+
+
+def _build_trie_regex(keywords):
+    """
+    将关键词列表构造为前缀树形式的正则表达式
+
+    例如 ['flash', 'flashlight', 'fill light'] →
+    f(?:ill\\ light|lash(?:light)?)
+
+    贪婪的可选分支保证在同一起点总是匹配到最长的关键词，
+    正则引擎沿前缀树单路径推进，代价接近自动机。
+    """
+    trie = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[''] = None  # 终止标记
+
+    def render(node):
+        terminal = '' in node
+        branches = [re.escape(ch) + render(child)
+                    for ch, child in sorted(node.items()) if ch != '']
+        if not branches:
+            return ''
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        body = '(?:' + '|'.join(branches) + ')'
+        return body + '?' if terminal else body
+
+    return render(trie)
+
+
+class KeywordMatcher:
+    """
+    多模式关键词匹配器（Aho-Corasick 的等价组合匹配器）
+
+    每个关键词关联一个整数位掩码（通常为其所属标签的位），
+    match() 对文本只扫描一次，返回所有命中关键词位掩码的按位或。
+
+    语义与逐个 `kw in text` 完全一致：
+    在每个起点只取最长命中的关键词，其所有前缀关键词（必然同时命中）
+    的位掩码在编译期已并入该关键词的闭包掩码。
+    """
+
+    def __init__(self, keyword_masks, word_boundary_max_len=0):
+        """
+        Args:
+            keyword_masks: 可迭代的 (关键词, 位掩码) 对，同一关键词可重复出现
+            word_boundary_max_len: 长度不超过该值的纯ASCII关键词使用词边界匹配
+                （例如 "pad"、"ring"、"ttl"），0 表示全部使用子串匹配
+        """
+        masks = {}
+        for kw, mask in keyword_masks:
+            masks[kw] = masks.get(kw, 0) | mask
+
+        # 空关键词对任意文本都成立（与 '' in text 一致）
+        self.always_mask = masks.pop('', 0)
+        self.word_boundary_max_len = word_boundary_max_len
+
+        bounded = {kw: m for kw, m in masks.items() if self._is_bounded(kw)}
+        free = {kw: m for kw, m in masks.items() if kw not in bounded}
+
+        self._patterns = []
+        if free:
+            pattern = re.compile('(?=(' + _build_trie_regex(free) + '))')
+            self._patterns.append((pattern, self._closure(free, bounded=False)))
+        if bounded:
+            pattern = re.compile(_BOUNDARY_BEFORE + '(?=(' + _build_trie_regex(bounded) + ')'
+                                 + _BOUNDARY_AFTER + ')')
+            self._patterns.append((pattern, self._closure(bounded, bounded=True)))
+
+    def _is_bounded(self, kw):
+        return (0 < len(kw) <= self.word_boundary_max_len
+                and kw.isascii() and _is_ascii_word_char(kw[0]) and _is_ascii_word_char(kw[-1]))
+
+    @staticmethod
+    def _closure(masks, bounded):
+        """
+        计算每个关键词的闭包掩码：自身掩码 | 所有同起点必然命中的前缀关键词掩码
+
+        词边界模式下，前缀关键词只有在其结尾处同样构成词边界时才会命中。
+        """
+        closure = {}
+        for kw, mask in masks.items():
+            total = mask
+            for i in range(1, len(kw)):
+                prefix = kw[:i]
+                if prefix not in masks:
+                    continue
+                if bounded and _is_ascii_word_char(kw[i]):
+                    continue
+                total |= masks[prefix]
+            closure[kw] = total
+        return closure
+
+    def match(self, text):
+        """
+        扫描文本一次，返回命中关键词的位掩码按位或
+
+        Args:
+            text: 待匹配文本
+
+        Returns:
+            整数位掩码
+        """
+        result = self.always_mask
+        for pattern, closure in self._patterns:
+            for kw in set(pattern.findall(text)):
+                result |= closure[kw]
+        return result
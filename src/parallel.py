@@ -0,0 +1,171 @@
+"""
+多进程并行分类模块
+按标题长度均衡切块，分发到进程池，结果按原始行顺序拼接
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .features import FeatureBatch
+
+
+# 每行的固定开销（折算为字符数），避免短标题块行数过多
+ROW_OVERHEAD_CHARS = 32
+
+# 每个工作进程持有的分类器（进程初始化时接收一次）
+_worker_classifier = None
+
+
+def _init_worker(classifier):
+    """工作进程初始化：接收分类器，整个进程生命周期内复用"""
+    global _worker_classifier
+    _worker_classifier = classifier
+
+
+def _process_chunk(task):
+    """工作进程：处理一个数据块"""
+    chunk, stage, mode, store, return_features, typed = task
+    return _worker_classifier.process(chunk, stage=stage, mode=mode, store=store,
+                                      return_features=return_features, typed=typed)
+
+
+def title_lengths(df):
+    """
+    估算每行的处理代价：标题字符数 + 固定开销
+
+    Args:
+        df: pandas DataFrame
+
+    Returns:
+        int64 数组
+    """
+    if 'SKU标题' in df.columns:
+        titles = df['SKU标题']
+    elif '产品标题' in df.columns:
+        titles = df['产品标题']
+    else:
+        return np.full(len(df), ROW_OVERHEAD_CHARS, dtype=np.int64)
+    lengths = np.fromiter((len(t) if isinstance(t, str) else 0 for t in titles),
+                          dtype=np.int64, count=len(df))
+    return lengths + ROW_OVERHEAD_CHARS
+
+
+def split_balanced(df, n_chunks):
+    """
+    将 DataFrame 切分为连续的 n_chunks 块，使各块的标题总字符数大致相等
+
+    Args:
+        df: pandas DataFrame
+        n_chunks: 目标块数
+
+    Returns:
+        DataFrame 块列表（保持原始行顺序，不含空块）
+    """
+    if len(df) == 0:
+        return []
+    cumulative = np.cumsum(title_lengths(df))
+    targets = np.linspace(0, cumulative[-1], n_chunks + 1)[1:-1]
+    bounds = [0] + np.searchsorted(cumulative, targets, side='right').tolist() + [len(df)]
+    return [df.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+
+class ParallelProcessor:
+    """
+    可复用的并行处理器
+
+    进程池在 with 块内只创建一次，适合对多个数据块（如流式读取的分块）连续调用。
+    workers <= 1 时不创建进程池，直接在当前进程处理。
+    """
+
+    def __init__(self, classifier, workers, stage=2, mode='columnar', chunks_per_worker=4,
+                 store=None, return_features=False, typed=False):
+        """
+        Args:
+            classifier: GlobalLightClassifier 实例（每个工作进程接收一次）
+            workers: 进程数
+            stage: 输出阶段 (1=原始标签, 2=归一化+分类)
+            mode: 每块的执行模式 ('row' / 'columnar')
+            chunks_per_worker: 每个进程分到的块数，块越多负载越均衡
+            store: 持久化分类缓存（ClassificationStore），各工作进程各自打开连接
+            return_features: process() 同时返回特征快照（FeatureBatch）
+            typed: 输出定类型列（用于 Parquet 输出）
+        """
+        self.classifier = classifier
+        self.workers = workers
+        self.stage = stage
+        self.mode = mode
+        self.chunks_per_worker = chunks_per_worker
+        self.store = store
+        self.return_features = return_features
+        self.typed = typed
+        self._pool = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self.classifier,))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def process(self, df, progress_callback=None):
+        """
+        处理一个 DataFrame
+
+        Args:
+            df: pandas DataFrame
+            progress_callback: 进度回调函数
+
+        Returns:
+            处理后的DataFrame（与单进程结果行序一致）；
+            return_features=True 时为 (DataFrame, FeatureBatch)
+        """
+        if self._pool is None or len(df) == 0:
+            return self.classifier.process(df, progress_callback=progress_callback,
+                                           stage=self.stage, mode=self.mode, store=self.store,
+                                           return_features=self.return_features, typed=self.typed)
+
+        chunks = split_balanced(df, self.workers * self.chunks_per_worker)
+        tasks = [(chunk, self.stage, self.mode, self.store, self.return_features, self.typed)
+                 for chunk in chunks]
+
+        results = []
+        done = 0
+        # map 按提交顺序返回结果，保证行序
+        for chunk, result in zip(chunks, self._pool.map(_process_chunk, tasks)):
+            results.append(result)
+            done += len(chunk)
+            if progress_callback:
+                progress_callback(done, len(df))
+
+        if self.return_features:
+            frames, batches = zip(*results)
+            return pd.concat(frames, ignore_index=True), FeatureBatch.concat(batches)
+        return pd.concat(results, ignore_index=True)
+
+
+def process_parallel(classifier, df, workers, stage=2, mode='columnar',
+                     progress_callback=None, chunks_per_worker=4, store=None):
+    """
+    多进程并行批量处理
+
+    Args:
+        classifier: GlobalLightClassifier 实例（每个工作进程接收一次）
+        df: pandas DataFrame
+        workers: 进程数
+        stage: 输出阶段 (1=原始标签, 2=归一化+分类)
+        mode: 每块的执行模式 ('row' / 'columnar')
+        progress_callback: 进度回调函数
+        chunks_per_worker: 每个进程分到的块数，块越多负载越均衡
+        store: 持久化分类缓存（ClassificationStore）
+
+    Returns:
+        处理后的DataFrame（与单进程结果行序一致）
+    """
+    with ParallelProcessor(classifier, workers, stage=stage, mode=mode,
+                           chunks_per_worker=chunks_per_worker, store=store) as processor:
+        return processor.process(df, progress_callback=progress_callback)
@@ -0,0 +1,695 @@
+"""
+流式处理模块
+分块读取输入、逐块分类并追加写出，统计量以累加计数器维护，内存占用与文件大小无关
+"""
+import hashlib
+import os
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from .classifier import SHORTCUTS, shortcut_kind
+from .utils import RAW_SPEC_COLUMNS
+
+
+# 分块读取 Excel 时每块的默认行数
+EXCEL_CHUNKSIZE = 50000
+
+# pandas read_csv 默认识别为缺失值的字符串（Arrow 读取 CSV 时保持一致）
+CSV_NULL_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+                   '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+# 以分类类型存储的低基数列
+CATEGORICAL_COLUMNS = ['site']
+
+# Arrow CSV 流式读取的块字节数（每块再按 chunksize 行重新切分）
+CSV_BLOCK_SIZE = 16 << 20
+
+
+def _is_excel(path):
+    return path.endswith('.xlsx') or path.endswith('.xls')
+
+
+def read_input(path, sample=None, excel_cache=None, columns=None):
+    """
+    一次性读取输入文件（CSV/Excel/Parquet）
+
+    Args:
+        path: 输入文件路径
+        sample: 只读取前N条
+        excel_cache: Excel 的 Parquet 旁路文件目录（见 excel_sidecar）
+        columns: 只保留这些列（文件中不存在的列忽略）；提供时字符串列以 Arrow 存储，site 为分类类型。
+            None 时读取全部列、类型由 pandas 推断
+
+    Returns:
+        pandas DataFrame
+    """
+    if not (_is_excel(path) or path.endswith('.parquet')):
+        if columns is None:
+            return pd.read_csv(path, nrows=sample)
+        if sample is None:
+            return read_csv_projected(path, columns)
+    chunks = list(iter_input_chunks(path, EXCEL_CHUNKSIZE, sample=sample, excel_cache=excel_cache))
+    if len(chunks) == 1:
+        df = chunks[0]
+    else:
+        df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    return df if columns is None else compact_frame(df, columns)
+
+
+def iter_input_chunks(path, chunksize, sample=None, excel_cache=None, columns=None):
+    """
+    分块读取输入文件
+
+    Args:
+        path: 输入文件路径（CSV/Excel/Parquet）
+        chunksize: 每块行数
+        sample: 只读取前N条
+        excel_cache: Excel 的 Parquet 旁路文件目录；提供时先转换（已转换则复用）再读取旁路文件
+        columns: 只保留这些列（见 read_input）；CSV 改用 Arrow 多线程流式读取
+
+    Yields:
+        pandas DataFrame 数据块
+    """
+    if _is_excel(path):
+        if excel_cache:
+            path = excel_sidecar(path, excel_cache)
+        elif path.endswith('.xlsx'):
+            chunks = iter_excel_chunks(path, chunksize, sample=sample)
+            yield from chunks if columns is None else (compact_frame(c, columns) for c in chunks)
+            return
+        else:
+            # 旧版 .xls 不支持只读流式读取，整表读入后再切块
+            df = pd.read_excel(path, nrows=sample)
+            if columns is not None:
+                df = compact_frame(df, columns)
+            for start in range(0, len(df), chunksize):
+                yield df.iloc[start:start + chunksize]
+            return
+
+    if path.endswith('.parquet'):
+        yield from iter_parquet_chunks(path, chunksize, sample=sample, columns=columns)
+        return
+
+    if columns is not None:
+        yield from iter_csv_projected(path, chunksize, columns, sample=sample)
+        return
+
+    with pd.read_csv(path, chunksize=chunksize, nrows=sample) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def _string_dtype():
+    """Arrow 存储、缺失值为 NaN 的字符串类型（pandas 3 的默认 str 类型）；旧版 pandas 返回 None"""
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)
+    except (TypeError, ImportError):
+        return None
+
+
+def compact_frame(df, columns):
+    """
+    投影并压缩已读入的数据块：只保留 columns 中存在的列，字符串列转为 Arrow 存储，site 转为分类类型
+
+    Args:
+        df: pandas DataFrame
+        columns: 需要保留的列
+
+    Returns:
+        新的 DataFrame（列顺序与原文件一致）
+    """
+    df = df[[col for col in df.columns if col in columns]]
+    string_dtype = _string_dtype()
+    converted = {}
+    for col in df.columns:
+        if col in CATEGORICAL_COLUMNS:
+            converted[col] = df[col].astype('category')
+        elif string_dtype is not None and df[col].dtype == object:
+            # 只转换纯字符串列（Excel 中数字与字符串混合的列保持原样）
+            if pd.api.types.infer_dtype(df[col], skipna=True) == 'string':
+                converted[col] = df[col].astype(string_dtype)
+    return df.assign(**converted) if converted else df
+
+
+def _csv_header(path):
+    """读取 CSV 表头（与 pd.read_csv 一样去掉 UTF-8 BOM）"""
+    import csv
+
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return next(csv.reader(f), [])
+
+
+def _arrow_csv_options(path, columns, use_threads=True, block_size=None):
+    """
+    Arrow CSV 读取选项：只解析 columns 中存在的列，全部按字符串读取，缺失值规则与 pandas 一致
+
+    Returns:
+        (ReadOptions, ParseOptions, ConvertOptions)
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    projected = [col for col in _csv_header(path) if col in columns]
+    read_options = pacsv.ReadOptions(use_threads=use_threads)
+    if block_size:
+        read_options.block_size = block_size
+    # 字段内可能含换行（商品标题常见），需要按引号解析换行
+    parse_options = pacsv.ParseOptions(newlines_in_values=True)
+    convert_options = pacsv.ConvertOptions(
+        include_columns=projected, column_types={col: pa.string() for col in projected},
+        null_values=CSV_NULL_VALUES, strings_can_be_null=True, quoted_strings_can_be_null=True)
+    return read_options, parse_options, convert_options
+
+
+def _arrow_to_frame(table):
+    """Arrow 表 → DataFrame：字符串列保持 Arrow 存储，site 为分类类型"""
+    string_dtype = _string_dtype()
+    import pyarrow as pa
+
+    types_mapper = {pa.string(): string_dtype}.get if string_dtype is not None else None
+    df = table.to_pandas(types_mapper=types_mapper)
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def read_csv_projected(path, columns):
+    """
+    以 Arrow 多线程 CSV 读取器一次性读取 CSV，只解析需要的列
+
+    大文件中分类用不到的列（GMV、类目等）不会被转换为 Python 对象，加载耗时与常驻内存
+    只与所需列的数据量有关。未安装 pyarrow 时退回 pd.read_csv(usecols=...)。
+
+    Args:
+        path: CSV 文件路径
+        columns: 需要的列（文件中不存在的列忽略）
+
+    Returns:
+        pandas DataFrame
+    """
+    try:
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return compact_frame(pd.read_csv(path, usecols=lambda col: col in columns, dtype=str), columns)
+
+    read_options, parse_options, convert_options = _arrow_csv_options(path, columns)
+    table = pacsv.read_csv(path, read_options=read_options, parse_options=parse_options,
+                           convert_options=convert_options)
+    return _arrow_to_frame(table)
+
+
+def iter_csv_projected(path, chunksize, columns, sample=None):
+    """
+    以 Arrow 流式 CSV 读取器分块读取，只解析需要的列，按 chunksize 行重新切块
+
+    Args:
+        path: CSV 文件路径
+        chunksize: 每块行数
+        columns: 需要的列
+        sample: 只读取前N条
+
+    Yields:
+        pandas DataFrame 数据块
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        with pd.read_csv(path, usecols=lambda col: col in columns, dtype=str, chunksize=chunksize,
+                         nrows=sample) as reader:
+            for chunk in reader:
+                yield compact_frame(chunk, columns)
+        return
+
+    read_options, parse_options, convert_options = _arrow_csv_options(path, columns,
+                                                                       block_size=CSV_BLOCK_SIZE)
+    remaining = sample
+    pending = []
+    pending_rows = 0
+    with pacsv.open_csv(path, read_options=read_options, parse_options=parse_options,
+                        convert_options=convert_options) as reader:
+        for batch in reader:
+            if remaining is not None:
+                batch = batch.slice(0, remaining)
+                remaining -= len(batch)
+            pending.append(batch)
+            pending_rows += len(batch)
+            while pending_rows >= chunksize:
+                table = pa.Table.from_batches(pending)
+                yield _arrow_to_frame(table.slice(0, chunksize))
+                rest = table.slice(chunksize)
+                pending = rest.to_batches()
+                pending_rows = len(rest)
+            if remaining is not None and remaining <= 0:
+                break
+        if pending_rows:
+            yield _arrow_to_frame(pa.Table.from_batches(pending))
+
+
+def _excel_header(values):
+    """表头处理与 pd.read_excel 一致：空单元格为 Unnamed: i，重复列名加 .1/.2 后缀"""
+    names = []
+    seen = {}
+    for i, value in enumerate(values):
+        name = f'Unnamed: {i}' if value is None else value
+        if name in seen:
+            count = seen[name]
+            while f'{name}.{count}' in seen:
+                count += 1
+            seen[name] = count + 1
+            name = f'{name}.{count}'
+        seen[name] = seen.get(name, 1)
+        names.append(name)
+    return names
+
+
+def _excel_frame(rows, columns):
+    """行元组 → DataFrame，空单元格与 pd.read_excel 一样为 NaN（全空列为 float64）"""
+    df = pd.DataFrame(rows, columns=columns)
+    for i, dtype in enumerate(df.dtypes):
+        if dtype == object:
+            column = df.iloc[:, i]
+            missing = column.isna()
+            if missing.all():
+                df.isetitem(i, column.astype(np.float64))
+            elif missing.any():
+                df.isetitem(i, column.where(~missing, np.nan))
+    return df
+
+
+def iter_excel_chunks(path, chunksize, sample=None):
+    """
+    以 openpyxl 只读模式逐行流式读取 .xlsx 的第一个工作表
+
+    只读模式按需解析 XML，不在内存中构建完整的单元格对象，内存占用与表格大小基本无关。
+    与 pd.read_excel 一样以第一行作为表头、忽略末尾的空行。
+
+    Args:
+        path: .xlsx 文件路径
+        chunksize: 每块行数
+        sample: 只读取前N条
+
+    Yields:
+        pandas DataFrame 数据块
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        # 去掉表头末尾的空单元格（只读模式会返回到工作表最大列）
+        width = len(header)
+        while width and header[width - 1] is None:
+            width -= 1
+        columns = _excel_header(header[:width])
+
+        buffer = []
+        blank = 0
+        emitted = 0
+        for row in rows:
+            row = row[:width]
+            if all(value is None for value in row):
+                # 空行先计数，后面还有数据时才补上（末尾空行丢弃）
+                blank += 1
+                continue
+            if blank:
+                buffer.extend([(None,) * width] * blank)
+                blank = 0
+            buffer.append(row + (None,) * (width - len(row)))
+
+            if sample is not None and emitted + len(buffer) >= sample:
+                buffer = buffer[:sample - emitted]
+                break
+            while len(buffer) >= chunksize:
+                yield _excel_frame(buffer[:chunksize], columns)
+                emitted += chunksize
+                buffer = buffer[chunksize:]
+
+        while buffer:
+            yield _excel_frame(buffer[:chunksize], columns)
+            buffer = buffer[chunksize:]
+    finally:
+        workbook.close()
+
+
+def iter_parquet_chunks(path, chunksize, sample=None, columns=None):
+    """
+    按 row batch 分块读取 Parquet 文件
+
+    Args:
+        path: Parquet 文件路径
+        chunksize: 每块行数
+        sample: 只读取前N条
+        columns: 只读取这些列（见 read_input）；None 时读取全部列
+
+    Yields:
+        pandas DataFrame 数据块
+    """
+    import pyarrow.parquet as pq
+
+    remaining = sample
+    with pq.ParquetFile(path) as parquet_file:
+        projected = None
+        if columns is not None:
+            projected = [col for col in parquet_file.schema_arrow.names if col in columns]
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=projected):
+            if remaining is not None:
+                if remaining <= 0:
+                    return
+                batch = batch.slice(0, remaining)
+                remaining -= len(batch)
+            yield batch.to_pandas() if columns is None else compact_frame(_arrow_to_frame(batch), columns)
+
+
+def excel_sidecar_path(path, cache_dir):
+    """
+    Excel 文件对应的 Parquet 旁路文件路径（文件名含内容哈希，Excel 变更后自动对应新文件）
+
+    Args:
+        path: Excel 文件路径
+        cache_dir: 旁路文件目录
+
+    Returns:
+        <cache_dir>/<文件名>-<sha256前16位>.parquet
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f'{stem}-{digest.hexdigest()[:16]}.parquet')
+
+
+def _unify_tables(tables):
+    """
+    统一各块 Arrow 表的列类型：数值/空列按宽松规则提升，与字符串混合的列统一转为字符串
+    """
+    import pyarrow as pa
+
+    for name in tables[0].column_names:
+        types = {table.schema.field(name).type for table in tables}
+        if any(pa.types.is_string(t) or pa.types.is_large_string(t) for t in types) and \
+                not all(pa.types.is_string(t) or pa.types.is_null(t) for t in types):
+            tables = [table.set_column(table.column_names.index(name), name,
+                                       table[name].cast(pa.string())) for table in tables]
+    return pa.concat_tables(tables, promote_options='permissive')
+
+
+def _to_arrow(df):
+    """DataFrame 块 → Arrow 表；同时含字符串与其他类型的 object 列转为字符串"""
+    import pyarrow as pa
+
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        df = df.copy()
+        for col in df.columns:
+            if df[col].dtype == object:
+                df[col] = df[col].map(lambda v: v if v is None or isinstance(v, str) or v != v else str(v))
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def excel_sidecar(path, cache_dir, chunksize=EXCEL_CHUNKSIZE):
+    """
+    返回 Excel 的 Parquet 旁路文件路径，不存在时先流式转换一次
+
+    同一 Excel 文件反复运行时只转换一次，之后直接按列式格式读取。
+
+    Args:
+        path: Excel 文件路径
+        cache_dir: 旁路文件目录
+        chunksize: 转换时每块读取的行数
+
+    Returns:
+        Parquet 旁路文件路径
+    """
+    import pyarrow.parquet as pq
+
+    sidecar = excel_sidecar_path(path, cache_dir)
+    if os.path.exists(sidecar):
+        return sidecar
+
+    if path.endswith('.xlsx'):
+        chunks = iter_excel_chunks(path, chunksize)
+    else:
+        chunks = [pd.read_excel(path)]
+    tables = [_to_arrow(chunk) for chunk in chunks]
+    if not tables:
+        raise ValueError(f'Excel 文件没有数据: {path}')
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f'{sidecar}.{os.getpid()}.tmp'
+    pq.write_table(_unify_tables(tables), tmp_path)
+    os.replace(tmp_path, sidecar)
+    return sidecar
+
+
+class CsvChunkWriter:
+    """
+    分块追加写出CSV
+
+    表头只在第一块写出；BOM 只在文件开头写一次（utf-8-sig），
+    后续块以 utf-8 追加，避免文件中间出现多余的 BOM。
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: 输出文件路径（已存在则覆盖）
+        """
+        self.path = path
+        self.rows_written = 0
+        self._started = False
+
+        output_dir = os.path.dirname(path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
+
+    def write(self, df):
+        """追加写出一个数据块"""
+        if not self._started:
+            df.to_csv(self.path, index=False, encoding='utf-8-sig')
+            self._started = True
+        else:
+            df.to_csv(self.path, index=False, header=False, mode='a', encoding='utf-8')
+        self.rows_written += len(df)
+
+    def close(self):
+        """结束写出（CSV 每块写完即落盘，无需额外操作）"""
+
+
+class ParquetChunkWriter:
+    """
+    分块写出Parquet
+
+    不分区时所有块写入同一文件（每块一个 row group）；指定 partition_by 时
+    写为按该列分区的目录（<列>=<值>/part-*.parquet）。
+    site / predicted_category 以字典编码（类别型）存储，其余列类型以第一块为准。
+    """
+
+    # 字典编码的列
+    DICTIONARY_COLUMNS = ('site', 'predicted_category')
+
+    def __init__(self, path, partition_by=None):
+        """
+        Args:
+            path: 输出文件路径（已存在则覆盖）；分区时为输出目录（须不存在或为空）
+            partition_by: 分区列（'site' / 'predicted_category'），默认不分区
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError('Parquet 输出需要 pyarrow: pip install pyarrow')
+
+        self.path = path
+        self.partition_by = partition_by
+        self.rows_written = 0
+        self._schema = None
+        self._writer = None
+        self._parts = 0
+
+        if partition_by:
+            if os.path.isdir(path) and os.listdir(path):
+                raise FileExistsError(f'分区输出目录已存在且非空: {path}')
+            os.makedirs(path, exist_ok=True)
+        else:
+            output_dir = os.path.dirname(path)
+            if output_dir and not os.path.exists(output_dir):
+                os.makedirs(output_dir, exist_ok=True)
+
+    def _to_table(self, df):
+        """DataFrame → Arrow 表（字典编码 + 统一为第一块的 schema）"""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        for name in self.DICTIONARY_COLUMNS:
+            if name in table.column_names:
+                column = pc.dictionary_encode(table[name].cast(pa.string()))
+                table = table.set_column(table.column_names.index(name), name, column)
+
+        if self._schema is None:
+            # 第一块中全空的列按字符串处理，避免后续块无法转换
+            fields = [field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                      for field in table.schema]
+            self._schema = pa.schema(fields, metadata=table.schema.metadata)
+        return table.cast(self._schema)
+
+    def write(self, df):
+        """追加写出一个数据块"""
+        import pyarrow.parquet as pq
+
+        table = self._to_table(df)
+        if self.partition_by:
+            pq.write_to_dataset(table, self.path, partition_cols=[self.partition_by],
+                                basename_template=f'part-{self._parts}-{{i}}.parquet')
+            self._parts += 1
+        else:
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            self._writer.write_table(table)
+        self.rows_written += len(df)
+
+    def close(self):
+        """结束写出（写入文件尾）"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def resolve_output_path(path, output_format='csv', partition_by=None):
+    """
+    按输出格式调整输出路径的扩展名
+
+    parquet 输出时 .csv 扩展名替换为 .parquet；分区输出时去掉扩展名（输出为目录）。
+
+    Args:
+        path: 命令行给出的输出路径
+        output_format: 'csv' 或 'parquet'
+        partition_by: 分区列
+
+    Returns:
+        实际输出路径
+    """
+    if output_format != 'parquet':
+        return path
+    root, ext = os.path.splitext(path)
+    if partition_by:
+        return root if ext in ('.csv', '.parquet') else path
+    return root + '.parquet' if ext == '.csv' else path
+
+
+def make_writer(path, output_format='csv', partition_by=None):
+    """
+    按输出格式创建分块写出器
+
+    Args:
+        path: 输出路径
+        output_format: 'csv' 或 'parquet'
+        partition_by: 分区列（仅 parquet）
+
+    Returns:
+        CsvChunkWriter / ParquetChunkWriter
+    """
+    if output_format == 'parquet':
+        return ParquetChunkWriter(path, partition_by=partition_by)
+    if partition_by:
+        raise ValueError('分区输出仅支持 parquet 格式')
+    return CsvChunkWriter(path)
+
+
+class RunningStats:
+    """
+    分类结果的累加统计
+
+    每处理完一块调用 update()，汇总时无需再次遍历结果。
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.categories = Counter()
+        self.tags = Counter()
+        # 原始规格值：列名 → [非零条数, 最小值, 最大值]
+        self.specs = {}
+        # 按裁决原因区分的惰性求值捷径（SHORTCUTS）计数
+        self.shortcuts = Counter()
+
+    def update(self, df):
+        """
+        累加一个结果块的统计量
+
+        Args:
+            df: classifier.process 的输出块
+        """
+        self.rows += len(df)
+
+        if 'predicted_category' in df.columns:
+            self.categories.update(df['predicted_category'].value_counts().to_dict())
+        if 'decision_reason' in df.columns:
+            for reason, count in df['decision_reason'].value_counts().items():
+                kind = shortcut_kind(reason)
+                if kind is not None:
+                    self.shortcuts[kind] += int(count)
+
+        for col in df.columns:
+            if col.startswith('tag_'):
+                self.tags[col] += int((df[col] == 1).sum())
+
+        for col in RAW_SPEC_COLUMNS:
+            if col not in df.columns:
+                continue
+            non_zero = df.loc[df[col] > 0, col]
+            if len(non_zero) == 0:
+                continue
+            count, low, high = self.specs.get(col, [0, None, None])
+            low = non_zero.min() if low is None else min(low, non_zero.min())
+            high = non_zero.max() if high is None else max(high, non_zero.max())
+            self.specs[col] = [count + len(non_zero), low, high]
+
+    def category_counts(self):
+        """品类计数（按数量降序）"""
+        counts = pd.Series(dict(self.categories), name='count', dtype='int64')
+        counts.index.name = 'predicted_category'
+        return counts.sort_values(ascending=False, kind='stable')
+
+    def print_shortcuts(self):
+        """打印惰性求值的捷径统计（--lazy 时有意义：这些行跳过了规格提取与评分）"""
+        skipped = sum(self.shortcuts.values())
+        print('\n=== 惰性求值 ===')
+        for kind in SHORTCUTS:
+            count = self.shortcuts.get(kind, 0)
+            print(f'  {kind:<16} {count:>10} 条 ({count / max(self.rows, 1):.1%})')
+        print(f"  {'完整计算':<12} {self.rows - skipped:>10} 条 ({(self.rows - skipped) / max(self.rows, 1):.1%})")
+
+    def print_summary(self, stage):
+        """
+        打印统计汇总
+
+        Args:
+            stage: 输出阶段 (1=原始标签, 2=归一化+分类, 'both'=两者都打印)
+        """
+        if stage != 1:
+            print('\n=== 分类统计 ===')
+            print(self.category_counts().to_string())
+            if stage == 2:
+                return
+
+        print('\n=== Stage1 原始标签统计 ===')
+        # 显示布尔标签的非零统计
+        for col, count in self.tags.items():
+            if count > 0:
+                print(f'  {col}: {count}')
+
+        # 显示原始规格值的非零统计
+        print('\n原始规格值统计:')
+        spec_cols = ['raw_wattage', 'raw_kelvin_min', 'raw_kelvin_max', 'raw_cri', 'raw_lumens', 'raw_lux']
+        for col in spec_cols:
+            if col in self.specs:
+                count, low, high = self.specs[col]
+                print(f'  {col}: {count}条, 范围[{low}-{high}]')
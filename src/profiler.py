@@ -0,0 +1,185 @@
+"""
+分层性能剖析模块
+按五层（及去重、输出组装）累计耗时，并按数据块记录内存快照
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows 无 resource 模块
+    resource = None
+
+
+# 五层名称（报告中按此顺序排列，其余阶段排在后面）
+LAYERS = ['normalize_text', 'extract_signals', 'extract_specs', 'calculate_scores', 'arbitrate']
+
+try:
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def current_rss_mb():
+    """当前进程常驻内存（MB），无法读取时返回 None（仅 Linux 支持）"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * _PAGE_SIZE / 2 ** 20
+
+
+def peak_rss_mb():
+    """进程峰值常驻内存（MB），无法读取时返回 None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+class _Timer:
+    """计时上下文：退出时把耗时累加到剖析器"""
+
+    __slots__ = ('profiler', 'layer', 'rows', 'start')
+
+    def __init__(self, profiler, layer, rows):
+        self.profiler = profiler
+        self.layer = layer
+        self.rows = rows
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.add(self.layer, time.perf_counter() - self.start, self.rows)
+
+
+class _NullTimer:
+    """未开启剖析时使用的空计时上下文"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return None
+
+
+NULL_TIMER = _NullTimer()
+
+
+class LayerProfiler:
+    """
+    分层剖析器
+
+    - measure(layer, rows): 计时上下文，累计每层的耗时、调用次数与处理行数
+    - chunk(rows): 包裹一次 process 调用，记录该块的总耗时与内存快照
+      （当前/峰值 RSS；trace_memory=True 时另记录 tracemalloc 分配峰值，开销较大）
+
+    块总耗时减去各层耗时即为 "other"（DataFrame 构造、iterrows、去重等框架开销）。
+    """
+
+    def __init__(self, trace_memory=False):
+        """
+        Args:
+            trace_memory: 是否用 tracemalloc 记录每块的 Python 分配峰值（会明显拖慢运行）
+        """
+        self.trace_memory = trace_memory
+        self.layers = {}
+        self.chunks = []
+
+    def measure(self, layer, rows=1):
+        """返回计时上下文，退出时累加到 layer"""
+        return _Timer(self, layer, rows)
+
+    def add(self, layer, seconds, rows=1):
+        """累加一次耗时"""
+        stats = self.layers.get(layer)
+        if stats is None:
+            stats = self.layers[layer] = [0.0, 0, 0]
+        stats[0] += seconds
+        stats[1] += 1
+        stats[2] += rows
+
+    @contextmanager
+    def chunk(self, rows):
+        """包裹一个数据块的处理，记录总耗时与内存快照"""
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            alloc_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            record = {'chunk': len(self.chunks), 'rows': rows,
+                      'seconds': time.perf_counter() - start,
+                      'rss_mb': current_rss_mb(), 'peak_rss_mb': peak_rss_mb()}
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                record['alloc_net_mb'] = (current - alloc_before) / 2 ** 20
+                record['alloc_peak_mb'] = (peak - alloc_before) / 2 ** 20
+            self.chunks.append(record)
+
+    def report(self):
+        """
+        汇总报告
+
+        Returns:
+            {'total_seconds', 'rows', 'layers': {名称: {'seconds', 'calls', 'rows',
+            'us_per_row', 'share'}}, 'chunks': [...]}，layers 含 other（未归入任何层的耗时）
+        """
+        total = sum(c['seconds'] for c in self.chunks)
+        rows = sum(c['rows'] for c in self.chunks)
+        names = [n for n in LAYERS if n in self.layers] + \
+                sorted(n for n in self.layers if n not in LAYERS)
+
+        layers = {}
+        for name in names:
+            seconds, calls, layer_rows = self.layers[name]
+            layers[name] = {'seconds': seconds, 'calls': calls, 'rows': layer_rows,
+                            'us_per_row': seconds / layer_rows * 1e6 if layer_rows else 0.0,
+                            'share': seconds / total if total else 0.0}
+        if self.chunks:
+            other = max(total - sum(s[0] for s in self.layers.values()), 0.0)
+            layers['other'] = {'seconds': other, 'calls': len(self.chunks), 'rows': rows,
+                               'us_per_row': other / rows * 1e6 if rows else 0.0,
+                               'share': other / total if total else 0.0}
+        return {'total_seconds': total, 'rows': rows, 'layers': layers, 'chunks': self.chunks}
+
+    def print_summary(self):
+        """打印分层耗时表与内存快照"""
+        report = self.report()
+        print(f"\n分层耗时 (共 {report['rows']} 行, {report['total_seconds']:.3f}s):")
+        print(f"  {'阶段':<20} {'耗时(s)':>10} {'占比':>7} {'调用':>9} {'行数':>10} {'μs/行':>9}")
+        for name, s in report['layers'].items():
+            print(f"  {name:<20} {s['seconds']:>10.3f} {s['share']:>7.1%} {s['calls']:>9} "
+                  f"{s['rows']:>10} {s['us_per_row']:>9.2f}")
+
+        if report['chunks']:
+            last = report['chunks'][-1]
+            peak = max((c['peak_rss_mb'] for c in report['chunks'] if c['peak_rss_mb'] is not None),
+                       default=None)
+            line = f"\n内存: {len(report['chunks'])} 块"
+            if last['rss_mb'] is not None:
+                line += f", 最后一块后 RSS {last['rss_mb']:.1f} MB"
+            if peak is not None:
+                line += f", 峰值 RSS {peak:.1f} MB"
+            if self.trace_memory:
+                alloc_peak = max(c['alloc_peak_mb'] for c in report['chunks'])
+                line += f", 单块分配峰值 {alloc_peak:.1f} MB"
+            print(line)
+
+    def save(self, path):
+        """保存报告（JSON）"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
@@ -0,0 +1,336 @@
+"""
+版本化模型注册表
+按版本加载配置目录并编译分类器，编译在调用方线程完成（不占用分类线程），完成后原子切换当前版本。
+每批分类开始时只读取一次当前版本，切换不影响正在处理的批次；每条结果标注产生它的配置版本
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from .snapshot import load_classifier
+from .store import config_hash
+
+
+# 版本目录中必须齐全的配置文件
+CONFIG_FILES = ['signals.json', 'scoring_models.json', 'hard_filters.json']
+
+# 编译后预热：各站点走一遍完整流程，同时校验新配置可以正常分类（失败时不切换）
+WARMUP_TITLES = ['led ring light 3200k-5600k cri 96 60w', 'godox speedlite ttl hss']
+WARMUP_SITES = ['US', 'JP', 'CN']
+
+
+def config_paths(config_dir):
+    """配置目录下三个配置文件的路径"""
+    return tuple(os.path.join(config_dir, name) for name in CONFIG_FILES)
+
+
+def list_versions(root):
+    """
+    版本根目录下的有效版本，按名称排序（名称最大者为最新）
+
+    以 '.' 开头的目录（写入中的临时目录、快照目录）与配置文件不齐全的目录不计入；
+    发布新版本时应先写入临时目录再重命名，避免读到写了一半的配置。
+
+    Returns:
+        版本名列表
+    """
+    versions = []
+    for name in sorted(os.listdir(root)):
+        path = os.path.join(root, name)
+        if name.startswith('.') or not os.path.isdir(path):
+            continue
+        if all(os.path.isfile(p) for p in config_paths(path)):
+            versions.append(name)
+    return versions
+
+
+class ModelVersion:
+    """一个已编译的配置版本：分类器 + 版本信息 + 处理统计"""
+
+    __slots__ = ('version', 'config_dir', 'snapshot_path', 'classifier', 'compile_seconds',
+                 'loaded_at', 'batches', 'records')
+
+    def __init__(self, version, classifier, config_dir=None, snapshot_path=None, compile_seconds=0.0):
+        self.version = version
+        self.classifier = classifier
+        self.config_dir = config_dir
+        self.snapshot_path = snapshot_path
+        self.compile_seconds = compile_seconds
+        self.loaded_at = time.time()
+        self.batches = 0
+        self.records = 0
+
+    @property
+    def config_hash(self):
+        return self.classifier.config_hash
+
+    def classify_titles(self, titles, sites):
+        """
+        用本版本分类，每条结果增加 config_version 字段
+
+        Returns:
+            结果字典列表（字段同 GlobalLightClassifier.classify_titles，另加 config_version）
+        """
+        results = self.classifier.classify_titles(titles, sites)
+        for result in results:
+            result['config_version'] = self.version
+        self.batches += 1
+        self.records += len(results)
+        return results
+
+    def info(self):
+        """版本信息（可直接序列化为 JSON）"""
+        return {'version': self.version, 'config_dir': self.config_dir,
+                'config_hash': self.config_hash[:12],
+                'compile_ms': round(self.compile_seconds * 1000.0, 3),
+                'loaded_at': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.loaded_at)),
+                'batches': self.batches, 'records': self.records}
+
+
+class ModelRegistry:
+    """
+    版本化模型注册表
+
+    两种配置来源：
+    - root 为版本根目录：每个子目录是一个版本（目录名即版本名），refresh() 加载名称最大的新版本；
+    - root 为 None：通过 load() 显式加载配置目录，refresh() 检查当前版本的配置目录是否被原地修改，
+      版本名取配置指纹的前12位。
+
+    当前版本是单个引用，切换是一次赋值；分类时每批只读取一次（见 classify_titles），
+    因此正在处理的批次总在开始时的版本上完成。最近 keep 个版本保留在内存中，可用 activate() /
+    rollback() 立即切回。
+    """
+
+    def __init__(self, root=None, word_boundary_max_len=0, keep=3):
+        """
+        Args:
+            root: 版本根目录（None 表示只通过 load() 加载）
+            word_boundary_max_len: 词边界匹配设置（所有版本相同）
+            keep: 内存中保留的版本数（含当前版本），至少为1
+        """
+        self.root = root
+        self.word_boundary_max_len = word_boundary_max_len
+        self.keep = max(1, keep)
+        self.failed = {}
+        self.last_error = None
+        self._versions = OrderedDict()
+        self._history = []
+        self._active = None
+        self._lock = threading.Lock()
+        self._compile_lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+
+    @property
+    def active(self):
+        """当前版本（ModelVersion）"""
+        model = self._active
+        if model is None:
+            raise RuntimeError('注册表中还没有可用的配置版本')
+        return model
+
+    @property
+    def versions(self):
+        """内存中的版本名（按最近加载或生效的顺序，最后一个为最近）"""
+        with self._lock:
+            return list(self._versions)
+
+    def classify_titles(self, titles, sites):
+        """
+        用当前版本分类一批记录（整批只读取一次当前版本）
+
+        Returns:
+            结果字典列表，每条带 config_version
+        """
+        return self.active.classify_titles(titles, sites)
+
+    def compile(self, config_dir, version=None, snapshot_path=None):
+        """
+        编译一个配置目录（不切换）
+
+        在调用方线程构建分类器并预热；分类线程继续使用当前版本。
+
+        Args:
+            config_dir: 配置目录
+            version: 版本名（默认取配置指纹前12位）
+            snapshot_path: 编译快照文件（见 snapshot.load_classifier），None 表示不读写快照
+
+        Returns:
+            ModelVersion
+        """
+        started = time.perf_counter()
+        classifier, _ = load_classifier(*config_paths(config_dir), snapshot_path=snapshot_path,
+                                        word_boundary_max_len=self.word_boundary_max_len)
+        titles = WARMUP_TITLES * len(WARMUP_SITES)
+        sites = [site for site in WARMUP_SITES for _ in WARMUP_TITLES]
+        classifier.classify_titles(titles, sites)
+        return ModelVersion(version or classifier.config_hash[:12], classifier, config_dir=config_dir,
+                            snapshot_path=snapshot_path, compile_seconds=time.perf_counter() - started)
+
+    def register(self, model, activate=True):
+        """
+        加入已编译的版本，按需切换为当前版本，并淘汰超出 keep 的版本（最久未加载或生效者先淘汰）
+
+        Args:
+            model: ModelVersion 或 GlobalLightClassifier（版本名取配置指纹前12位）
+            activate: 是否切换为当前版本
+
+        Returns:
+            ModelVersion
+        """
+        if not isinstance(model, ModelVersion):
+            model = ModelVersion(model.config_hash[:12], model)
+        with self._lock:
+            self._versions[model.version] = model
+            self._versions.move_to_end(model.version)
+            if activate:
+                self._swap(model)
+            for version in list(self._versions):
+                if len(self._versions) <= self.keep:
+                    break
+                if version != self._active.version:
+                    del self._versions[version]
+            self._history = [version for version in self._history if version in self._versions]
+        return model
+
+    def load(self, config_dir, version=None, snapshot_path=None, activate=True):
+        """
+        编译配置目录并注册（见 compile / register）
+
+        Returns:
+            ModelVersion
+        """
+        with self._compile_lock:
+            model = self.compile(config_dir, version, snapshot_path)
+            return self.register(model, activate)
+
+    def activate(self, version):
+        """
+        切换到内存中已有的版本
+
+        Raises:
+            KeyError: 版本不在内存中（未加载或已被淘汰）
+        """
+        with self._lock:
+            if version not in self._versions:
+                raise KeyError(f'版本不在内存中: {version}')
+            model = self._versions[version]
+            self._swap(model)
+        return model
+
+    def rollback(self):
+        """
+        切回上一个生效过且仍在内存中的版本
+
+        Returns:
+            切换后的 ModelVersion；没有可切回的版本时返回 None
+        """
+        with self._lock:
+            for version in reversed(self._history[:-1]):
+                if version in self._versions and version != self._active.version:
+                    self._swap(self._versions[version])
+                    return self._active
+        return None
+
+    def _swap(self, model):
+        """切换当前版本（调用方持有 self._lock）"""
+        self._active = model
+        self._versions.move_to_end(model.version)
+        if model.version in self._history:
+            self._history.remove(model.version)
+        self._history.append(model.version)
+
+    def _pending(self):
+        """
+        下一个待加载的版本
+
+        Returns:
+            (version, config_dir) 或 None
+        """
+        if self.root is not None:
+            versions = list_versions(self.root)
+            if not versions:
+                return None
+            version = versions[-1]
+            # 只向前更新：最新版本已加载过（包括回滚后不再是当前版本）时不重复切换
+            if version in self._versions or version in self.failed:
+                return None
+            return version, os.path.join(self.root, version)
+
+        model = self._active
+        if model is None or model.config_dir is None:
+            return None
+        version = config_hash(*config_paths(model.config_dir),
+                              extra=f'word_boundary={self.word_boundary_max_len}')[:12]
+        if version in self._versions or version in self.failed:
+            return None
+        return version, model.config_dir
+
+    def refresh(self):
+        """
+        检查并加载新版本，成功后切换
+
+        加载失败的版本记入 failed，保持当前版本不变，之后不再重试同一版本。
+
+        Returns:
+            新的 ModelVersion；没有新版本时返回 None
+
+        Raises:
+            新版本编译失败时抛出原异常
+        """
+        with self._compile_lock:
+            pending = self._pending()
+            if pending is None:
+                return None
+            version, config_dir = pending
+            snapshot_path = None if self.root is not None else self._active.snapshot_path
+            try:
+                model = self.compile(config_dir, version, snapshot_path)
+            except Exception as e:
+                self.failed[version] = str(e)
+                self.last_error = f'{version}: {e}'
+                raise
+            return self.register(model)
+
+    def watch(self, interval=5.0):
+        """
+        在后台线程中每隔 interval 秒调用一次 refresh()（编译失败只记录，不中断）
+
+        Returns:
+            self
+        """
+        if self._watcher is None:
+            self._stop.clear()
+            self._watcher = threading.Thread(target=self._watch, args=(interval,), name='model-registry',
+                                             daemon=True)
+            self._watcher.start()
+        return self
+
+    def _watch(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.refresh()
+            except Exception:
+                pass
+
+    def stop(self):
+        """停止后台检查线程"""
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
+
+    def info(self):
+        """
+        注册表状态
+
+        Returns:
+            {'active', 'versions', 'failed', 'last_error'} 字典
+        """
+        with self._lock:
+            models = list(self._versions.values())
+            active = self._active
+        return {'active': active.version if active is not None else None,
+                'versions': [model.info() for model in models],
+                'failed': dict(self.failed), 'last_error': self.last_error}
@@ -0,0 +1,225 @@
+"""
+向量化评分引擎模块
+将评分模型编译为 品类×特征 的稠密权重矩阵，整批向量化完成评分
+"""
+import numpy as np
+
+
+def _round2(scores):
+    """
+    保留两位小数，结果与 Python 内置 round(x, 2) 一致
+
+    np.round 先乘100再取整，在恰好接近 .5 的值上可能与 round 不同，
+    这部分元素按双精度的精确值重新舍入（见 _round2_exact）。
+    """
+    rounded = np.round(scores, 2)
+    scaled = scores * 100.0
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        rounded[near_half] = _round2_exact(scores[near_half])
+    return rounded
+
+
+def _round2_exact(values):
+    """
+    与 round(x, 2) 逐位一致的向量化舍入
+
+    round 按 x 的精确二进制值舍入、恰好一半时取偶；x*100 的舍入误差由 Dekker 拆分精确求出，
+    以 (x*100 的小数部分 - 0.5) + 误差 的符号决定进位。
+    """
+    scaled = values * 100.0
+    split = values * 134217729.0
+    high = split - (split - values)
+    error = (high * 100.0 - scaled) + (values - high) * 100.0
+    floored = np.floor(scaled)
+    side = (scaled - floored - 0.5) + error
+    up = (side > 0) | ((side == 0) & (np.fmod(floored, 2) != 0))
+    return np.copysign((floored + up) / 100.0, values)
+
+
+class ScoringEngine:
+    """
+    线性评分引擎
+
+    Score(品类i) = base(i) + Σ(特征值 × 权重)，按各品类权重在配置中的顺序逐项累加
+    - W: (C × F) 权重矩阵，C为品类数，F为特征数（用于上下界与调优，不参与评分的累加）
+    - base: (C,) 基础分向量
+
+    整批评分对 (N × C) 得分矩阵逐项累加（不使用矩阵乘法/BLAS），单条评分用纯 Python 循环，
+    两者得分逐位一致，且不随批大小变化。
+    没有权重项、基础分为整数的品类（如 灯光类-其他），单条评分得到的是 int（round(0, 2) == 0），
+    整批结果输出为字典或字符串时经 to_python / top_values 还原为 int。
+    """
+
+    def __init__(self, scoring_models, feature_names=()):
+        """
+        Args:
+            scoring_models: 评分模型配置（scoring_models.json 的内容）
+            feature_names: 特征列顺序；权重中出现但未列出的特征追加在末尾
+        """
+        self.categories = list(scoring_models.keys())
+        self.features = list(feature_names)
+        for model in scoring_models.values():
+            for feature in model['weights']:
+                if feature not in self.features:
+                    self.features.append(feature)
+        self.feature_index = {feature: i for i, feature in enumerate(self.features)}
+
+        self.weights = np.zeros((len(self.categories), len(self.features)), dtype=np.float64)
+        self.base_scores = np.zeros(len(self.categories), dtype=np.float64)
+        for i, model in enumerate(scoring_models.values()):
+            self.base_scores[i] = model['base_score']
+            for feature, weight in model['weights'].items():
+                self.weights[i, self.feature_index[feature]] = weight
+
+        # 单条评分：按配置顺序的 (基础分, [(特征, 权重), ...])，保留配置中的 Python 数值类型
+        self._models = [(model['base_score'], list(model['weights'].items()))
+                        for model in scoring_models.values()]
+        # 得分保持为 int 的品类（没有权重项且基础分为整数）
+        self._integer_indices = [i for i, model in enumerate(scoring_models.values())
+                                 if type(model['base_score']) is int and not model['weights']]
+
+        # 累加顺序：第k步对每个品类加上其第k个权重项（不足的以0权重补齐）
+        depth = max((len(model['weights']) for model in scoring_models.values()), default=0)
+        self._term_features = np.zeros((depth, len(self.categories)), dtype=np.intp)
+        self._term_weights = np.zeros((depth, len(self.categories)), dtype=np.float64)
+        for i, model in enumerate(scoring_models.values()):
+            for k, (feature, weight) in enumerate(model['weights'].items()):
+                self._term_features[k, i] = self.feature_index[feature]
+                self._term_weights[k, i] = weight
+
+    def vectorize(self, feature_vector):
+        """将特征字典转换为按 self.features 排列的向量，缺失特征取0"""
+        return np.array([feature_vector.get(feature, 0.0) for feature in self.features],
+                        dtype=np.float64)
+
+    def score_matrix(self, X):
+        """
+        计算全部品类得分（保留两位小数）
+
+        Args:
+            X: (N × F) 特征矩阵
+
+        Returns:
+            (N × C) 得分矩阵
+        """
+        return _round2(self._accumulate(np.asarray(X, dtype=np.float64)))
+
+    def _accumulate(self, X):
+        """按配置顺序逐项累加的得分（未取整）"""
+        scores = np.tile(self.base_scores, (len(X), 1))
+        for features, weights in zip(self._term_features, self._term_weights):
+            scores += X[:, features] * weights
+        return scores
+
+    def score_batch(self, X, return_all=False):
+        """
+        批量评分
+
+        Args:
+            X: (N × F) 特征矩阵，列顺序与 self.features 一致
+            return_all: 是否同时返回完整得分矩阵
+
+        Returns:
+            (top_scores, winners, margins) 或 (top_scores, winners, margins, scores)
+            - top_scores: (N,) 最高分
+            - winners: (N,) 最高分品类下标（并列时取配置中靠前者）
+            - margins: (N,) 第一名与第二名的分差
+        """
+        scores = self.score_matrix(X)
+        winners = np.argmax(scores, axis=1)
+        top_scores = scores[np.arange(len(scores)), winners]
+        if scores.shape[1] > 1:
+            second = np.partition(scores, -2, axis=1)[:, -2]
+            margins = top_scores - second
+        else:
+            margins = np.full(len(scores), np.inf)
+
+        if return_all:
+            return top_scores, winners, margins, scores
+        return top_scores, winners, margins
+
+    def score_bounds(self, X, columns, maxima):
+        """
+        部分特征尚未计算时各品类得分（未取整）的上下界
+
+        未知特征 j 的取值范围为 [0, maxima[j]]，其贡献 weight × x 的范围由权重符号决定；
+        X 中这些列的值被忽略。
+
+        Args:
+            X: (N × F) 特征矩阵（已知特征）
+            columns: 未知特征的列下标
+            maxima: 各未知特征的上限
+
+        Returns:
+            (low, high)：两个 (N × C) 矩阵
+        """
+        X = np.array(X, dtype=np.float64)
+        X[:, columns] = 0.0
+        partial = self._accumulate(X)
+        low_offsets, high_offsets = self.bound_offsets(columns, maxima)
+        return partial + low_offsets, partial + high_offsets
+
+    def bound_offsets(self, columns, maxima):
+        """
+        未知特征对各品类得分贡献的范围
+
+        Returns:
+            (low, high)：两个 (C,) 数组
+        """
+        contribution = self.weights[:, columns] * np.asarray(maxima, dtype=np.float64)
+        return np.minimum(contribution, 0.0).sum(axis=1), np.maximum(contribution, 0.0).sum(axis=1)
+
+    def to_python(self, scores):
+        """
+        得分矩阵 → 嵌套列表，保持为 int 的品类还原为 int（与单条评分的字典取值一致）
+
+        Args:
+            scores: (N × C) 得分矩阵
+
+        Returns:
+            N 个长度为 C 的列表
+        """
+        rows = np.asarray(scores).tolist()
+        if self._integer_indices:
+            for row in rows:
+                for i in self._integer_indices:
+                    if row[i] == row[i]:
+                        row[i] = int(row[i])
+        return rows
+
+    def top_values(self, top_scores, winners):
+        """
+        最高分 → 列表，最高分品类得分保持为 int 时还原为 int（用于裁决原因字符串）
+
+        Args:
+            top_scores: (N,) 最高分
+            winners: (N,) 最高分品类下标
+
+        Returns:
+            长度为 N 的列表
+        """
+        values = np.asarray(top_scores).tolist()
+        if self._integer_indices:
+            for j in np.flatnonzero(np.isin(winners, self._integer_indices)).tolist():
+                if values[j] == values[j]:
+                    values[j] = int(values[j])
+        return values
+
+    def score(self, feature_vector):
+        """
+        单条评分（纯 Python 循环，与 score_matrix 的累加顺序相同，结果逐位一致）
+
+        Args:
+            feature_vector: 特征字典
+
+        Returns:
+            {品类: 得分} 字典
+        """
+        scores = {}
+        for category, (base_score, terms) in zip(self.categories, self._models):
+            total = base_score
+            for feature, weight in terms:
+                total += feature_vector.get(feature, 0.0) * weight
+            scores[category] = round(total, 2)
+        return scores
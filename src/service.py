@@ -0,0 +1,343 @@
+"""
+常驻分类服务模块
+基于标准库的 HTTP/JSON 服务：配置只加载一次，并发请求经微批队列合并为批量调用；
+配置更新经版本化模型注册表在后台编译后原子切换，无需重启
+"""
+import json
+import queue
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from .registry import ModelRegistry
+
+
+class LatencyStats:
+    """
+    请求延迟统计
+
+    只保留最近 window 个样本计算分位数，内存占用固定。
+    """
+
+    def __init__(self, window=10000):
+        """
+        Args:
+            window: 参与分位数计算的最近样本数
+        """
+        self.count = 0
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        """记录一次请求耗时（秒）"""
+        with self._lock:
+            self.count += 1
+            self._samples.append(seconds)
+
+    def summary(self):
+        """
+        延迟汇总
+
+        Returns:
+            {'count', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms'} 字典（无样本时只有 count）
+        """
+        with self._lock:
+            samples = np.array(self._samples, dtype=np.float64) * 1000.0
+            count = self.count
+        if len(samples) == 0:
+            return {'count': count}
+        p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+        return {'count': count, 'p50_ms': round(float(p50), 3), 'p90_ms': round(float(p90), 3),
+                'p99_ms': round(float(p99), 3), 'max_ms': round(float(samples.max()), 3)}
+
+
+class _Job:
+    """一次提交：若干条记录 + 等待结果的 Future"""
+
+    __slots__ = ('titles', 'sites', 'future')
+
+    def __init__(self, titles, sites):
+        self.titles = titles
+        self.sites = sites
+        self.future = Future()
+
+
+class MicroBatcher:
+    """
+    微批队列
+
+    单个后台线程独占分类器：取到第一个任务后，在 max_wait_ms 内继续收集并发任务，
+    直到累计记录数达到 max_batch_size，然后合并为一次批量调用，再按任务拆分结果。
+    """
+
+    def __init__(self, classify_fn, max_batch_size=256, max_wait_ms=0.0):
+        """
+        Args:
+            classify_fn: 批量分类函数 (titles, sites) → 结果列表
+            max_batch_size: 单批最大记录数
+            max_wait_ms: 收集并发任务的最长等待时间（毫秒），0 表示只合并已在队列中的任务
+        """
+        self.classify_fn = classify_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.records = 0
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        """启动后台线程"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """停止后台线程（已提交的任务处理完后退出）"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, titles, sites):
+        """
+        提交一组记录
+
+        Returns:
+            Future，结果为与 titles 等长的结果列表
+        """
+        job = _Job(list(titles), list(sites))
+        self._queue.put(job)
+        return job.future
+
+    def _collect(self, first):
+        """从第一个任务开始收集一批任务；返回 (任务列表, 是否收到停止信号)"""
+        jobs = [first]
+        size = len(first.titles)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                return jobs, True
+            jobs.append(job)
+            size += len(job.titles)
+        return jobs, False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            jobs, stopping = self._collect(first)
+
+            titles = [t for job in jobs for t in job.titles]
+            sites = [s for job in jobs for s in job.sites]
+            try:
+                results = self.classify_fn(titles, sites)
+            except Exception as e:
+                for job in jobs:
+                    job.future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.records += len(titles)
+            start = 0
+            for job in jobs:
+                job.future.set_result(results[start:start + len(job.titles)])
+                start += len(job.titles)
+
+    def info(self):
+        """批次统计"""
+        return {'batches': self.batches, 'records': self.records,
+                'mean_batch_size': round(self.records / self.batches, 2) if self.batches else 0.0,
+                'max_batch_size': self.max_batch_size, 'max_wait_ms': self.max_wait * 1000.0}
+
+
+class _Server(ThreadingHTTPServer):
+    """多线程 HTTP 服务器（加大监听队列，容纳突发并发连接）"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """HTTP 请求处理（长连接，JSON 请求/响应）"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # 关闭 Nagle 算法，避免小响应被延迟确认拖慢（约40ms）
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        if self.server.service.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif self.path == '/stats':
+            self._send_json(200, service.stats())
+        elif self.path == '/version':
+            self._send_json(200, service.registry.info())
+        else:
+            self._send_json(404, {'error': f'未知路径: {self.path}'})
+
+    def do_POST(self):
+        service = self.server.service
+        started = time.perf_counter()
+        try:
+            payload = self._read_json()
+            if self.path == '/classify':
+                result = service.classify(payload.get('title', ''), payload.get('site', ''))
+            elif self.path == '/classify/batch':
+                items = payload.get('items')
+                if not isinstance(items, list):
+                    raise ValueError('请求体须包含 items 列表')
+                result = {'results': service.classify_batch(items)}
+            elif self.path == '/reload':
+                self._send_json(200, service.reload())
+                return
+            elif self.path == '/activate':
+                self._send_json(200, service.activate(payload.get('version')))
+                return
+            else:
+                self._send_json(404, {'error': f'未知路径: {self.path}'})
+                return
+        except (ValueError, AttributeError, KeyError) as e:
+            self._send_json(400, {'error': e.args[0] if isinstance(e, KeyError) else str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+            return
+        service.latency[self.path].record(time.perf_counter() - started)
+        self._send_json(200, result)
+
+
+class ClassificationService:
+    """
+    常驻分类服务
+
+    端点：
+    - POST /classify         {"title": ..., "site": "JP"} → 单条结果
+    - POST /classify/batch   {"items": [{"title": ..., "site": ...}, ...]} → {"results": [...]}
+    - POST /reload           检查并加载新配置版本，编译完成后切换 → {"version": ..., "changed": ...}
+    - POST /activate         {"version": ...} 切换到内存中已有的版本（回滚）
+    - GET  /version          当前版本与内存中的各版本
+    - GET  /stats            各端点延迟分位数、微批统计与配置版本
+    - GET  /health
+
+    每条结果带 config_version 字段：产生该结果的配置版本。
+    """
+
+    def __init__(self, classifier, host='127.0.0.1', port=8765, max_batch_size=256,
+                 max_wait_ms=0.0, verbose=False):
+        """
+        Args:
+            classifier: ModelRegistry，或 GlobalLightClassifier（包装为只有一个版本的注册表）；
+                分类只由微批线程调用，每批使用该批开始时的当前版本
+            host, port: 监听地址（port=0 表示随机端口）
+            max_batch_size: 微批最大记录数
+            max_wait_ms: 微批最长等待时间（毫秒）；0 时只合并排队中的请求，
+                空闲时单条请求不额外等待，负载高时队列自然形成批次
+            verbose: 是否打印访问日志
+        """
+        if not isinstance(classifier, ModelRegistry):
+            registry = ModelRegistry(word_boundary_max_len=classifier.word_boundary_max_len)
+            registry.register(classifier)
+            classifier = registry
+        self.registry = classifier
+        self.verbose = verbose
+        self.batcher = MicroBatcher(self.registry.classify_titles, max_batch_size, max_wait_ms)
+        self.latency = {'/classify': LatencyStats(), '/classify/batch': LatencyStats()}
+        self.httpd = _Server((host, port), _RequestHandler)
+        self.httpd.service = self
+
+    @property
+    def address(self):
+        """实际监听的 (host, port)"""
+        return self.httpd.server_address[:2]
+
+    def classify(self, title, site=''):
+        """单条分类（经微批队列）"""
+        return self.batcher.submit([title], [site]).result()[0]
+
+    def classify_batch(self, items):
+        """批量分类（整批作为一个任务进入微批队列）"""
+        titles = [item.get('title', '') for item in items]
+        sites = [item.get('site', '') for item in items]
+        return self.batcher.submit(titles, sites).result()
+
+    def reload(self):
+        """
+        检查并加载新配置版本（在请求线程中编译，微批线程不受影响）
+
+        Returns:
+            {'version': 当前版本, 'changed': 是否切换}
+
+        Raises:
+            RuntimeError: 新版本编译失败（当前版本保持不变）
+        """
+        try:
+            model = self.registry.refresh()
+        except Exception as e:
+            raise RuntimeError(f'配置加载失败: {e}') from e
+        return {'version': self.registry.active.version, 'changed': model is not None}
+
+    def activate(self, version):
+        """切换到内存中已有的版本"""
+        if not isinstance(version, str):
+            raise ValueError('请求体须包含 version')
+        return {'version': self.registry.activate(version).version, 'changed': True}
+
+    def stats(self):
+        """服务统计"""
+        return {'latency': {path: stats.summary() for path, stats in self.latency.items()},
+                'batching': self.batcher.info(), 'config_version': self.registry.active.version}
+
+    def serve_forever(self):
+        """启动微批线程并阻塞处理请求"""
+        self.batcher.start()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.batcher.stop()
+            self.httpd.server_close()
+
+    def start(self):
+        """在后台线程中启动服务（用于测试或嵌入）"""
+        self.batcher.start()
+        thread = threading.Thread(target=self.httpd.serve_forever, name='classification-service',
+                                  daemon=True)
+        thread.start()
+        return self
+
+    def shutdown(self):
+        """停止服务"""
+        self.httpd.shutdown()
+        self.batcher.stop()
+        self.httpd.server_close()
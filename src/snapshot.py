@@ -0,0 +1,147 @@
+"""
+编译配置快照模块
+把初始化完成的分类器（关键词匹配器、权重矩阵、标签位等）序列化到缓存文件，
+之后的短任务直接加载，无需重新解析三个配置文件、重新构建匹配器与权重矩阵
+"""
+import hashlib
+import os
+import pickle
+
+from .cache import LRUCache
+from .classifier import GlobalLightClassifier
+
+
+# 快照格式版本：分类器内部结构变化且无法由源码指纹发现时递增
+SNAPSHOT_VERSION = 1
+
+# 决定快照内容的引擎源码（源码变更后快照自动失效）
+ENGINE_SOURCES = ['classifier.py', 'matcher.py', 'scoring.py', 'utils.py', 'cache.py', 'profiler.py', 'store.py',
+                  'features.py']
+
+
+def default_snapshot_path(config_dir, word_boundary_max_len=0):
+    """配置目录下的默认快照路径（按词边界设置区分）"""
+    return os.path.join(config_dir, '.compiled', f'engine-wb{word_boundary_max_len}.pickle')
+
+
+def _file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _file_record(path):
+    """配置文件的校验信息：绝对路径、修改时间、大小、内容哈希"""
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+            'sha256': _file_digest(path)}
+
+
+def _engine_digest():
+    """引擎源码指纹"""
+    digest = hashlib.sha256()
+    base = os.path.dirname(os.path.abspath(__file__))
+    for name in ENGINE_SOURCES:
+        with open(os.path.join(base, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _file_unchanged(record, path):
+    """
+    配置文件是否与快照记录一致
+
+    修改时间与大小都相同时直接认为未变；否则再比较内容哈希（仅被 touch 或重新检出的文件仍有效）
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    if os.path.abspath(path) != record['path'] or stat.st_size != record['size']:
+        return False
+    if stat.st_mtime_ns == record['mtime_ns']:
+        return True
+    return _file_digest(path) == record['sha256']
+
+
+def compile_snapshot(signals_path, scoring_path, filters_path, snapshot_path, word_boundary_max_len=0):
+    """
+    编译步骤：构建分类器并写入快照（先写临时文件再原子替换）
+
+    Args:
+        signals_path, scoring_path, filters_path: 三个配置文件路径
+        snapshot_path: 快照文件路径
+        word_boundary_max_len: 词边界匹配设置
+
+    Returns:
+        新构建的 GlobalLightClassifier
+    """
+    header = {'version': SNAPSHOT_VERSION, 'engine': _engine_digest(),
+              'word_boundary_max_len': word_boundary_max_len,
+              'files': [_file_record(p) for p in (signals_path, scoring_path, filters_path)]}
+    classifier = GlobalLightClassifier(signals_path, scoring_path, filters_path,
+                                       word_boundary_max_len=word_boundary_max_len)
+
+    directory = os.path.dirname(snapshot_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{snapshot_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(classifier, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, snapshot_path)
+    return classifier
+
+
+def load_snapshot(signals_path, scoring_path, filters_path, snapshot_path, word_boundary_max_len=0):
+    """
+    加载快照；快照不存在、格式/源码版本不符或任一配置文件已变更时返回 None
+
+    快照使用 pickle，只应加载本机编译生成的文件。
+
+    Returns:
+        GlobalLightClassifier 或 None
+    """
+    try:
+        with open(snapshot_path, 'rb') as f:
+            header = pickle.load(f)
+            if (not isinstance(header, dict) or header.get('version') != SNAPSHOT_VERSION
+                    or header.get('word_boundary_max_len') != word_boundary_max_len
+                    or header.get('engine') != _engine_digest()):
+                return None
+            paths = (signals_path, scoring_path, filters_path)
+            if not all(_file_unchanged(record, path) for record, path in zip(header['files'], paths)):
+                return None
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, KeyError, ImportError):
+        return None
+
+
+def load_classifier(signals_path, scoring_path, filters_path, snapshot_path=None,
+                    word_boundary_max_len=0, cache_size=0, lazy=False):
+    """
+    优先从快照加载分类器，快照无效时重新编译并写入快照
+
+    Args:
+        signals_path, scoring_path, filters_path: 三个配置文件路径
+        snapshot_path: 快照文件路径；None 时直接构建分类器，不读写快照
+        word_boundary_max_len: 词边界匹配设置
+        cache_size: 逐行模式的标题级LRU缓存大小（运行时设置，不进入快照）
+        lazy: 第二阶段惰性求值（运行时设置，不进入快照）
+
+    Returns:
+        (classifier, loaded): 分类器，以及是否来自已有快照
+    """
+    if snapshot_path is None:
+        return GlobalLightClassifier(signals_path, scoring_path, filters_path,
+                                     word_boundary_max_len=word_boundary_max_len,
+                                     cache_size=cache_size, lazy=lazy), False
+
+    classifier = load_snapshot(signals_path, scoring_path, filters_path, snapshot_path,
+                               word_boundary_max_len)
+    loaded = classifier is not None
+    if not loaded:
+        classifier = compile_snapshot(signals_path, scoring_path, filters_path, snapshot_path,
+                                      word_boundary_max_len)
+    classifier.title_cache = LRUCache(cache_size)
+    classifier.lazy = lazy
+    return classifier, loaded
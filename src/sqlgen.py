@@ -0,0 +1,253 @@
+"""
+SQL 编译模块
+把三个配置文件编译为一条等价的 SQL 查询，在数仓内完成第二至第五层：
+关键词标签、规格特征归一化、线性评分、配件拦截、形态锁定与最低分过滤
+
+输入关系需要提供清洗后的标题 clean_title、站点 site 与六个原始规格列 raw_*
+（即第一阶段输出的同名列）；第一层文本标准化与正则规格提取不在 SQL 中完成。
+"""
+from .utils import RAW_SPEC_COLUMNS, SPEC_FEATURES
+
+
+# 各方言的子串查找与字符串类型
+# materialize: 中间结果物化提示（SQLite 默认把 CTE 展开到引用处，不物化时关键词与评分表达式会被重复计算）
+DIALECTS = {
+    'sqlite': {'find': 'INSTR({text}, {keyword}) > 0', 'text': 'TEXT', 'materialize': 'MATERIALIZED ',
+               'floor': '(CAST({x} AS INTEGER) - ({x} < CAST({x} AS INTEGER)))', 'even': '{x} % 2 = 0'},
+    'ansi': {'find': 'POSITION({keyword} IN {text}) > 0', 'text': 'VARCHAR', 'materialize': '',
+             'floor': 'FLOOR({x})', 'even': 'MOD({x}, 2) = 0'},
+}
+
+# 规格特征 ← 原始规格列的归一化（与 utils._normalize_specs 一致）
+_SPEC_EXPRESSIONS = {
+    'f_kelvin_min': 'CASE WHEN raw_kelvin_min > 0 THEN raw_kelvin_min / 10000.0 ELSE 0.0 END',
+    'f_kelvin_max': 'CASE WHEN raw_kelvin_max > 0 THEN raw_kelvin_max / 10000.0 ELSE 0.0 END',
+    'f_kelvin_range': ('CASE WHEN raw_kelvin_min > 0 AND raw_kelvin_max > raw_kelvin_min '
+                       'THEN (raw_kelvin_max - raw_kelvin_min) / 8000.0 ELSE 0.0 END'),
+    'f_cri': 'CASE WHEN raw_cri > 0 THEN raw_cri / 100.0 ELSE 0.0 END',
+    'f_wattage': ('CASE WHEN raw_wattage >= 300 THEN 1.0 WHEN raw_wattage > 0 '
+                  'THEN raw_wattage / 300.0 ELSE 0.0 END'),
+    'f_lumens': ('CASE WHEN raw_lumens >= 50000 THEN 1.0 WHEN raw_lumens > 0 '
+                 'THEN raw_lumens / 50000.0 ELSE 0.0 END'),
+    'f_lux': 'CASE WHEN raw_lux >= 20000 THEN 1.0 WHEN raw_lux > 0 THEN raw_lux / 20000.0 ELSE 0.0 END',
+}
+
+
+def _literal(value):
+    """字符串字面量（单引号转义）"""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _identifier(name):
+    """带引号的列名（品类名含中文）"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _number(value):
+    """数值字面量，统一写成浮点数，保证 SQL 中按双精度累加"""
+    return repr(float(value))
+
+
+def _any_keyword(keywords, find):
+    """关键词任一命中的条件；空关键词恒成立（与 '' in text 一致）"""
+    keywords = list(dict.fromkeys(keywords))
+    if '' in keywords:
+        return '1 = 1'
+    if not keywords:
+        return '1 = 0'
+    return ' OR '.join(find.format(text='match_title', keyword=_literal(kw)) for kw in keywords)
+
+
+def _tag_expression(lang_map, find):
+    """
+    单个标签的命中表达式（0/1）
+
+    国家 C 的关键词 = lang_map[C] + lang_map['US']，等价于
+    US 关键词命中，或 (country = C 且 C 的关键词命中)
+    """
+    conditions = []
+    us_keywords = lang_map.get('US', [])
+    if us_keywords:
+        conditions.append(f'({_any_keyword(us_keywords, find)})')
+    for country, keywords in lang_map.items():
+        if country != 'US' and keywords:
+            conditions.append(f"(country = {_literal(country)} AND ({_any_keyword(keywords, find)}))")
+    if not conditions:
+        return '0'
+    return 'CASE WHEN ' + '\n        OR '.join(conditions) + ' THEN 1 ELSE 0 END'
+
+
+def _score_expression(model, feature_columns):
+    """
+    线性评分（未取整）：基础分 + 按配置顺序逐项累加 特征×权重（与 ScoringEngine 的累加顺序一致）
+
+    不在 feature_columns 中的特征（既不是标签也不是规格特征）取值恒为0，
+    与 feature_vector.get(feature, 0.0) 一致，不生成该项（否则引用了不存在的列）。
+    """
+    terms = [_number(model['base_score'])]
+    for feature, weight in model['weights'].items():
+        if feature in feature_columns:
+            terms.append(f'({_identifier(feature)} * {_number(weight)})')
+    return ' + '.join(terms)
+
+
+def _round2_expression(column, dialect):
+    """
+    保留两位小数，结果与 Python round(x, 2) 逐位一致
+
+    SQL 的 ROUND 按十进制表示四舍五入（73.125 → 73.13，2.675 → 2.68），
+    而 Python 按双精度的精确值舍入、恰好一半时取偶（73.125 → 73.12，2.675 → 2.67）。
+    这里用 Dekker 拆分求出 x*100 的精确舍入误差 err，以 (x*100 的小数部分 - 0.5) + err
+    的符号决定进位，恰好一半时取偶。
+    """
+    floor = DIALECTS[dialect]['floor']
+    even = DIALECTS[dialect]['even']
+    scaled = f'({column} * 100.0)'
+    high = f'({column} * 134217729.0 - ({column} * 134217729.0 - {column}))'
+    error = f'(({high} * 100.0 - {scaled}) + ({column} - {high}) * 100.0)'
+    floored = floor.format(x=scaled)
+    side = f'(({scaled} - {floored} - 0.5) + {error})'
+    return (f'(CASE WHEN {side} > 0 THEN {floored} + 1 WHEN {side} < 0 THEN {floored} '
+            f'WHEN {even.format(x=floored)} THEN {floored} ELSE {floored} + 1 END) / 100.0')
+
+
+def _winner_expression(score_columns):
+    """最高分品类下标；并列时取配置中靠前者（与 argmax 一致）"""
+    if len(score_columns) == 1:
+        return '0'
+    cases = []
+    for i, column in enumerate(score_columns):
+        comparisons = [f'{column} {">" if j < i else ">="} {other}'
+                       for j, other in enumerate(score_columns) if j != i]
+        cases.append(f'WHEN {" AND ".join(comparisons)} THEN {i}')
+    return 'CASE\n      ' + '\n      '.join(cases) + '\n    END'
+
+
+def compile_sql(classifier, source='items', dialect='sqlite'):
+    """
+    把分类器的配置编译为 SQL 查询
+
+    输出列：输入关系的全部列 + country、各布尔标签（0/1）、规格特征 f_*、
+    score_<品类>、top_category、top_score、predicted_category、decision_reason。
+    predicted_category / decision_reason 与 GlobalLightClassifier 第二阶段输出一致。
+
+    Args:
+        classifier: GlobalLightClassifier（提供已加载的配置与标签/品类顺序）
+        source: 输入关系（表名、视图名或带括号的子查询）
+        dialect: 'sqlite'（INSTR）或 'ansi'（POSITION ... IN ...）；
+            ansi 方言的 decision_reason 中得分的文本格式由执行引擎决定，不保证与 Python 输出一致
+
+    Returns:
+        SQL 字符串
+    """
+    if dialect not in DIALECTS:
+        raise ValueError(f'不支持的SQL方言: {dialect} (可选: {", ".join(DIALECTS)})')
+    if classifier.word_boundary_max_len:
+        raise ValueError('词边界匹配需要正则支持，SQL 编译仅支持 word_boundary_max_len=0')
+    find = DIALECTS[dialect]['find']
+    text_type = DIALECTS[dialect]['text']
+    materialize = DIALECTS[dialect]['materialize']
+
+    categories = classifier.scoring_engine.categories
+    raw_columns = [_identifier(f'raw_score_{category}') for category in categories]
+    score_columns = [_identifier(f'score_{category}') for category in categories]
+    hard_filters = classifier.hard_filters
+    min_threshold = hard_filters.get('min_score_threshold', 30)
+
+    # 第二、三层：关键词标签与规格特征；第五层的配件拦截（按配置顺序取第一个命中的配件）
+    feature_lines = [f'{_tag_expression(classifier.signals[tag], find)} AS {_identifier(tag)}'
+                     for tag in classifier.tags]
+    feature_lines += [f'{_SPEC_EXPRESSIONS[feature]} AS {_identifier(feature)}' for feature in SPEC_FEATURES]
+    accessory_cases = [f'WHEN {find.format(text="match_title", keyword=_literal(acc.lower()))} '
+                       f'THEN {_literal(acc)}' for acc in hard_filters['accessories']]
+    feature_lines.append(('CASE\n      ' + '\n      '.join(accessory_cases) + '\n    END'
+                          if accessory_cases else 'NULL') + ' AS accessory')
+
+    # 第四层：线性评分，先按双精度累加，再保留两位小数
+    feature_columns = set(classifier.tags) | set(SPEC_FEATURES)
+    raw_score_lines = [f'{_score_expression(model, feature_columns)} AS {column}'
+                       for model, column in zip(classifier.scoring_models.values(), raw_columns)]
+    # 没有权重项、基础分为整数的品类得分为整数（与 ScoringEngine 的 int 输出一致）
+    integer_indices = [i for i, model in enumerate(classifier.scoring_models.values())
+                       if type(model['base_score']) is int and not model['weights']]
+    score_lines = [f'{model["base_score"]} AS {column}' if i in integer_indices
+                   else f'{_round2_expression(raw, dialect)} AS {column}'
+                   for i, (model, raw, column)
+                   in enumerate(zip(classifier.scoring_models.values(), raw_columns, score_columns))]
+    winner_cases = ' '.join(f'WHEN {i} THEN {_literal(category)}' for i, category in enumerate(categories))
+    top_score_cases = ' '.join(f'WHEN {i} THEN {column}' for i, column in enumerate(score_columns))
+
+    # 第五层：配件拦截 → 形态锁定 → 最低分过滤 → 最高分归属
+    category_whens = ["WHEN accessory IS NOT NULL THEN '灯光类-其他'"]
+    reason_whens = ["WHEN accessory IS NOT NULL THEN 'Accessory Kill: ' || accessory"]
+    for tag, forced_category in hard_filters.get('form_factor_lock', {}).items():
+        if tag in classifier.tags or tag in SPEC_FEATURES:
+            category_whens.append(f'WHEN {_identifier(tag)} = 1 THEN {_literal(forced_category)}')
+            reason_whens.append(f'WHEN {_identifier(tag)} = 1 THEN {_literal(f"Form Lock: {tag}")}')
+    threshold = _number(min_threshold)
+    top_text = f'CAST(top_score AS {text_type})'
+    if integer_indices:
+        top_text = (f'CASE WHEN winner IN ({", ".join(map(str, integer_indices))}) '
+                    f'THEN CAST(CAST(top_score AS INTEGER) AS {text_type}) ELSE {top_text} END')
+    category_whens += [f"WHEN top_score < {threshold} THEN '灯光类-其他'", 'ELSE top_category']
+    reason_whens += [f"WHEN top_score < {threshold} THEN 'Low Score: ' || {top_text} "
+                     f"|| {_literal(f' < {min_threshold}')}",
+                     f"ELSE 'High Score: ' || top_category || ' (' || {top_text} || ')'"]
+
+    def select_list(lines):
+        return ',\n    '.join(lines)
+
+    def case_block(lines):
+        return '\n    '.join(lines)
+
+    return f'''-- 由 compile_sql.py 根据 signals.json / scoring_models.json / hard_filters.json 生成，请勿手工修改
+-- 配置指纹: {classifier.config_hash}
+-- 输入列: clean_title, site, {', '.join(RAW_SPEC_COLUMNS)}
+WITH base AS (
+  SELECT
+    src.*,
+    COALESCE(src.clean_title, '') AS match_title,
+    CASE UPPER(src.site) WHEN 'JP' THEN 'JP' WHEN 'CN' THEN 'CN' ELSE 'US' END AS country
+  FROM {source} AS src
+),
+features AS {materialize}(
+  SELECT
+    base.*,
+    {select_list(feature_lines)}
+  FROM base
+),
+raw_scored AS {materialize}(
+  SELECT
+    features.*,
+    {select_list(raw_score_lines)}
+  FROM features
+),
+scored AS {materialize}(
+  SELECT
+    raw_scored.*,
+    {select_list(score_lines)}
+  FROM raw_scored
+),
+ranked AS (
+  SELECT
+    scored.*,
+    {_winner_expression(score_columns)} AS winner
+  FROM scored
+),
+decided AS (
+  SELECT
+    ranked.*,
+    CASE winner {winner_cases} END AS top_category,
+    CASE winner {top_score_cases} END AS top_score
+  FROM ranked
+)
+SELECT
+  decided.*,
+  CASE
+    {case_block(category_whens)}
+  END AS predicted_category,
+  CASE
+    {case_block(reason_whens)}
+  END AS decision_reason
+FROM decided
+'''
@@ -0,0 +1,185 @@
+"""
+持久化分类缓存模块
+基于 SQLite 的跨运行结果缓存：键为 (配置哈希, 国家, 清洗后标题)
+"""
+import hashlib
+import os
+import sqlite3
+
+import numpy as np
+
+
+# 缓存数据库文件名
+STORE_FILENAME = 'classification_cache.sqlite'
+
+# 单次查询/写入的批大小（受 SQLite 变量数与事务大小限制）
+BATCH_SIZE = 50000
+
+# 表结构版本（PRAGMA user_version），不一致时重建缓存表
+SCHEMA_VERSION = 3
+
+
+def config_hash(*paths, extra=''):
+    """
+    计算配置文件内容哈希
+
+    Args:
+        *paths: 配置文件路径（signals.json / scoring_models.json / hard_filters.json）
+        extra: 其他影响结果的参数（如词边界设置）
+
+    Returns:
+        sha256 十六进制字符串
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+        digest.update(b'\0')
+    digest.update(extra.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ClassificationStore:
+    """
+    持久化分类缓存
+
+    保存每个 (国家, 清洗后标题) 的预测品类、裁决原因、标签位掩码、规格特征与得分向量。
+    配置哈希是主键的一部分，任何配置变更都会自动使旧条目失效。
+    连接在各进程内按需打开，实例可安全传给多进程工作进程。
+    """
+
+    def __init__(self, cache_dir, config_hash):
+        """
+        Args:
+            cache_dir: 缓存目录（不存在则创建）
+            config_hash: 当前配置哈希（GlobalLightClassifier.config_hash）
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, STORE_FILENAME)
+        self.config_hash = config_hash
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        return state
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=60)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            if self._conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                self._conn.execute('DROP TABLE IF EXISTS results')
+                self._conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS results (
+                    config_hash TEXT NOT NULL,
+                    country TEXT NOT NULL,
+                    clean_title TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    reason TEXT NOT NULL,
+                    tag_mask INTEGER NOT NULL,
+                    specs BLOB NOT NULL,
+                    scores BLOB NOT NULL,
+                    PRIMARY KEY (config_hash, country, clean_title)
+                ) WITHOUT ROWID
+            ''')
+            self._conn.commit()
+        return self._conn
+
+    def close(self):
+        """关闭连接"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def lookup(self, clean_titles, countries, n_specs, n_categories):
+        """
+        批量查询
+
+        Args:
+            clean_titles: 清洗后标题序列
+            countries: 国家代码序列
+            n_specs: 规格特征个数
+            n_categories: 得分向量长度
+
+        Returns:
+            (found, tag_masks, specs, scores, categories, reasons)
+            - found: (N,) bool，是否命中
+            - tag_masks: (N,) uint64 标签位掩码（未命中行为0）
+            - specs: (N × S) 规格特征（未命中行为0）
+            - scores: (N × C) 得分矩阵（未命中行为0）
+            - categories, reasons: object 数组（未命中行为 None）
+        """
+        n = len(clean_titles)
+        found = np.zeros(n, dtype=bool)
+        tag_masks = np.zeros(n, dtype=np.uint64)
+        specs = np.zeros((n, n_specs), dtype=np.float64)
+        scores = np.zeros((n, n_categories), dtype=np.float64)
+        categories = np.empty(n, dtype=object)
+        reasons = np.empty(n, dtype=object)
+
+        conn = self.conn
+        conn.execute('CREATE TEMP TABLE IF NOT EXISTS lookup_keys '
+                     '(idx INTEGER PRIMARY KEY, country TEXT, clean_title TEXT)')
+        keys = list(zip(range(n), countries, clean_titles))
+        for start in range(0, n, BATCH_SIZE):
+            conn.execute('DELETE FROM lookup_keys')
+            conn.executemany('INSERT INTO lookup_keys VALUES (?, ?, ?)', keys[start:start + BATCH_SIZE])
+            rows = conn.execute('''
+                SELECT k.idx, r.category, r.reason, r.tag_mask, r.specs, r.scores
+                FROM lookup_keys k
+                JOIN results r
+                  ON r.config_hash = ? AND r.country = k.country AND r.clean_title = k.clean_title
+            ''', (self.config_hash,))
+            for idx, category, reason, tag_mask, spec_blob, score_blob in rows:
+                found[idx] = True
+                categories[idx] = category
+                reasons[idx] = reason
+                tag_masks[idx] = tag_mask
+                specs[idx] = np.frombuffer(spec_blob, dtype=np.float64)
+                scores[idx] = np.frombuffer(score_blob, dtype=np.float64)
+        conn.execute('DELETE FROM lookup_keys')
+
+        hits = int(found.sum())
+        self.hits += hits
+        self.misses += n - hits
+        return found, tag_masks, specs, scores, categories, reasons
+
+    def save(self, clean_titles, countries, tag_masks, specs, scores, categories, reasons):
+        """
+        批量写入（已存在则覆盖）
+
+        Args:
+            clean_titles, countries: 键
+            tag_masks: (N,) 标签位掩码（不超过63位）
+            specs: (N × S) 规格特征
+            scores: (N × C) 得分矩阵
+            categories, reasons: 预测品类与裁决原因
+        """
+        specs = np.ascontiguousarray(specs, dtype=np.float64)
+        scores = np.ascontiguousarray(scores, dtype=np.float64)
+        rows = [(self.config_hash, country, title, category, reason, mask, x.tobytes(), s.tobytes())
+                for title, country, category, reason, mask, x, s
+                in zip(clean_titles, countries, categories, reasons,
+                       np.asarray(tag_masks).tolist(), specs, scores)]
+        conn = self.conn
+        for start in range(0, len(rows), BATCH_SIZE):
+            conn.executemany('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                             rows[start:start + BATCH_SIZE])
+        conn.commit()
+
+    def prune(self):
+        """
+        删除其他配置哈希下的条目
+
+        Returns:
+            删除的条目数
+        """
+        cursor = self.conn.execute('DELETE FROM results WHERE config_hash != ?', (self.config_hash,))
+        self.conn.commit()
+        return cursor.rowcount
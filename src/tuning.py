@@ -0,0 +1,409 @@
+"""
+权重调优模块
+在特征快照（main.py --save-features）上批量评估候选权重：一批候选的得分按 ScoringEngine 的
+配置顺序逐项累加（与线上评分逐位一致）；配件拦截与形态锁定与权重无关，预先裁决后不参与搜索。
+搜索方式为坐标下降（逐个权重试探若干步长）与随机搜索（同时扰动多个权重）交替进行。
+"""
+import copy
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .evaluation import _factorize, _label, evaluate
+from .scoring import _round2
+
+
+# 每批评估的 候选数 × 特征组数 × 品类数 上限（控制临时得分矩阵的内存）
+MAX_BATCH_CELLS = 8_000_000
+
+# 坐标下降的试探步长（乘以各参数的基准步长）
+COORDINATE_STEPS = (-2.0, -1.0, -0.5, 0.5, 1.0, 2.0)
+
+
+class TuningProblem:
+    """
+    标注数据在特征快照上的评分问题
+
+    特征按快照的去重特征行组织，标注按行累加到 (特征行, 标注品类) 上（可按 GMV 加权）；
+    被配件拦截或形态锁定的特征行预测固定，其余特征行按特征向量再去重，
+    评估一个候选的代价只与不同特征向量的个数有关，与数据行数无关。
+    """
+
+    def __init__(self, classifier, feature_set, labels, weights=None, holdout=0.0, seed=0):
+        """
+        Args:
+            classifier: GlobalLightClassifier（信号词典须与快照一致）
+            feature_set: FeatureSet
+            labels: 标注品类序列，与快照的输入行一一对应（缺失或空白为未标注）
+            weights: 每行的权重（如 GMV，可选，缺失或无法解析的按0计）；默认每行计1
+            holdout: 留出验证的特征行比例（按去重特征行划分，同一标题不会同时出现在两侧）
+            seed: 划分留出集的随机种子
+
+        Raises:
+            ValueError: 标注行数与快照不一致，或快照与分类器配置不一致
+        """
+        row_index = np.asarray(feature_set.row_index)
+        if len(labels) != len(row_index):
+            raise ValueError(f'标注行数 ({len(labels)}) 与特征快照行数 ({len(row_index)}) 不一致')
+        X, tag_masks, accessory_hits = classifier.snapshot_matrices(feature_set)
+        decided, fixed_categories, _ = classifier.hard_decisions_batch(X, accessory_hits, tag_masks)
+
+        engine = classifier.scoring_engine
+        self.categories = list(engine.categories)
+        self.features = list(engine.features)
+        # 评分的累加顺序（见 ScoringEngine）：各品类权重项的个数，不足最大项数的补齐项不参与累加
+        depths = [len(model['weights']) for model in classifier.scoring_models.values()]
+        self.threshold = classifier.hard_filters.get('min_score_threshold', 30)
+
+        # 标注空间：评分品类在前（下标与得分列一致），其后为裁决可能给出的其他品类与标注中的其他标签
+        codes, label_names = _factorize(labels, _label)
+        names = list(self.categories)
+        for name in ['灯光类-其他'] + fixed_categories[decided].tolist() + label_names:
+            if name is not None and name not in names:
+                names.append(name)
+        self.labels = names
+        index = {name: i for i, name in enumerate(names)}
+        self.low_code = index['灯光类-其他']
+        lut = np.array([index[name] if name is not None else -1 for name in label_names] + [-1], dtype=np.int64)
+        codes = lut[codes]
+
+        if weights is None:
+            row_weights = np.ones(len(codes), dtype=np.float64)
+        else:
+            row_weights = pd.to_numeric(pd.Series(weights), errors='coerce').to_numpy(
+                dtype=np.float64, na_value=0.0)
+            row_weights = np.nan_to_num(row_weights)
+        labelled = codes >= 0
+
+        # (特征行, 标注) 的权重累加；留出集按特征行划分
+        n_keys, n_labels = len(X), len(names)
+        in_holdout = np.random.default_rng(seed).random(n_keys) < holdout
+        cells = row_index[labelled] * n_labels + codes[labelled]
+        key_labels = np.bincount(cells, weights=row_weights[labelled],
+                                 minlength=n_keys * n_labels).reshape(n_keys, n_labels)
+        splits = [key_labels * ~in_holdout[:, None], key_labels * in_holdout[:, None]]
+        self.total = np.array([split.sum() for split in splits])
+        self.labelled_rows = int(labelled.sum())
+
+        # 预测固定的特征行：直接计入正确权重
+        fixed_codes = np.array([index[name] for name in fixed_categories[decided].tolist()], dtype=np.int64)
+        decided_keys = np.flatnonzero(decided)
+        self.fixed_correct = np.array([split[decided_keys, fixed_codes].sum() for split in splits])
+        self.fixed_keys = len(decided_keys)
+
+        # 其余特征行按特征向量去重
+        free = ~decided
+        self.X, inverse = np.unique(X[free], axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        self.train = np.zeros((len(self.X), n_labels))
+        self.holdout = np.zeros((len(self.X), n_labels))
+        np.add.at(self.train, inverse, splits[0][free])
+        np.add.at(self.holdout, inverse, splits[1][free])
+
+        # 各品类按配置顺序的累加项 (特征下标, 特征非0的特征向量, 非0值是否都为1)：特征为0的项加 ±0，
+        # 不改变得分，只需更新非0的行；过半非0时整列更新（None）
+        nonzero = {}
+        used = np.arange(len(engine._term_features))[:, np.newaxis] < np.array(depths)
+        for j in np.unique(engine._term_features[used]).tolist():
+            rows = np.flatnonzero(self.X[:, j])
+            nonzero[j] = (None if len(rows) * 2 > len(self.X) else rows, bool((self.X[rows, j] == 1.0).all()))
+        self._terms = [[(j,) + nonzero[j] for j in engine._term_features[:depth, i].tolist()]
+                       for i, depth in enumerate(depths)]
+
+    def __len__(self):
+        """参与搜索的不同特征向量个数"""
+        return len(self.X)
+
+    def raw_scores(self, weights, bases, categories=None):
+        """
+        一批候选下每个特征向量的得分（未取整）
+
+        与 ScoringEngine 相同，从基础分开始按配置顺序逐项累加 特征×权重（而非矩阵乘法），
+        取整后的得分与线上评分逐位一致，门限与两位小数边界上的裁决不会因累加顺序不同而改变。
+
+        Args:
+            weights: (B × C × F) 权重矩阵
+            bases: (B × C) 基础分
+            categories: 只计算这些品类的得分（品类下标列表，默认全部）
+
+        Returns:
+            (G × B × K) 得分，K 为品类数（或 len(categories)）
+        """
+        if categories is None:
+            categories = range(len(self._terms))
+        raw = np.empty((len(categories), len(self.X), len(weights)))
+        for slab, i in zip(raw, categories):
+            slab[:] = bases[:, i]
+            for j, rows, binary in self._terms[i]:
+                if rows is None:
+                    slab += self.X[:, j, np.newaxis] * weights[:, i, j]
+                elif binary:
+                    # 非0值均为1.0：1.0 × 权重 == 权重
+                    slab[rows] += weights[:, i, j]
+                else:
+                    slab[rows] += self.X[rows, j, np.newaxis] * weights[:, i, j]
+        return raw.transpose(1, 2, 0)
+
+    def _decide(self, scores):
+        """取整后的得分 → 预测的标注下标（最高分低于最低分门限时为 灯光类-其他）"""
+        winners = scores.argmax(axis=-1)
+        top_scores = np.take_along_axis(scores, winners[..., np.newaxis], axis=-1)[..., 0]
+        return np.where(top_scores < self.threshold, self.low_code, winners)
+
+    def _correct(self, rows, predicted):
+        """预测正确的（加权）行数：(train, holdout)，沿最后一维以外求和"""
+        rows = rows.reshape(rows.shape + (1,) * (predicted.ndim - 1))
+        return self.train[rows, predicted].sum(axis=0), self.holdout[rows, predicted].sum(axis=0)
+
+    def accuracy(self, weights, bases):
+        """
+        一批候选的（加权）准确率
+
+        Args:
+            weights: (B × C × F) 权重矩阵
+            bases: (B × C) 基础分
+
+        Returns:
+            (train, holdout)：两个 (B,) 数组，无标注时为0
+        """
+        n_candidates = len(weights)
+        chunk = max(1, MAX_BATCH_CELLS // max(1, len(self.X) * len(self.categories)))
+        correct = np.empty((2, n_candidates))
+        rows = np.arange(len(self.X))
+        for start in range(0, n_candidates, chunk):
+            end = min(start + chunk, n_candidates)
+            predicted = self._decide(_round2(self.raw_scores(weights[start:end], bases[start:end])))
+            correct[:, start:end] = self._correct(rows, predicted)
+        correct += self.fixed_correct[:, np.newaxis]
+        return self._ratio(correct[0], correct[1])
+
+    def _ratio(self, train, holdout):
+        total = np.where(self.total > 0, self.total, 1.0)
+        return train / total[0], holdout / total[1]
+
+    def coordinate_gains(self, raw, category, column, deltas):
+        """
+        只改变一个参数时的准确率变化
+
+        参数 (品类 i, 特征 j) 增加 δ 只使第 i 列得分增加 δ·X[:, j]，且只影响该特征非零的特征向量：
+        其余品类的最高分不变，每个候选只需比较一列，不必重算整个得分矩阵。
+        增量加在累加末尾，与按配置顺序累加可能差最后一位，因此只用于挑选候选；
+        tune 接受候选后按 raw_scores 重算得分，每轮结束时以完整评估校正准确率。
+
+        Args:
+            raw: (G × C) 当前参数下的得分（未取整）
+            category: 品类下标 i
+            column: (G,) 该参数对应的特征列（基础分为全1）
+            deltas: (D,) 参数的增量
+
+        Returns:
+            (train, holdout)：两个 (D,) 数组，相对当前参数的准确率变化
+        """
+        rows = np.flatnonzero(column)
+        scores = _round2(raw[rows])
+        current = self._correct(rows, self._decide(scores))
+
+        others = scores.copy()
+        others[:, category] = -np.inf
+        other_winners = others.argmax(axis=1)[:, np.newaxis]
+        other_top = np.take_along_axis(others, other_winners, axis=1)
+        candidate = _round2(raw[rows, category][:, np.newaxis] + column[rows][:, np.newaxis] * deltas)
+        # 并列时取配置中靠前的品类（与 argmax 一致）
+        wins = (candidate > other_top) | ((candidate == other_top) & (category < other_winners))
+        top_scores = np.where(wins, candidate, other_top)
+        predicted = np.where(top_scores < self.threshold, self.low_code,
+                             np.where(wins, category, other_winners))
+        train, holdout = self._correct(rows, predicted)
+        return self._ratio(train - current[0], holdout - current[1])
+
+
+class WeightSpace:
+    """
+    可调参数：各品类的基础分与配置中已列出的权重（未列出的特征权重保持为0，不引入新的特征项）
+    """
+
+    def __init__(self, scoring_models, engine, tune_base=True):
+        """
+        Args:
+            scoring_models: 评分模型配置（scoring_models.json 的内容）
+            engine: ScoringEngine（提供品类与特征顺序）
+            tune_base: 是否调整基础分
+        """
+        self.scoring_models = scoring_models
+        self.engine = engine
+        self.parameters = []
+        values = []
+        for i, (category, model) in enumerate(scoring_models.items()):
+            if tune_base:
+                self.parameters.append((i, None, category, 'base_score'))
+                values.append(model['base_score'])
+            for feature, weight in model['weights'].items():
+                self.parameters.append((i, engine.feature_index[feature], category, feature))
+                values.append(weight)
+        self.initial = np.array(values, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.parameters)
+
+    def steps(self, min_step=5.0):
+        """各参数的基准步长：当前值的四分之一，不小于 min_step"""
+        return np.maximum(np.abs(self.initial) / 4, min_step)
+
+    def matrices(self, thetas):
+        """
+        参数向量 → 权重矩阵与基础分
+
+        Args:
+            thetas: (B × P) 参数矩阵
+
+        Returns:
+            (weights (B × C × F), bases (B × C))
+        """
+        thetas = np.atleast_2d(thetas)
+        weights = np.repeat(self.engine.weights[np.newaxis], len(thetas), axis=0)
+        bases = np.repeat(self.engine.base_scores[np.newaxis], len(thetas), axis=0)
+        for p, (i, j, _, _) in enumerate(self.parameters):
+            if j is None:
+                bases[:, i] = thetas[:, p]
+            else:
+                weights[:, i, j] = thetas[:, p]
+        return weights, bases
+
+    def to_models(self, theta, decimals=0):
+        """
+        参数向量 → 评分模型配置（保持原有的品类、特征顺序与其余字段）
+
+        Args:
+            theta: (P,) 参数向量
+            decimals: 保留的小数位数（0 时写为整数）
+
+        Returns:
+            新的评分模型配置字典
+        """
+        models = copy.deepcopy(self.scoring_models)
+        for value, (_, j, category, feature) in zip(theta.tolist(), self.parameters):
+            value = round(value, decimals)
+            if decimals == 0:
+                value = int(value)
+            if j is None:
+                models[category]['base_score'] = value
+            else:
+                models[category]['weights'][feature] = value
+        return models
+
+
+def tune(problem, space, rounds=10, candidates=64, seed=0, decimals=0, log=None):
+    """
+    坐标下降 + 随机搜索
+
+    每一轮先按随机顺序逐个参数试探 COORDINATE_STEPS 倍步长，再随机扰动 2~6 个参数生成一批候选；
+    只接受训练集准确率严格提高的候选，整轮没有提高时提前结束。同一 seed 结果完全相同。
+
+    Args:
+        problem: TuningProblem
+        space: WeightSpace
+        rounds: 最多轮数
+        candidates: 每轮随机搜索的候选数
+        seed: 随机种子
+        decimals: 参数保留的小数位数（候选值按此取整，默认整数）
+        log: 每轮结束时的回调 log(round, train, holdout)（可选）
+
+    Returns:
+        (theta, history)：最优参数向量，以及每轮的 {'round', 'train', 'holdout'} 列表（第0轮为初始值）
+    """
+    rng = np.random.default_rng(seed)
+    steps = space.steps()
+    theta = np.round(space.initial, decimals)
+    train, holdout = problem.accuracy(*space.matrices(theta))
+    best, best_holdout = train[0], holdout[0]
+    history = [{'round': 0, 'train': float(best), 'holdout': float(best_holdout)}]
+    ones = np.ones(len(problem))
+
+    for round_number in range(1, rounds + 1):
+        improved = False
+
+        # 坐标下降：每次接受后重新计算当前得分（避免增量累加的舍入误差）
+        raw = problem.raw_scores(*space.matrices(theta))[:, 0]
+        for p in rng.permutation(len(space)):
+            category, feature = space.parameters[p][:2]
+            values = np.unique(np.round(theta[p] + np.array(COORDINATE_STEPS) * steps[p], decimals))
+            values = values[values != theta[p]]
+            column = ones if feature is None else problem.X[:, feature]
+            if not len(values) or not column.any():
+                continue
+            train, holdout = problem.coordinate_gains(raw, category, column, values - theta[p])
+            k = int(np.argmax(train))
+            if train[k] > 0:
+                theta = theta.copy()
+                theta[p] = values[k]
+                best, best_holdout, improved = best + train[k], best_holdout + holdout[k], True
+                # 只有该参数所在品类的得分改变
+                raw[:, category] = problem.raw_scores(*space.matrices(theta), categories=[category])[:, 0, 0]
+
+        # 随机搜索
+        if candidates:
+            thetas = np.repeat(theta[np.newaxis], candidates, axis=0)
+            for row in thetas:
+                chosen = rng.choice(len(space), size=min(len(space), rng.integers(2, 7)), replace=False)
+                row[chosen] += rng.normal(size=len(chosen)) * steps[chosen]
+            thetas = np.round(thetas, decimals)
+            train, holdout = problem.accuracy(*space.matrices(thetas))
+            k = int(np.argmax(train))
+            if train[k] > best:
+                theta, best, best_holdout, improved = thetas[k], train[k], holdout[k], True
+
+        # 以完整评估校正累计的增益
+        train, holdout = problem.accuracy(*space.matrices(theta))
+        best, best_holdout = train[0], holdout[0]
+        history.append({'round': round_number, 'train': float(best), 'holdout': float(best_holdout)})
+        if log is not None:
+            log(round_number, best, best_holdout)
+        if not improved:
+            break
+    return theta, history
+
+
+def evaluate_snapshot(classifier, feature_set, labels, weights=None):
+    """
+    用分类器（而非调优时的批量近似）对特征快照重评分并评估，作为调优前后的最终对比
+
+    Args:
+        classifier: GlobalLightClassifier
+        feature_set: FeatureSet
+        labels: 标注品类序列（与快照的输入行一一对应）
+        weights: GMV 序列（可选）
+
+    Returns:
+        evaluation.evaluate 的报告字典
+    """
+    _, _, categories, reasons = classifier.rescore_features(feature_set)
+    row_index = np.asarray(feature_set.row_index)
+    return evaluate(labels, categories[row_index], reasons[row_index], weights=weights,
+                    categories=classifier.scoring_engine.categories)
+
+
+def save_tuned_config(models, config_dir, output_dir):
+    """
+    写出调优后的配置目录：scoring_models.json 为调优结果，signals.json / hard_filters.json 从原配置复制，
+    可直接作为 main.py / evaluate.py 的 --config-dir
+
+    Args:
+        models: 评分模型配置
+        config_dir: 原配置目录
+        output_dir: 输出目录（不能与原配置目录相同）
+
+    Returns:
+        写出的 scoring_models.json 路径
+    """
+    if os.path.abspath(output_dir) == os.path.abspath(config_dir):
+        raise ValueError('输出目录不能与原配置目录相同，请检查结果后再替换')
+    os.makedirs(output_dir, exist_ok=True)
+    for name in ('signals.json', 'hard_filters.json'):
+        shutil.copyfile(os.path.join(config_dir, name), os.path.join(output_dir, name))
+    path = os.path.join(output_dir, 'scoring_models.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(models, ensure_ascii=False, indent=2) + '\n')
+    return path
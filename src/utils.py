@@ -5,6 +5,74 @@
 import re
 import unicodedata
 
+import numpy as np
+
+
+# 第三层输出的归一化规格特征（顺序即特征矩阵中的列顺序）
+SPEC_FEATURES = ['f_kelvin_min', 'f_kelvin_max', 'f_kelvin_range', 'f_cri',
+                 'f_wattage', 'f_lumens', 'f_lux']
+
+# 各规格特征的取值上限（下限均为0），由提取规则决定：色温下限最多5位数字（范围写法只要求 ≥2000），
+# 色温上限与范围受 ≤10000K 约束，CRI ≤100，功率/流明/照度归一化时截断到1
+SPEC_FEATURE_MAX = {'f_kelvin_min': 9.9999, 'f_kelvin_max': 1.0, 'f_kelvin_range': 1.0, 'f_cri': 1.0,
+                    'f_wattage': 1.0, 'f_lumens': 1.0, 'f_lux': 1.0}
+
+# 第一阶段输出的原始规格列
+RAW_SPEC_COLUMNS = ['raw_kelvin_min', 'raw_kelvin_max', 'raw_cri',
+                    'raw_wattage', 'raw_lumens', 'raw_lux']
+
+# 规格正则（逐条提取与整列提取共用）
+KELVIN_RANGE_PATTERN = r'(\d{3,5})\s*k\s*[-～~/]\s*(\d{3,5})\s*k'
+KELVIN_RANGE_PATTERN2 = r'(\d{3,5})\s*[-～~]\s*(\d{3,5})\s*k'
+KELVIN_PATTERN = r'(\d{3,5})\s*(k|kelvin|ケルビン)\b'
+CRI_RANGE_PATTERN = r'(cri|tlci)\s*:?\s*(\d+)\s*[-~]\s*(\d+)'
+CRI_PATTERN = r'(\d+)\s*(cri|tlci)|(cri|tlci)\s*:?\s*(\d+)'
+WATTAGE_PATTERN = r'(\d+)\s*(w|watt|ワット|ｗ)'
+LUMENS_PATTERN = r'(\d{1,3}(?:,\d{3})*|\d{3,6})\s*(?:lm|lumens|ルーメン)'
+LUX_PATTERN = r'(\d{1,3}(?:,\d{3})*|\d{3,6})\s*(?:lux|ルクス|lx)'
+
+_KELVIN_RANGE_RE = re.compile(KELVIN_RANGE_PATTERN, re.IGNORECASE)
+_KELVIN_RANGE_RE2 = re.compile(KELVIN_RANGE_PATTERN2, re.IGNORECASE)
+_KELVIN_RE = re.compile(KELVIN_PATTERN, re.IGNORECASE)
+_CRI_RANGE_RE = re.compile(CRI_RANGE_PATTERN, re.IGNORECASE)
+_CRI_RE = re.compile(CRI_PATTERN, re.IGNORECASE)
+_WATTAGE_RE = re.compile(WATTAGE_PATTERN, re.IGNORECASE)
+_LUMENS_RE = re.compile(LUMENS_PATTERN, re.IGNORECASE)
+_LUX_RE = re.compile(LUX_PATTERN, re.IGNORECASE)
+
+# 第一层噪声字符（保留字母、数字、下划线、空白、点、连字符、长音符）
+_NOISE_RE = re.compile(r'[^\w\s\.\-ー]')
+
+
+def _build_ascii_table():
+    """
+    纯ASCII标题的一步转换表：大写→小写，噪声字符→空格
+
+    ASCII 字符经 NFKC 不变，因此 translate 的结果与 NFKC + lower + 噪声替换完全一致
+    （保留集合按 Python 正则 \\w / \\s 的 Unicode 语义逐字符判定）。
+    """
+    table = {}
+    for code in range(128):
+        ch = chr(code)
+        lower = ch.lower()
+        if _NOISE_RE.match(lower):
+            table[code] = ' '
+        elif lower != ch:
+            table[code] = lower
+    return table
+
+
+_ASCII_TABLE = _build_ascii_table()
+
+# Arrow 整列快速路径（仅用于纯ASCII标题）：RE2 的 \w / \s 只覆盖ASCII且不含 \x0b、\x1c-\x1f，
+# 因此按 Python 正则在ASCII范围内的语义显式写出字符类
+_ARROW_NOISE_PATTERN = r'[^0-9a-z_\t\n\x0b\x0c\r\x1c-\x1f .\-]'
+_ARROW_SPACE_PATTERN = r'[\t\n\x0b\x0c\r\x1c-\x1f ]+'
+
+# 单位记号：数字（可隔空白）后紧跟的单位首字符，或 cri/tlci 关键词
+# 每个规格正则的匹配都必然包含其中一个记号，没有记号的规格无需再匹配
+_UNIT_TOKEN_RE = re.compile(r'\d\s*([kケwｗワlル])|(cri|tlci)', re.IGNORECASE)
+
 
 def normalize_text(text):
     """
@@ -26,22 +94,24 @@ def normalize_text(text):
     if not isinstance(text, str):
         return ""
 
-    # 全角→半角
-    text = unicodedata.normalize('NFKC', text)
-
-    # 大小写归一化
-    text = text.lower()
+    if text.isascii():
+        # 快速路径：纯ASCII无需NFKC，大小写与噪声去除一次 translate 完成
+        text = text.translate(_ASCII_TABLE)
+    else:
+        # 全角→半角
+        text = unicodedata.normalize('NFKC', text)
 
-    # 噪声去除（保留字母、数字、连字符、空格）
-    text = re.sub(r'[^\w\s\.\-ー]', ' ', text)
+        # 大小写归一化
+        text = text.lower()
 
-    # 去除多余空格
-    text = re.sub(r'\s+', ' ', text).strip()
+        # 噪声去除（保留字母、数字、连字符、空格）
+        text = _NOISE_RE.sub(' ', text)
 
-    return text
+    # 去除多余空格（str.split 与正则 \s 的空白定义相同）
+    return ' '.join(text.split())
 
 
-def extract_kelvin_raw(text):
+def extract_kelvin_raw(text, pos=0):
     """
     提取色温原始值，返回 (min, max) 或 (0, 0)
 
@@ -52,9 +122,11 @@ def extract_kelvin_raw(text):
     - 3000k - 7200k → (3000, 7200) 支持空格+分隔符
     - 2500 - 8500k → (2500, 8500) 支持第一个数无k
     - 5600k → (5600, 5600)
+
+    pos 为搜索起点（由 scan_specs 给出，保证不晚于首个可能的匹配）
     """
     # 范围匹配格式1: Xk-Yk (k紧跟数字)
-    kelvin_range_match = re.search(r'(\d{3,5})\s*k\s*[-～~/]\s*(\d{3,5})\s*k', text, re.IGNORECASE)
+    kelvin_range_match = _KELVIN_RANGE_RE.search(text, pos)
     if kelvin_range_match:
         kelvin_min = float(kelvin_range_match.group(1))
         kelvin_max = float(kelvin_range_match.group(2))
@@ -62,7 +134,7 @@ def extract_kelvin_raw(text):
             return (kelvin_min, kelvin_max)
 
     # 范围匹配格式2: X - Yk (第一个数无k，第二个有k)
-    kelvin_range_match2 = re.search(r'(\d{3,5})\s*[-～~]\s*(\d{3,5})\s*k', text, re.IGNORECASE)
+    kelvin_range_match2 = _KELVIN_RANGE_RE2.search(text, pos)
     if kelvin_range_match2:
         kelvin_min = float(kelvin_range_match2.group(1))
         kelvin_max = float(kelvin_range_match2.group(2))
@@ -70,7 +142,7 @@ def extract_kelvin_raw(text):
             return (kelvin_min, kelvin_max)
 
     # 单个值匹配 - 必须有k后缀
-    kelvin_match = re.search(r'(\d{3,5})\s*(k|kelvin|ケルビン)\b', text, re.IGNORECASE)
+    kelvin_match = _KELVIN_RE.search(text, pos)
     if kelvin_match:
         kelvin_val = float(kelvin_match.group(1))
         if kelvin_val >= 2000 and kelvin_val <= 10000:
@@ -81,7 +153,7 @@ def extract_kelvin_raw(text):
         return (0.0, 0.0)
 
 
-def extract_cri_raw(text):
+def extract_cri_raw(text, pos=0):
     """
     提取CRI原始值
 
@@ -91,7 +163,7 @@ def extract_cri_raw(text):
     - CRI 95-97 → 取上限97
     """
     # 范围匹配 (CRI 95-97)
-    cri_range_match = re.search(r'(cri|tlci)\s*:?\s*(\d+)\s*[-~]\s*(\d+)', text, re.IGNORECASE)
+    cri_range_match = _CRI_RANGE_RE.search(text, pos)
     if cri_range_match:
         cri_val = float(cri_range_match.group(3))  # 取上限
         if 70 <= cri_val <= 100:
@@ -101,7 +173,7 @@ def extract_cri_raw(text):
 
     # 格式: CRI 97 或 97 CRI 或 CRI97 或 97cri
     # 支持数字在前(cri)或在后(cri 97)
-    cri_match = re.search(r'(\d+)\s*(cri|tlci)|(cri|tlci)\s*:?\s*(\d+)', text, re.IGNORECASE)
+    cri_match = _CRI_RE.search(text, pos)
     if cri_match:
         # 数字在前
         if cri_match.group(1):
@@ -116,20 +188,20 @@ def extract_cri_raw(text):
     return 0.0
 
 
-def extract_wattage_raw(text):
+def extract_wattage_raw(text, pos=0):
     """
     提取功率原始值
 
     支持格式：
     - 200W、200w、200Watt、200ワット、200ｗ（全角）
     """
-    watt_match = re.search(r'(\d+)\s*(w|watt|ワット|ｗ)', text, re.IGNORECASE)
+    watt_match = _WATTAGE_RE.search(text, pos)
     if watt_match:
         return float(watt_match.group(1))
     return 0.0
 
 
-def extract_lumens_raw(text):
+def extract_lumens_raw(text, pos=0):
     """
     流明值提取
 
@@ -139,7 +211,7 @@ def extract_lumens_raw(text):
     """
     # 匹配数字+单位，上限限制在500000流明
     # 工业级补光灯通常不超过500000流明，超过此值的通常为误匹配
-    lumens_match = re.search(r'(\d{1,3}(?:,\d{3})*|\d{3,6})\s*(?:lm|lumens|ルーメン)', text, re.IGNORECASE)
+    lumens_match = _LUMENS_RE.search(text, pos)
     if lumens_match:
         lumens_val = float(lumens_match.group(1).replace(',', ''))
         if lumens_val <= 500000:
@@ -147,7 +219,7 @@ def extract_lumens_raw(text):
     return 0.0
 
 
-def extract_lux_raw(text):
+def extract_lux_raw(text, pos=0):
     """
     照度值提取
 
@@ -156,7 +228,7 @@ def extract_lux_raw(text):
     - 12,500lux (带逗号)
     """
     # 匹配数字+单位，上限限制在200000照度
-    lux_match = re.search(r'(\d{1,3}(?:,\d{3})*|\d{3,6})\s*(?:lux|ルクス|lx)', text, re.IGNORECASE)
+    lux_match = _LUX_RE.search(text, pos)
     if lux_match:
         lux_val = float(lux_match.group(1).replace(',', ''))
         if lux_val <= 200000:
@@ -164,28 +236,69 @@ def extract_lux_raw(text):
     return 0.0
 
 
-def extract_specs(text):
+def _token_start(text, pos, separators=''):
+    """从单位记号向前越过数字、空白、逗号（及范围分隔符），得到匹配可能的最早起点"""
+    while pos > 0:
+        ch = text[pos - 1]
+        if ch.isdecimal() or ch.isspace() or ch == ',' or ch in separators:
+            pos -= 1
+        else:
+            break
+    return pos
+
+
+def scan_specs(text):
     """
-    第三层：规格数字化提取
+    规格单遍扫描：第二、三阶段共用
 
-    保留指标（删除 f_levels、f_angle、f_battery）：
-    - f_kelvin_min, f_kelvin_max: 色温范围（归一化）
-    - f_kelvin_range: 色温覆盖度
-    - f_cri: 显色指数
-    - f_wattage: 功率
-    - f_lumens: 流明值
-    - f_lux: 照度
+    先用一个预编译正则一次扫描出全部 数字+单位 记号（K、CRI/TLCI、W/ワット、
+    lm/ルーメン、lux/ルクス），没有记号的规格直接为0；
+    有记号的规格只从记号附近开始精确匹配，优先级（范围优先于单值）与上下限
+    与逐项提取完全一致。
 
     Args:
         text: 清洗后的商品标题
 
     Returns:
-        规格参数字典，每个值都在[0, 1]区间
+        (kelvin_min, kelvin_max, cri, wattage, lumens, lux) 原始值，无值为0
     """
+    kelvin_pos = cri_pos = watt_pos = light_pos = None
+    for token in _UNIT_TOKEN_RE.finditer(text):
+        unit = token.group(1)
+        if unit is None:
+            if cri_pos is None:
+                cri_pos = token.start()
+        else:
+            unit = unit.lower()
+            if unit in 'kケ':
+                if kelvin_pos is None:
+                    kelvin_pos = token.start()
+            elif unit in 'wｗワ':
+                if watt_pos is None:
+                    watt_pos = token.start()
+            elif light_pos is None:
+                light_pos = token.start()
+
+    kelvin_min = kelvin_max = cri = wattage = lumens = lux = 0.0
+    if kelvin_pos is not None:
+        kelvin_min, kelvin_max = extract_kelvin_raw(text, _token_start(text, kelvin_pos, '-～~/'))
+    if cri_pos is not None:
+        cri = extract_cri_raw(text, _token_start(text, cri_pos))
+    if watt_pos is not None:
+        wattage = extract_wattage_raw(text, _token_start(text, watt_pos))
+    if light_pos is not None:
+        start = _token_start(text, light_pos)
+        lumens = extract_lumens_raw(text, start)
+        lux = extract_lux_raw(text, start)
+
+    return kelvin_min, kelvin_max, cri, wattage, lumens, lux
+
+
+def _normalize_specs(kelvin_min, kelvin_max, cri_raw, watt_raw, lumens_raw, lux_raw):
+    """原始规格值 → 归一化规格特征字典"""
     specs = {}
 
     # 1. 色温范围 (min/max)
-    kelvin_min, kelvin_max = extract_kelvin_raw(text)
     specs['f_kelvin_min'] = kelvin_min / 10000.0 if kelvin_min > 0 else 0.0
     specs['f_kelvin_max'] = kelvin_max / 10000.0 if kelvin_max > 0 else 0.0
     # 色温覆盖范围（归一化）
@@ -195,24 +308,53 @@ def extract_specs(text):
         specs['f_kelvin_range'] = 0.0
 
     # 2. CRI
-    cri_raw = extract_cri_raw(text)
     specs['f_cri'] = cri_raw / 100.0 if cri_raw > 0 else 0.0
 
     # 3. 功率
-    watt_raw = extract_wattage_raw(text)
     specs['f_wattage'] = min(watt_raw / 300.0, 1.0) if watt_raw > 0 else 0.0
 
     # 4. 流明
-    lumens_raw = extract_lumens_raw(text)
     specs['f_lumens'] = min(lumens_raw / 50000.0, 1.0) if lumens_raw > 0 else 0.0
 
     # 5. 照度
-    lux_raw = extract_lux_raw(text)
     specs['f_lux'] = min(lux_raw / 20000.0, 1.0) if lux_raw > 0 else 0.0
 
     return specs
 
 
+def _raw_specs_dict(kelvin_min, kelvin_max, cri_raw, watt_raw, lumens_raw, lux_raw):
+    """原始规格值 → 第一阶段输出的整数字典"""
+    return {
+        'raw_kelvin_min': int(kelvin_min) if kelvin_min > 0 else 0,
+        'raw_kelvin_max': int(kelvin_max) if kelvin_max > 0 else 0,
+        'raw_cri': int(cri_raw),
+        'raw_wattage': int(watt_raw),
+        'raw_lumens': int(lumens_raw),
+        'raw_lux': int(lux_raw),
+    }
+
+
+def extract_specs(text):
+    """
+    第三层：规格数字化提取
+
+    保留指标（删除 f_levels、f_angle、f_battery）：
+    - f_kelvin_min, f_kelvin_max: 色温范围（归一化）
+    - f_kelvin_range: 色温覆盖度
+    - f_cri: 显色指数
+    - f_wattage: 功率
+    - f_lumens: 流明值
+    - f_lux: 照度
+
+    Args:
+        text: 清洗后的商品标题
+
+    Returns:
+        规格参数字典，每个值都在[0, 1]区间
+    """
+    return _normalize_specs(*scan_specs(text))
+
+
 def extract_raw_specs(text):
     """
     提取未归一化的原始规格值
@@ -222,23 +364,139 @@ def extract_raw_specs(text):
     Returns:
         包含原始值的字典
     """
-    raw_specs = {}
+    return _raw_specs_dict(*scan_specs(text))
 
-    # 色温
-    kelvin_min, kelvin_max = extract_kelvin_raw(text)
-    raw_specs['raw_kelvin_min'] = int(kelvin_min) if kelvin_min > 0 else 0
-    raw_specs['raw_kelvin_max'] = int(kelvin_max) if kelvin_max > 0 else 0
 
-    # CRI
-    raw_specs['raw_cri'] = int(extract_cri_raw(text))
+def extract_spec_values(text):
+    """
+    一次扫描同时得到原始值与归一化值（第一、二阶段共用）
 
-    # 功率
-    raw_specs['raw_wattage'] = int(extract_wattage_raw(text))
+    Args:
+        text: 清洗后的商品标题
 
-    # 流明
-    raw_specs['raw_lumens'] = int(extract_lumens_raw(text))
+    Returns:
+        (raw_specs, specs): extract_raw_specs 与 extract_specs 的结果
+    """
+    values = scan_specs(text)
+    return _raw_specs_dict(*values), _normalize_specs(*values)
+
+
+def _normalize_ascii_arrow(texts):
+    """
+    用 Arrow 字符串内核整列处理纯ASCII标题（结果与 normalize_text 逐字节一致）
+
+    Args:
+        texts: 纯ASCII字符串列表
+
+    Returns:
+        清洗后的字符串列表；未安装 pyarrow 时返回 None
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        return None
+    array = pc.ascii_lower(pa.array(texts, type=pa.string()))
+    array = pc.replace_substring_regex(array, _ARROW_NOISE_PATTERN, ' ')
+    array = pc.replace_substring_regex(array, _ARROW_SPACE_PATTERN, ' ')
+    return pc.utf8_trim(array, ' ').to_pylist()
+
+
+def normalize_series(texts):
+    """
+    第一层（整列）：对整列标题做基础预处理，结果与逐条 normalize_text 完全一致
+
+    纯ASCII标题走 Arrow 向量化内核（已安装 pyarrow 时），其余标题逐条 normalize_text。
+
+    Args:
+        texts: pandas Series（原始商品标题）
+
+    Returns:
+        object 类型的 Series（清洗后的文本），非字符串输入输出空串
+    """
+    import pandas as pd
+
+    values = texts.to_numpy(dtype=object)
+    result = np.full(len(values), '', dtype=object)
+    is_ascii = np.fromiter((isinstance(t, str) and t.isascii() for t in values),
+                           dtype=bool, count=len(values))
+
+    ascii_idx = np.flatnonzero(is_ascii)
+    cleaned = _normalize_ascii_arrow(values[ascii_idx].tolist()) if len(ascii_idx) else []
+    if cleaned is None:
+        is_ascii[:] = False
+    else:
+        result[ascii_idx] = cleaned
+
+    other_idx = np.flatnonzero(~is_ascii)
+    result[other_idx] = [normalize_text(t) for t in values[other_idx]]
+    return pd.Series(result, index=texts.index, dtype=object)
+
+
+def _raw_spec_arrays(texts):
+    """
+    整列提取原始规格值（每个标题单遍扫描）
+
+    Returns:
+        (kelvin_min, kelvin_max, cri, wattage, lumens, lux) 六个 float 数组，无值为0
+    """
+    values = np.array([scan_specs(t) for t in texts], dtype=np.float64).reshape(-1, 6)
+    return tuple(values.T)
+
+
+def extract_specs_columns(texts):
+    """
+    第三层（整列）：规格数字化提取，结果与逐条 extract_specs 一致
 
-    # 照度
-    raw_specs['raw_lux'] = int(extract_lux_raw(text))
+    Args:
+        texts: pandas Series（清洗后的商品标题）
+
+    Returns:
+        (N × 7) float64 矩阵，列顺序为 SPEC_FEATURES
+    """
+    return _spec_matrix(*_raw_spec_arrays(texts))
+
+
+def _spec_matrix(kelvin_min, kelvin_max, cri, wattage, lumens, lux):
+    """原始规格数组 → (N × 7) 归一化规格矩阵，列顺序为 SPEC_FEATURES"""
+    kelvin_range = np.where((kelvin_max > kelvin_min) & (kelvin_min > 0),
+                            (kelvin_max - kelvin_min) / 8000.0, 0.0)
+    return np.column_stack([
+        kelvin_min / 10000.0,
+        kelvin_max / 10000.0,
+        kelvin_range,
+        cri / 100.0,
+        np.minimum(wattage / 300.0, 1.0),
+        np.minimum(lumens / 50000.0, 1.0),
+        np.minimum(lux / 20000.0, 1.0),
+    ])
+
+
+def extract_raw_specs_columns(texts):
+    """
+    整列提取原始规格值，结果与逐条 extract_raw_specs 一致
 
-    return raw_specs
+    Args:
+        texts: pandas Series（清洗后的商品标题）
+
+    Returns:
+        {列名: int64 数组} 字典，列顺序为 RAW_SPEC_COLUMNS
+    """
+    kelvin_min, kelvin_max, cri, wattage, lumens, lux = _raw_spec_arrays(texts)
+    values = [kelvin_min, kelvin_max, cri, wattage, lumens, lux]
+    return {col: v.astype(np.int64) for col, v in zip(RAW_SPEC_COLUMNS, values)}
+
+
+def extract_spec_values_columns(texts):
+    """
+    整列一次扫描同时得到原始值与归一化值（两阶段合并输出使用）
+
+    Args:
+        texts: pandas Series（清洗后的商品标题）
+
+    Returns:
+        (raw_specs, spec_matrix): extract_raw_specs_columns 与 extract_specs_columns 的结果
+    """
+    values = _raw_spec_arrays(texts)
+    raw_specs = {col: v.astype(np.int64) for col, v in zip(RAW_SPEC_COLUMNS, values)}
+    return raw_specs, _spec_matrix(*values)
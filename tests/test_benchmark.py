@@ -0,0 +1,78 @@
+"""
+性能基准模块单元测试
+"""
+import unittest
+import sys
+import os
+import json
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.benchmark import benchmark_layers, compare_results, find_regressions, generate_titles
+from src.classifier import GlobalLightClassifier
+
+
+class TestGenerateTitles(unittest.TestCase):
+    """测试合成标题生成器"""
+
+    @classmethod
+    def setUpClass(cls):
+        with open('config/signals.json', 'r', encoding='utf-8') as f:
+            cls.signals = json.load(f)
+        with open('config/hard_filters.json', 'r', encoding='utf-8') as f:
+            cls.accessories = json.load(f)['accessories']
+
+    def test_deterministic(self):
+        """测试同一种子生成结果相同，不同种子不同"""
+        a = generate_titles(self.signals, self.accessories, 200, seed=1)
+        b = generate_titles(self.signals, self.accessories, 200, seed=1)
+        c = generate_titles(self.signals, self.accessories, 200, seed=2)
+        self.assertTrue(a.equals(b))
+        self.assertFalse(a['SKU标题'].equals(c['SKU标题']))
+
+    def test_vocabulary_and_sites(self):
+        """测试标题包含信号词、站点只取 JP/US/CN"""
+        df = generate_titles(self.signals, self.accessories, 500, seed=0)
+        self.assertEqual(len(df), 500)
+        self.assertTrue(set(df['site']) <= {'JP', 'US', 'CN'})
+
+        classifier = GlobalLightClassifier('config/signals.json', 'config/scoring_models.json',
+                                           'config/hard_filters.json')
+        result = classifier.process(df, mode='columnar')
+        has_signal = result['features_bool'].map(lambda fv: any(v == 1.0 for v in fv.values()))
+        self.assertGreater(has_signal.mean(), 0.9)
+        self.assertGreater(result['decision_reason'].str.startswith('Accessory Kill').sum(), 0)
+
+
+class TestBenchmarks(unittest.TestCase):
+    """测试逐层基准与基线对比"""
+
+    def test_layer_benchmarks(self):
+        """测试逐层基准覆盖五层的逐条与整列实现"""
+        with open('config/signals.json', 'r', encoding='utf-8') as f:
+            signals = json.load(f)
+        classifier = GlobalLightClassifier('config/signals.json', 'config/scoring_models.json',
+                                           'config/hard_filters.json')
+        df = generate_titles(signals, classifier.hard_filters['accessories'], 100)
+        results = benchmark_layers(classifier, df, repeat=1)
+        for layer in ['normalize_text', 'extract_signals', 'extract_specs', 'calculate_scores',
+                      'arbitrate']:
+            self.assertEqual(results[f'layer/{layer}']['rows'], 100)
+        self.assertIn('batch/arbitrate', results)
+        self.assertTrue(all(r['rows_per_sec'] > 0 for r in results.values()))
+
+    def test_regression_detection(self):
+        """测试只比较共有项，吞吐量低于容忍度时判为回退"""
+        baseline = {'results': {'a': {'rows_per_sec': 1000.0}, 'b': {'rows_per_sec': 1000.0},
+                                'old': {'rows_per_sec': 1.0}}}
+        current = {'results': {'a': {'rows_per_sec': 850.0}, 'b': {'rows_per_sec': 700.0},
+                               'new': {'rows_per_sec': 1.0}}}
+        comparison = compare_results(current, baseline)
+        self.assertEqual([row[0] for row in comparison], ['a', 'b'])
+        self.assertEqual([row[0] for row in find_regressions(comparison, 0.2)], ['b'])
+        self.assertEqual(find_regressions(comparison, 0.4), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+标题级缓存单元测试
+"""
+import unittest
+import sys
+import os
+
+import pandas as pd
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.cache import LRUCache
+from src.classifier import GlobalLightClassifier
+
+
+class TestLRUCache(unittest.TestCase):
+    """测试LRU淘汰与命中计数"""
+
+    def test_eviction_order(self):
+        """测试淘汰最久未使用的条目"""
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.info(), {'hits': 3, 'misses': 1, 'size': 2, 'maxsize': 2})
+
+    def test_disabled(self):
+        """测试 maxsize=0 时不缓存"""
+        cache = LRUCache(0)
+        cache.put('a', 1)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+
+class TestClassifierCache(unittest.TestCase):
+    """测试缓存不改变分类结果"""
+
+    def test_cached_results_match(self):
+        """测试启用缓存后逐行结果与不缓存一致，重复标题命中缓存"""
+        df = pd.DataFrame({
+            'SKU标题': ['NiceVeedi Ring Light リングライト', 'Godox Speedlite TTL',
+                      'NiceVeedi Ring Light リングライト', 'NiceVeedi Ring Light リングライト'],
+            'site': ['JP', 'US', 'JP', 'US'],
+        })
+        plain = GlobalLightClassifier('config/signals.json', 'config/scoring_models.json',
+                                      'config/hard_filters.json')
+        cached = GlobalLightClassifier('config/signals.json', 'config/scoring_models.json',
+                                       'config/hard_filters.json', cache_size=100)
+
+        for stage in (1, 2):
+            pd.testing.assert_frame_equal(cached.process(df, stage=stage), plain.process(df, stage=stage))
+
+        info = cached.cache_info()
+        self.assertEqual(info['size'], 3)
+        self.assertEqual(info['hits'], 5)
+        self.assertEqual(info['misses'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,10 +7,14 @@ import sys
 import os
 import json
 
+import numpy as np
+import pandas as pd
+
 # 添加父目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.classifier import GlobalLightClassifier
+from src.classifier import SHORTCUTS, GlobalLightClassifier, shortcut_kind
+from src.utils import normalize_text
 
 
 class TestLightClassifier(unittest.TestCase):
@@ -146,5 +150,234 @@ class TestLightClassifier(unittest.TestCase):
                             f"测试通过率过低: {passed*100//total}% < 80%")
 
 
+class TestColumnarProcess(unittest.TestCase):
+    """整列批量模式与逐行模式结果一致性测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.classifier = GlobalLightClassifier(
+            'config/signals.json',
+            'config/scoring_models.json',
+            'config/hard_filters.json'
+        )
+        with open('tests/test_cases.json', 'r', encoding='utf-8') as f:
+            cases = json.load(f)['test_cases']
+        rows = [{'SKU标题': case['sku_title'], 'site': case['site'], '产品URL': f'url-{i}'}
+                for i, case in enumerate(cases)]
+        rows += [
+            {'SKU标题': 'Ｇｏｄｏｘ ＡＤ２００ 3000k-6500k CRI 97 200W softbox', 'site': 'jp', '产品URL': 'a'},
+            {'SKU标题': '2500 - 8500k cob 12,500lm ring light', 'site': 'CN', '产品URL': 'b'},
+            {'SKU标题': float('nan'), 'site': 'US', '产品URL': 'c'},
+            {'SKU标题': 'Inflatable balloon light 5000 lux cri 95-97', 'site': 'DE', '产品URL': 'd'},
+        ]
+        cls.df = pd.DataFrame(rows)
+
+    def test_stage2_matches_row_mode(self):
+        """测试Stage2整列输出与逐行输出一致"""
+        expected = self.classifier.process(self.df, stage=2)
+        actual = self.classifier.process(self.df, stage=2, mode='columnar')
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_stage1_matches_row_mode(self):
+        """测试Stage1整列输出与逐行输出一致"""
+        expected = self.classifier.process(self.df, stage=1)
+        actual = self.classifier.process(self.df, stage=1, mode='columnar')
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_progress_blocks(self):
+        """测试提供进度回调时按唯一标题分块处理：进度逐块递增至总行数，结果与不分块一致"""
+        import src.classifier as classifier_module
+        block = classifier_module.PROGRESS_BLOCK
+        classifier_module.PROGRESS_BLOCK = 7
+        try:
+            for stage in [1, 2, 'both']:
+                calls = []
+                actual = self.classifier.process(self.df, stage=stage, mode='columnar',
+                                                 progress_callback=lambda current, total: calls.append(current))
+                pd.testing.assert_frame_equal(actual, self.classifier.process(self.df, stage=stage, mode='columnar'))
+                self.assertGreater(len(calls), 2)
+                self.assertEqual(calls, sorted(calls))
+                self.assertEqual(calls[-1], len(self.df))
+        finally:
+            classifier_module.PROGRESS_BLOCK = block
+
+    def test_integer_score_matches_baseline(self):
+        """测试无权重、整数基础分的品类得分为 int：裁决原因与 scores_all 与原逐条实现一致"""
+        df = pd.DataFrame({'SKU标题': ['视频灯 @ pano 运动摄影 underwater light 5600K'], 'site': ['jp']})
+        for mode in ['row', 'columnar']:
+            result = self.classifier.process(df, stage=2, mode=mode)
+            self.assertEqual(result.at[0, 'decision_reason'], 'Low Score: 0 < 30')
+            self.assertEqual(repr(result.at[0, 'scores_all']['灯光类-其他']), '0')
+            self.assertIn('"灯光类-其他": 0}', json.dumps(result.at[0, 'scores_all'], ensure_ascii=False))
+        fv = self.classifier.extract_signals(normalize_text(df.at[0, 'SKU标题']), 'JP')
+        self.assertIs(type(self.classifier.calculate_scores(fv)['灯光类-其他']), int)
+
+    def test_stage_both(self):
+        """测试两阶段合并输出：整列与逐行一致，且分别包含两个阶段的完整列"""
+        both = self.classifier.process(self.df, stage='both', mode='columnar')
+        pd.testing.assert_frame_equal(both, self.classifier.process(self.df, stage='both'))
+        for stage in [1, 2]:
+            expected = self.classifier.process(self.df, stage=stage, mode='columnar')
+            pd.testing.assert_frame_equal(both[expected.columns], expected)
+
+
+class TestTagMasks(unittest.TestCase):
+    """测试标签位掩码表示"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.classifier = GlobalLightClassifier(
+            'config/signals.json',
+            'config/scoring_models.json',
+            'config/hard_filters.json'
+        )
+
+    def test_mask_roundtrip(self):
+        """测试位掩码与特征字典互相转换一致"""
+        text = 'neewer ring light リングライト rgb 60w'
+        mask = self.classifier.extract_signal_mask(text, 'JP')
+        signals = self.classifier.extract_signals(text, 'JP')
+        self.assertEqual(self.classifier.mask_to_signals(mask), signals)
+        self.assertEqual(self.classifier.signals_to_mask(signals), mask)
+        self.assertTrue(mask & self.classifier.tag_bits['tag_is_ring'])
+
+    def test_batch_masks(self):
+        """测试整列位掩码与逐条一致，打包/展开互逆"""
+        texts = ['ring light', 'cob video light 5600k', '', 'inflatable light']
+        countries = np.array(['US', 'JP', 'US', 'CN'])
+        masks = self.classifier.extract_signal_masks_batch(texts, countries)
+        self.assertEqual(masks.dtype, self.classifier.tag_mask_dtype)
+        self.assertEqual(masks.tolist(), [self.classifier.extract_signal_mask(t, c)
+                                          for t, c in zip(texts, countries)])
+        matrix = self.classifier.unpack_tag_masks(masks)
+        self.assertEqual(self.classifier.pack_tag_matrix(matrix).tolist(), masks.tolist())
+
+    def test_form_lock_by_mask(self):
+        """测试形态锁定按位掩码判断，与特征字典判断一致"""
+        fv = self.classifier.extract_signals('inflatable light', 'US')
+        scores = {category: 0.0 for category in self.classifier.scoring_engine.categories}
+        expected = ('充气灯', 'Form Lock: tag_is_inflatable')
+        self.assertEqual(self.classifier.arbitrate(scores, fv, 'inflatable light'), expected)
+        mask = self.classifier.signals_to_mask(fv)
+        self.assertEqual(self.classifier.arbitrate(scores, {}, 'inflatable light', tag_mask=mask), expected)
+
+
+class TestAccessoryMatcher(unittest.TestCase):
+    """测试预编译配件匹配器与逐个子串判断一致"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.classifier = GlobalLightClassifier(
+            'config/signals.json',
+            'config/scoring_models.json',
+            'config/hard_filters.json'
+        )
+
+    def test_first_hit_in_config_order(self):
+        """测试多个配件同时命中时取配置中靠前的配件，整列与逐条结果一致"""
+        accessories = self.classifier.hard_filters['accessories']
+        titles = ['ring light', '',
+                  f'led {accessories[-1].upper()} with {accessories[0]}',
+                  f'{accessories[3]} {accessories[1]} panel',
+                  f'{accessories[2]}{accessories[5]}']
+        scores = {category: 50.0 for category in self.classifier.scoring_engine.categories}
+
+        hits = self.classifier.accessory_hits_batch(titles)
+        for i, title in enumerate(titles):
+            expected = [acc.lower() in title.lower() for acc in accessories]
+            self.assertEqual(hits[i].tolist(), expected)
+
+            first = next((acc for acc in accessories if acc.lower() in title.lower()), None)
+            category, reason = self.classifier.arbitrate(scores, {}, title)
+            if first is None:
+                self.assertFalse(reason.startswith('Accessory Kill'))
+            else:
+                self.assertEqual((category, reason), ('灯光类-其他', f'Accessory Kill: {first}'))
+
+        X = np.zeros((len(titles), len(self.classifier.scoring_engine.features)))
+        score_matrix = np.full((len(titles), len(scores)), 50.0)
+        _, reasons = self.classifier.arbitrate_batch(score_matrix, X, titles)
+        self.assertEqual(reasons.tolist(),
+                         [self.classifier.arbitrate(scores, {}, t)[1] for t in titles])
+
+
+class TestLazyEvaluation(unittest.TestCase):
+    """测试惰性求值：预测品类与完整计算一致，只有走捷径的行使用上下界裁决原因、得分与规格为空"""
+
+    @classmethod
+    def setUpClass(cls):
+        paths = ('config/signals.json', 'config/scoring_models.json', 'config/hard_filters.json')
+        cls.full = GlobalLightClassifier(*paths)
+        cls.lazy = GlobalLightClassifier(*paths, lazy=True)
+        with open('tests/test_cases.json', 'r', encoding='utf-8') as f:
+            cases = json.load(f)['test_cases']
+        rows = [(case['sku_title'], case['site']) for case in cases] + [
+            # 配件拦截 / 形态锁定
+            ('Softbox Diffuser for Photography Light', 'US'), ('neewer ring light 18 inch', 'US'),
+            ('inflatable light', 'US'),
+            # 按得分上下界即可确定：高分 / 低分
+            ('Godox AD200 Pro 200W TTL', 'US'), ('rgb tube light wand', 'US'),
+            ('wand ｃｒｉ９６ 200W フラッシュライト video light Light 97cri', 'jp'),
+            ('ライト ライトスティック 3200k/6000k 200W フラッシュ compact パノ', 'JP'),
+            # 需要规格与完整评分
+            ('cob video light 5600k 60w', 'US'), ('led panel light 3200k-5600k cri 96', 'US'),
+            ('视频灯 @ pano 运动摄影 underwater light 5600K', 'jp'), (float('nan'), 'US'),
+        ]
+        cls.df = pd.DataFrame(rows * 2, columns=['SKU标题', 'site'])
+        cls.expected = cls.full.process(cls.df, stage=2, mode='columnar')
+
+    def test_matches_full_evaluation(self):
+        """测试整列与逐行惰性求值的预测品类与完整计算一致，未走捷径的行裁决原因也一致"""
+        columnar = self.lazy.process(self.df, stage=2, mode='columnar')
+        self.assertEqual(columnar['predicted_category'].tolist(), self.expected['predicted_category'].tolist())
+        kinds = columnar['decision_reason'].map(shortcut_kind)
+        full_rows = kinds.isna()
+        self.assertEqual(columnar.loc[full_rows, 'decision_reason'].tolist(),
+                         self.expected.loc[full_rows, 'decision_reason'].tolist())
+        self.assertEqual(set(kinds.dropna()), set(SHORTCUTS))
+
+        rows = self.lazy.process(self.df, stage=2)
+        self.assertEqual(rows['predicted_category'].tolist(), columnar['predicted_category'].tolist())
+        self.assertEqual(rows['decision_reason'].tolist(), columnar['decision_reason'].tolist())
+
+    def test_shortcut_rows(self):
+        """
+        测试上下界裁决原因与空得分只出现在走捷径的行：捷径行的预测品类与完整计算一致，
+        上下界裁决的行在完整计算中同为高分/低分裁决，其余行的得分与非惰性结果相同
+        """
+        bound = ('Low Score: <=', ' (>=')
+        self.assertFalse(any(marker in reason for reason in self.expected['decision_reason'] for marker in bound))
+        for mode in ['row', 'columnar']:
+            result = self.lazy.process(self.df, stage=2, mode=mode)
+            kinds = result['decision_reason'].map(shortcut_kind)
+            shortcut = kinds.notna().to_numpy()
+            self.assertTrue(shortcut.any() and not shortcut.all())
+
+            for reason, kind, expected_reason in zip(result['decision_reason'], kinds,
+                                                     self.expected['decision_reason']):
+                is_bound = any(marker in reason for marker in bound)
+                self.assertEqual(is_bound, kind == 'Score Bound', reason)
+                if is_bound:
+                    self.assertEqual(reason.split(':', 1)[0], expected_reason.split(':', 1)[0])
+                elif kind is not None:
+                    self.assertEqual(reason, expected_reason)
+
+            self.assertEqual(result['predicted_category'][shortcut].tolist(),
+                             self.expected['predicted_category'][shortcut].tolist())
+            scores = pd.DataFrame(list(result['scores_all']))
+            specs = pd.DataFrame(list(result['features_num']))
+            self.assertEqual(scores.isna().all(axis=1).tolist(), shortcut.tolist())
+            self.assertEqual(scores.isna().any(axis=1).tolist(), shortcut.tolist())
+            self.assertTrue(specs[shortcut].isna().all().all())
+            self.assertTrue(specs[~shortcut].notna().all().all())
+            self.assertEqual(result['scores_all'][~shortcut].tolist(),
+                             self.expected['scores_all'][~shortcut].tolist())
+
+    def test_incompatible_options(self):
+        """测试惰性求值不能与特征快照一同使用"""
+        with self.assertRaises(ValueError):
+            self.lazy.process(self.df.iloc[:10], stage=2, mode='columnar', return_features=True)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,76 @@
+"""
+评估模块单元测试
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.evaluation import compare_reports, evaluate, reason_kinds
+
+
+class TestEvaluate(unittest.TestCase):
+    """测试混淆矩阵、精确率/召回率、GMV 加权准确率与裁决原因分组"""
+
+    def setUp(self):
+        self.actual = pd.Series(['平板灯', '平板灯', '环形灯', ' 环形灯', None, '', '灯光配件', '闪光灯'])
+        self.predicted = ['平板灯', '环形灯', '环形灯', '环形灯', '平板灯', '平板灯', '灯光类-其他', '闪光灯']
+        self.reasons = ['High Score: 平板灯 (187.0)', 'Form Lock: tag_is_ring', 'Form Lock: tag_is_ring',
+                        'High Score: 环形灯 (90.0)', 'High Score: 平板灯 (80.0)', 'Low Score: 12.0 < 30',
+                        'Accessory Kill: softbox', 'Low Score: 20.5 < 30']
+        self.gmv = [100, 300, 50, 50, 999, 999, 'n/a', 500]
+        self.categories = ['平板灯', '环形灯', '闪光灯', '灯光类-其他']
+
+    def test_metrics(self):
+        """测试各项指标与手算结果一致，未标注行不计入"""
+        report = evaluate(self.actual, self.predicted, self.reasons, self.gmv, self.categories)
+        self.assertEqual((report['rows'], report['labelled'], report['unlabelled']), (8, 6, 2))
+        self.assertEqual(report['categories'], self.categories + ['灯光配件'])
+        self.assertAlmostEqual(report['accuracy'], 4 / 6)
+        self.assertEqual(report['confusion'], [[1, 1, 0, 0, 0],
+                                               [0, 2, 0, 0, 0],
+                                               [0, 0, 1, 0, 0],
+                                               [0, 0, 0, 0, 0],
+                                               [0, 0, 0, 1, 0]])
+
+        per_category = report['per_category']
+        self.assertAlmostEqual(per_category['平板灯']['precision'], 1.0)
+        self.assertAlmostEqual(per_category['平板灯']['recall'], 0.5)
+        self.assertAlmostEqual(per_category['环形灯']['precision'], 2 / 3)
+        self.assertAlmostEqual(per_category['环形灯']['f1'], 0.8)
+        self.assertEqual(per_category['灯光类-其他']['precision'], 0.0)
+
+        # GMV：无法解析的值按0计
+        self.assertAlmostEqual(report['gmv_total'], 1000.0)
+        self.assertAlmostEqual(report['gmv_accuracy'], 700 / 1000)
+        self.assertAlmostEqual(per_category['平板灯']['gmv_recall'], 0.25)
+
+        self.assertEqual(list(report['reasons']), ['Accessory Kill', 'Form Lock', 'Low Score', 'High Score'])
+        self.assertEqual(report['reasons']['Form Lock']['rows'], 2)
+        self.assertAlmostEqual(report['reasons']['Form Lock']['accuracy'], 0.5)
+        self.assertEqual(report['top_confusions'][0]['rows'], 1)
+
+    def test_reason_kinds(self):
+        """测试裁决原因类别提取"""
+        kinds = reason_kinds(['High Score: 平板灯 (1.0)', np.nan, 'Accessory Kill: a:b'])
+        self.assertEqual(kinds.tolist(), ['High Score', None, 'Accessory Kill'])
+
+    def test_compare_reports(self):
+        """测试与基线报告对比"""
+        baseline = evaluate(self.actual, self.predicted, categories=self.categories)
+        improved = list(self.predicted)
+        improved[1] = '平板灯'
+        current = evaluate(self.actual, improved, categories=self.categories)
+        deltas = {name: delta for name, _, _, delta in compare_reports(current, baseline)}
+        self.assertAlmostEqual(deltas['accuracy'], 1 / 6)
+        self.assertAlmostEqual(deltas['平板灯/recall'], 0.5)
+        self.assertNotIn('gmv_accuracy', deltas)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+特征快照与增量重评分单元测试
+"""
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+import pandas as pd
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.classifier import GlobalLightClassifier
+from src.features import FeatureSet, FeatureWriter, rescore
+
+
+def _make_classifier(config_dir='config'):
+    return GlobalLightClassifier(os.path.join(config_dir, 'signals.json'),
+                                 os.path.join(config_dir, 'scoring_models.json'),
+                                 os.path.join(config_dir, 'hard_filters.json'))
+
+
+class TestRescore(unittest.TestCase):
+    """测试特征快照重评分与完整分类一致"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.df = pd.DataFrame({
+            'SKU标题': ['NiceVeedi Ring Light リングライト', 'Godox Speedlite TTL',
+                      'LED パネルライト 5600K CRI95 60W', 'tripod stand', 'Godox Speedlite TTL'],
+            'site': ['JP', 'US', 'JP', 'US', 'US'],
+            '产品URL': ['u1', 'u2', 'u3', 'u4', 'u5'],
+        })
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _save(self, classifier, batches):
+        path = os.path.join(self.tmp, 'features')
+        with FeatureWriter(path, classifier) as writer:
+            for df in batches:
+                _, features = classifier.process(df, mode='columnar', return_features=True)
+                writer.write(features)
+        return FeatureSet(path)
+
+    def test_rescore_matches_process(self):
+        """测试分批保存的快照重评分后输出文件与直接分类一致"""
+        classifier = _make_classifier()
+        feature_set = self._save(classifier, [self.df.iloc[:2], self.df.iloc[2:]])
+        self.assertEqual(len(feature_set), 5)
+
+        expected_path = os.path.join(self.tmp, 'expected.csv')
+        classifier.process(self.df, mode='columnar').to_csv(expected_path, index=False,
+                                                             encoding='utf-8-sig')
+        output_path = os.path.join(self.tmp, 'rescored.csv')
+        self.assertEqual(rescore(classifier, feature_set, output_path, chunksize=2), 5)
+
+        with open(output_path, 'rb') as f, open(expected_path, 'rb') as g:
+            self.assertEqual(f.read(), g.read())
+
+    def test_rescore_with_new_scoring_config(self):
+        """测试修改评分模型与门限后，重评分结果与用新配置完整分类一致"""
+        feature_set = self._save(_make_classifier(), [self.df])
+
+        config_dir = os.path.join(self.tmp, 'config')
+        shutil.copytree('config', config_dir)
+        filters_path = os.path.join(config_dir, 'hard_filters.json')
+        with open(filters_path, 'r', encoding='utf-8') as f:
+            filters = json.load(f)
+        filters['min_score_threshold'] = 80
+        filters['accessories'] = list(reversed(filters['accessories']))
+        with open(filters_path, 'w', encoding='utf-8') as f:
+            json.dump(filters, f, ensure_ascii=False)
+
+        classifier = _make_classifier(config_dir)
+        expected = classifier.process(self.df, mode='columnar')
+        _, _, categories, reasons = classifier.rescore_features(feature_set)
+        index = feature_set.row_index
+        self.assertEqual(categories[index].tolist(), expected['predicted_category'].tolist())
+        self.assertEqual(reasons[index].tolist(), expected['decision_reason'].tolist())
+
+    def test_signals_change_rejected(self):
+        """测试信号词典变更后拒绝重评分"""
+        feature_set = self._save(_make_classifier(), [self.df])
+
+        config_dir = os.path.join(self.tmp, 'config')
+        shutil.copytree('config', config_dir)
+        signals_path = os.path.join(config_dir, 'signals.json')
+        with open(signals_path, 'a', encoding='utf-8') as f:
+            f.write('\n')
+
+        with self.assertRaises(ValueError):
+            _make_classifier(config_dir).rescore_features(feature_set)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+关键词匹配器单元测试
+"""
+import unittest
+import sys
+import os
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.matcher import KeywordMatcher
+from src.classifier import GlobalLightClassifier
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    """测试多模式关键词匹配器"""
+
+    def test_single_scan_all_hits(self):
+        """测试一次扫描返回全部标签命中"""
+        matcher = KeywordMatcher([('flash', 1), ('ttl', 2), ('panel', 4)])
+        self.assertEqual(matcher.match('godox flash ttl hss'), 3)
+        self.assertEqual(matcher.match('led light'), 0)
+
+    def test_prefix_keywords(self):
+        """测试同一起点的前缀关键词同时命中（flashlight 包含 flash）"""
+        matcher = KeywordMatcher([('flash', 1), ('flashlight', 2)])
+        self.assertEqual(matcher.match('underwater flashlight'), 3)
+        self.assertEqual(matcher.match('camera flash'), 1)
+
+    def test_overlapping_keywords(self):
+        """测试相互重叠的关键词"""
+        matcher = KeywordMatcher([('ring light', 1), ('light stand', 2)])
+        self.assertEqual(matcher.match('ring light stand'), 3)
+
+    def test_japanese_keywords(self):
+        """测试日文关键词"""
+        matcher = KeywordMatcher([('リングライト', 1), ('ライト', 2)])
+        self.assertEqual(matcher.match('ledリングライト'), 3)
+
+    def test_word_boundary(self):
+        """测试短英文关键词的词边界匹配"""
+        matcher = KeywordMatcher([('pad', 1), ('ring', 2), ('ring light', 4)],
+                                 word_boundary_max_len=4)
+        self.assertEqual(matcher.match('ipad stand'), 0)
+        self.assertEqual(matcher.match('pad light'), 1)
+        self.assertEqual(matcher.match('earring'), 0)
+        self.assertEqual(matcher.match('ringライト'), 2)
+        # 较长的关键词仍按子串匹配
+        self.assertEqual(matcher.match('ring light'), 6)
+
+    def test_substring_default(self):
+        """测试默认子串匹配语义"""
+        matcher = KeywordMatcher([('pad', 1)])
+        self.assertEqual(matcher.match('ipad stand'), 1)
+
+
+class TestExtractSignals(unittest.TestCase):
+    """测试分类器信号提取与逐关键词扫描结果一致"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.classifier = GlobalLightClassifier(
+            'config/signals.json',
+            'config/scoring_models.json',
+            'config/hard_filters.json'
+        )
+
+    def reference_signals(self, text, country):
+        signals = {}
+        for tag, lang_map in self.classifier.signals.items():
+            keywords = lang_map.get(country, []) + lang_map.get('US', [])
+            signals[tag] = float(any(kw in text for kw in keywords))
+        return signals
+
+    def test_matches_reference(self):
+        """测试与 kw in text 的逐关键词扫描结果一致"""
+        titles = [
+            'godox ad300pro 300w speedlite ストロボ ttl hss',
+            'underwater flashlight for diving photography',
+            'niceveedi ring light 10inch with phone stand リングライト',
+            'amaran pano 120c kit 120w rgbww パネルライト',
+            'portable phone clip led fill light',
+            '',
+        ]
+        for title in titles:
+            for country in ['US', 'JP', 'CN', 'DE']:
+                self.assertEqual(self.classifier.extract_signals(title, country),
+                                 self.reference_signals(title, country))
+
+
+if __name__ == '__main__':
+    unittest.main()
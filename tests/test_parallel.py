@@ -0,0 +1,61 @@
+"""
+多进程并行分类单元测试
+"""
+import unittest
+import sys
+import os
+
+import pandas as pd
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.classifier import GlobalLightClassifier
+from src.parallel import split_balanced, process_parallel
+
+
+class TestSplitBalanced(unittest.TestCase):
+    """测试按标题长度均衡切块"""
+
+    def test_chunks_keep_order(self):
+        """测试切块连续且覆盖全部行"""
+        df = pd.DataFrame({'SKU标题': ['x' * (i % 7 * 40) for i in range(100)]})
+        chunks = split_balanced(df, 8)
+        self.assertEqual(pd.concat(chunks).index.tolist(), list(range(100)))
+
+    def test_long_titles_get_smaller_chunks(self):
+        """测试长标题所在块行数更少"""
+        df = pd.DataFrame({'SKU标题': ['x' * 500] * 10 + ['y'] * 90})
+        chunks = split_balanced(df, 2)
+        self.assertEqual(len(chunks), 2)
+        self.assertLess(len(chunks[0]), len(chunks[1]))
+
+    def test_empty(self):
+        """测试空数据"""
+        self.assertEqual(split_balanced(pd.DataFrame({'SKU标题': []}), 4), [])
+
+
+class TestProcessParallel(unittest.TestCase):
+    """测试多进程结果与单进程一致"""
+
+    def test_matches_single_process(self):
+        """测试多进程输出行序与内容一致"""
+        classifier = GlobalLightClassifier(
+            'config/signals.json',
+            'config/scoring_models.json',
+            'config/hard_filters.json'
+        )
+        df = pd.DataFrame({
+            'SKU标题': ['Godox AD300Pro 300W Speedlite ストロボ TTL HSS',
+                      'NiceVeedi Ring Light 10inch リングライト',
+                      'Softbox Diffuser for Photography Light',
+                      'Aputure MT Pro Tube Light 60cm RGBWW チューブライト'] * 10,
+            'site': ['JP', 'JP', 'US', 'JP'] * 10,
+        })
+        expected = classifier.process(df, mode='columnar')
+        actual = process_parallel(classifier, df, workers=2, chunks_per_worker=3)
+        pd.testing.assert_frame_equal(actual, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
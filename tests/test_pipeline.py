@@ -0,0 +1,236 @@
+"""
+流式处理单元测试
+"""
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.classifier import INPUT_COLUMNS, GlobalLightClassifier
+from src.pipeline import (CsvChunkWriter, ParquetChunkWriter, RunningStats, excel_sidecar,
+                          iter_input_chunks, read_input, resolve_output_path)
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+class TestCsvChunkWriter(unittest.TestCase):
+    """测试分块追加写出"""
+
+    def test_header_and_bom_written_once(self):
+        """测试表头与BOM只写一次，分块结果与整体写出一致"""
+        df = pd.DataFrame({'SKU标题': ['リングライト', 'cob light', 'パネル'], 'site': ['JP', 'US', 'JP']})
+        with tempfile.TemporaryDirectory() as tmp:
+            chunked = os.path.join(tmp, 'chunked.csv')
+            whole = os.path.join(tmp, 'whole.csv')
+            writer = CsvChunkWriter(chunked)
+            writer.write(df.iloc[:2])
+            writer.write(df.iloc[2:])
+            df.to_csv(whole, index=False, encoding='utf-8-sig')
+
+            with open(chunked, 'rb') as f, open(whole, 'rb') as g:
+                self.assertEqual(f.read(), g.read())
+            self.assertEqual(writer.rows_written, 3)
+
+    def test_iter_input_chunks(self):
+        """测试分块读取与采样"""
+        df = pd.DataFrame({'SKU标题': [f'light {i}' for i in range(10)]})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'input.csv')
+            df.to_csv(path, index=False)
+            sizes = [len(chunk) for chunk in iter_input_chunks(path, 4)]
+            self.assertEqual(sizes, [4, 4, 2])
+            sizes = [len(chunk) for chunk in iter_input_chunks(path, 4, sample=5)]
+            self.assertEqual(sizes, [4, 1])
+
+
+@unittest.skipIf(pq is None, '未安装 pyarrow')
+class TestParquetChunkWriter(unittest.TestCase):
+    """测试定类型 Parquet 输出"""
+
+    def setUp(self):
+        self.classifier = GlobalLightClassifier('config/signals.json', 'config/scoring_models.json',
+                                                'config/hard_filters.json')
+        self.df = pd.DataFrame({
+            'SKU标题': ['NiceVeedi Ring Light リングライト', 'Godox Speedlite TTL',
+                      'LED パネルライト 5600K CRI95 60W', 'tripod stand'],
+            'site': ['JP', 'US', 'JP', 'US'],
+        })
+
+    def test_typed_columns_match_dict_columns(self):
+        """测试定类型列与字典列取值一致，分块写出后类型正确"""
+        plain = self.classifier.process(self.df, mode='columnar')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'output.parquet')
+            writer = ParquetChunkWriter(path)
+            writer.write(self.classifier.process(self.df.iloc[:1], mode='columnar', typed=True))
+            writer.write(self.classifier.process(self.df.iloc[1:], mode='columnar', typed=True))
+            writer.close()
+            self.assertEqual(writer.rows_written, 4)
+
+            table = pq.read_table(path)
+            self.assertEqual(str(table.schema.field('site').type.value_type), 'string')
+            self.assertEqual(str(table.schema.field('predicted_category').type.index_type), 'int32')
+            self.assertEqual(str(table.schema.field('score_环形灯').type), 'float')
+            self.assertEqual(str(table.schema.field('tag_is_ring').type), 'uint8')
+            self.assertEqual(str(table.schema.field('f_cri').type), 'float')
+
+            typed = table.to_pandas()
+            self.assertEqual(typed['predicted_category'].astype(str).tolist(),
+                             plain['predicted_category'].tolist())
+            for i, row in plain.iterrows():
+                for category, score in row['scores_all'].items():
+                    self.assertEqual(typed.at[i, f'score_{category}'], np.float32(score))
+                for tag, value in row['features_bool'].items():
+                    self.assertEqual(typed.at[i, tag], value)
+
+    def test_partitioned(self):
+        """测试按站点分区写出"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'output')
+            writer = ParquetChunkWriter(path, partition_by='site')
+            writer.write(self.classifier.process(self.df.iloc[:2], mode='columnar', typed=True))
+            writer.write(self.classifier.process(self.df.iloc[2:], mode='columnar', typed=True))
+            writer.close()
+            self.assertEqual(sorted(os.listdir(path)), ['site=JP', 'site=US'])
+            self.assertEqual(len(pq.read_table(path)), 4)
+            with self.assertRaises(FileExistsError):
+                ParquetChunkWriter(path, partition_by='site')
+
+    def test_resolve_output_path(self):
+        """测试输出路径扩展名调整"""
+        self.assertEqual(resolve_output_path('out/a.csv', 'csv'), 'out/a.csv')
+        self.assertEqual(resolve_output_path('out/a.csv', 'parquet'), 'out/a.parquet')
+        self.assertEqual(resolve_output_path('out/a.csv', 'parquet', 'site'), 'out/a')
+
+
+class TestExcelInput(unittest.TestCase):
+    """测试 Excel 只读流式读取与 Parquet 旁路文件"""
+
+    def setUp(self):
+        from openpyxl import Workbook
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'input.xlsx')
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(['SKU标题', 'site', None, 'site', 'price'])
+        for i in range(23):
+            if i == 7:
+                sheet.append([])
+                continue
+            sheet.append([f'リングライト {i}', 'JP' if i % 2 else 'US', None, i, i * 1.5 if i % 5 else None])
+        sheet.append([])
+        sheet.append([])
+        workbook.save(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_read_excel(self):
+        """测试流式读取与 pd.read_excel 结果一致（表头、中间空行、末尾空行）"""
+        expected = pd.read_excel(self.path)
+        pd.testing.assert_frame_equal(read_input(self.path), expected)
+        chunks = list(iter_input_chunks(self.path, 5, sample=12))
+        self.assertEqual([len(c) for c in chunks], [5, 5, 2])
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected.head(12))
+
+    @unittest.skipIf(pq is None, '未安装 pyarrow')
+    def test_parquet_sidecar(self):
+        """测试旁路文件只转换一次，读取结果与原表一致，Excel 变更后对应新文件"""
+        cache_dir = os.path.join(self.tmp.name, 'cache')
+        sidecar = excel_sidecar(self.path, cache_dir, chunksize=4)
+        mtime = os.stat(sidecar).st_mtime_ns
+        self.assertEqual(excel_sidecar(self.path, cache_dir), sidecar)
+        self.assertEqual(os.stat(sidecar).st_mtime_ns, mtime)
+
+        expected = pd.read_excel(self.path)
+        actual = read_input(self.path, excel_cache=cache_dir)
+        pd.testing.assert_frame_equal(actual, expected)
+        self.assertEqual([len(c) for c in iter_input_chunks(self.path, 10, excel_cache=cache_dir)],
+                         [10, 10, 3])
+
+        from openpyxl import load_workbook
+        workbook = load_workbook(self.path)
+        workbook.active.append(['new row', 'JP'])
+        workbook.save(self.path)
+        self.assertNotEqual(excel_sidecar(self.path, cache_dir), sidecar)
+
+
+@unittest.skipIf(pq is None, '未安装 pyarrow')
+class TestProjectedInput(unittest.TestCase):
+    """测试按列投影的 Arrow CSV 读取"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.classifier = GlobalLightClassifier('config/signals.json', 'config/scoring_models.json',
+                                               'config/hard_filters.json')
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'input.csv')
+        titles = [f'リングライト {i}' for i in range(10)]
+        titles[3] = 'cob light\n5600K, CRI95'
+        titles[6] = 'NA'
+        df = pd.DataFrame({'GMV': np.arange(10) * 1.5, 'SKU标题': titles,
+                           'site': ['JP', 'US', 'jp', 'US', 'JP', 'CN', 'US', 'JP', 'DE', 'JP'],
+                           '产品URL': [f'url-{i}' if i % 3 else '' for i in range(10)],
+                           '类目': ['灯光类'] * 10})
+        df.to_csv(self.path, index=False, encoding='utf-8-sig')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_read_csv(self):
+        """测试只保留所需列，取值与 pd.read_csv 一致，site 为分类类型"""
+        expected = pd.read_csv(self.path, usecols=['SKU标题', 'site', '产品URL'])
+        actual = read_input(self.path, columns=INPUT_COLUMNS)
+        self.assertEqual(list(actual.columns), ['SKU标题', 'site', '产品URL'])
+        self.assertIsInstance(actual['site'].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(actual.astype(object), expected.astype(object))
+
+        chunks = list(iter_input_chunks(self.path, 4, sample=9, columns=INPUT_COLUMNS))
+        self.assertEqual([len(c) for c in chunks], [4, 4, 1])
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True).astype(object),
+                                      expected.head(9).astype(object))
+
+    def test_classification_unchanged(self):
+        """测试投影读取后的分类结果与读取全部列一致"""
+        full = pd.read_csv(self.path)
+        projected = read_input(self.path, columns=INPUT_COLUMNS)
+        for mode in ['row', 'columnar']:
+            pd.testing.assert_frame_equal(self.classifier.process(projected, mode=mode),
+                                          self.classifier.process(full, mode=mode))
+
+
+class TestRunningStats(unittest.TestCase):
+    """测试累加统计"""
+
+    def test_accumulates_across_chunks(self):
+        """测试多块累加与整体统计一致"""
+        df = pd.DataFrame({
+            'predicted_category': ['平板灯', '闪光灯', '平板灯', '环形灯'],
+            'tag_is_ring': [0.0, 0.0, 1.0, 1.0],
+            'raw_wattage': [0, 120, 60, 300],
+        })
+        stats = RunningStats()
+        stats.update(df.iloc[:2])
+        stats.update(df.iloc[2:])
+
+        self.assertEqual(stats.rows, 4)
+        self.assertEqual(dict(stats.categories), {'平板灯': 2, '闪光灯': 1, '环形灯': 1})
+        self.assertEqual(stats.tags['tag_is_ring'], 2)
+        self.assertEqual(stats.specs['raw_wattage'], [3, 60, 300])
+        self.assertEqual(stats.category_counts().index[0], '平板灯')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+分层剖析模块单元测试
+"""
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+import pandas as pd
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.classifier import GlobalLightClassifier
+from src.profiler import LAYERS, LayerProfiler
+
+
+class TestLayerProfiler(unittest.TestCase):
+    """测试剖析器累计与报告"""
+
+    def test_report(self):
+        """测试各层累计、other 为块耗时减去各层耗时"""
+        profiler = LayerProfiler()
+        with profiler.chunk(10):
+            profiler.add('extract_specs', 0.25, 10)
+            profiler.add('normalize_text', 0.5, 10)
+            profiler.add('normalize_text', 0.25, 10)
+        profiler.chunks[0]['seconds'] = 2.0
+
+        report = profiler.report()
+        self.assertEqual(list(report['layers']), ['normalize_text', 'extract_specs', 'other'])
+        self.assertEqual(report['layers']['normalize_text']['calls'], 2)
+        self.assertAlmostEqual(report['layers']['normalize_text']['us_per_row'], 0.75 / 20 * 1e6)
+        self.assertAlmostEqual(report['layers']['other']['seconds'], 1.0)
+        self.assertAlmostEqual(report['layers']['extract_specs']['share'], 0.125)
+
+    def test_trace_memory(self):
+        """测试开启 tracemalloc 时记录每块分配峰值"""
+        profiler = LayerProfiler(trace_memory=True)
+        with profiler.chunk(1):
+            data = [0] * 100000
+        del data
+        self.assertGreater(profiler.chunks[0]['alloc_peak_mb'], 0.5)
+
+
+class TestClassifierProfiling(unittest.TestCase):
+    """测试分类器开启剖析后记录五层耗时且结果不变"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.classifier = GlobalLightClassifier('config/signals.json', 'config/scoring_models.json',
+                                               'config/hard_filters.json')
+        cls.df = pd.DataFrame({'SKU标题': ['NiceVeedi Ring Light リングライト', 'Godox Speedlite TTL',
+                                         'LED パネルライト 5600K CRI95 60W'],
+                               'site': ['JP', 'US', 'JP']})
+
+    def tearDown(self):
+        self.classifier.profiler = None
+
+    def test_all_layers_recorded(self):
+        """测试逐行与整列模式都记录五层，结果与未剖析时一致"""
+        for mode in ['row', 'columnar']:
+            expected = self.classifier.process(self.df, mode=mode)
+            self.classifier.profiler = LayerProfiler()
+            result = self.classifier.process(self.df, mode=mode)
+            report = self.classifier.profiler.report()
+            self.classifier.profiler = None
+
+            pd.testing.assert_frame_equal(result, expected)
+            for layer in LAYERS:
+                self.assertGreater(report['layers'][layer]['rows'], 0, f'{mode}: {layer}')
+            self.assertEqual(report['rows'], 3)
+            self.assertEqual(len(report['chunks']), 1)
+
+    def test_save(self):
+        """测试剖析结果保存为 JSON"""
+        self.classifier.profiler = LayerProfiler()
+        self.classifier.process(self.df, mode='columnar', stage=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'profile.json')
+            self.classifier.profiler.save(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+        self.assertIn('extract_signals', report['layers'])
+        self.assertNotIn('calculate_scores', report['layers'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+版本化模型注册表单元测试
+"""
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+import threading
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.registry import ModelRegistry, list_versions
+
+
+TITLES = ['zzqx ring light 18 inch', 'Godox Speedlite TTL']
+SITES = ['US', 'US']
+
+
+def _publish(root, version, accessory=None, broken=False):
+    """发布一个配置版本：先写入临时目录再重命名；accessory 为追加的配件词"""
+    tmp = os.path.join(root, f'.tmp-{version}')
+    shutil.copytree('config', tmp)
+    path = os.path.join(tmp, 'hard_filters.json')
+    with open(path, 'r', encoding='utf-8') as f:
+        filters = json.load(f)
+    if accessory:
+        filters['accessories'].append(accessory)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{' if broken else json.dumps(filters, ensure_ascii=False))
+    os.rename(tmp, os.path.join(root, version))
+
+
+class TestModelRegistry(unittest.TestCase):
+    """测试版本加载、原子切换、结果版本标注与回滚"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        _publish(self.root, 'v1')
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_refresh_and_rollback(self):
+        """测试只加载名称最大的完整版本，结果带版本号，新版本生效后可回滚"""
+        os.makedirs(os.path.join(self.root, 'v0-incomplete'))
+        os.makedirs(os.path.join(self.root, '.tmp-v9'))
+        self.assertEqual(list_versions(self.root), ['v1'])
+
+        registry = ModelRegistry(self.root, keep=2)
+        self.assertEqual(registry.refresh().version, 'v1')
+        self.assertIsNone(registry.refresh())
+        before = registry.classify_titles(TITLES, SITES)
+        self.assertEqual([r['config_version'] for r in before], ['v1', 'v1'])
+        self.assertFalse(before[0]['decision_reason'].startswith('Accessory Kill'))
+
+        _publish(self.root, 'v2', accessory='zzqx')
+        self.assertEqual(registry.refresh().version, 'v2')
+        after = registry.classify_titles(TITLES, SITES)
+        self.assertEqual([r['config_version'] for r in after], ['v2', 'v2'])
+        self.assertEqual(after[0]['decision_reason'], 'Accessory Kill: zzqx')
+        self.assertEqual(after[1]['decision_reason'], before[1]['decision_reason'])
+
+        self.assertEqual(registry.rollback().version, 'v1')
+        self.assertEqual(registry.classify_titles(TITLES, SITES)[0]['decision_reason'],
+                         before[0]['decision_reason'])
+        # 回滚后不会自动切回已加载过的最新版本
+        self.assertIsNone(registry.refresh())
+        self.assertEqual(registry.active.version, 'v1')
+
+        _publish(self.root, 'v3')
+        registry.refresh()
+        self.assertEqual(registry.versions, ['v1', 'v3'])
+        with self.assertRaises(KeyError):
+            registry.activate('v2')
+
+    def test_in_flight_batch_keeps_version(self):
+        """测试切换时正在处理的批次在原版本上完成"""
+        registry = ModelRegistry(self.root)
+        old = registry.refresh()
+        started, release = threading.Event(), threading.Event()
+        classify = old.classifier.classify_titles
+
+        def blocking_classify(titles, sites):
+            started.set()
+            release.wait(5)
+            return classify(titles, sites)
+
+        old.classifier.classify_titles = blocking_classify
+        results = []
+        worker = threading.Thread(target=lambda: results.extend(registry.classify_titles(TITLES, SITES)))
+        worker.start()
+        self.assertTrue(started.wait(5))
+
+        _publish(self.root, 'v2', accessory='zzqx')
+        self.assertEqual(registry.refresh().version, 'v2')
+        self.assertEqual(registry.classify_titles(TITLES, SITES)[0]['config_version'], 'v2')
+        release.set()
+        worker.join(5)
+
+        self.assertEqual([r['config_version'] for r in results], ['v1', 'v1'])
+        self.assertFalse(results[0]['decision_reason'].startswith('Accessory Kill'))
+        self.assertEqual(old.records, 2)
+
+    def test_broken_version_not_activated(self):
+        """测试编译失败的版本不切换、记录错误且不重复尝试"""
+        registry = ModelRegistry(self.root)
+        registry.refresh()
+        _publish(self.root, 'v2', broken=True)
+        with self.assertRaises(ValueError):
+            registry.refresh()
+        self.assertEqual(registry.active.version, 'v1')
+        self.assertIn('v2', registry.info()['failed'])
+        self.assertIsNone(registry.refresh())
+
+    def test_in_place_config_dir(self):
+        """测试单个配置目录原地修改后按配置指纹生成新版本"""
+        config_dir = os.path.join(self.root, 'v1')
+        registry = ModelRegistry()
+        first = registry.load(config_dir)
+        self.assertEqual(first.version, first.config_hash[:12])
+        self.assertIsNone(registry.refresh())
+
+        path = os.path.join(config_dir, 'hard_filters.json')
+        with open(path, 'r', encoding='utf-8') as f:
+            filters = json.load(f)
+        filters['accessories'].append('zzqx')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(filters, f, ensure_ascii=False)
+        second = registry.refresh()
+        self.assertNotEqual(second.version, first.version)
+        self.assertEqual(registry.classify_titles(TITLES, SITES)[0]['config_version'], second.version)
+
+
+if __name__ == '__main__':
+    unittest.main()
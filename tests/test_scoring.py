@@ -0,0 +1,73 @@
+"""
+向量化评分引擎单元测试
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scoring import ScoringEngine
+
+
+class TestScoringEngine(unittest.TestCase):
+    """测试权重矩阵评分"""
+
+    def setUp(self):
+        self.models = {
+            'A': {'base_score': 50, 'weights': {'tag_x': 100, 'f_w': 30}},
+            'B': {'base_score': 40, 'weights': {'tag_y': 80, 'tag_x': -50}},
+            'C': {'base_score': 0, 'weights': {}},
+        }
+        self.engine = ScoringEngine(self.models, ['tag_x', 'tag_y'])
+
+    def test_compiled_matrix(self):
+        """测试权重矩阵与基础分向量"""
+        self.assertEqual(self.engine.features, ['tag_x', 'tag_y', 'f_w'])
+        np.testing.assert_array_equal(self.engine.base_scores, [50, 40, 0])
+        np.testing.assert_array_equal(self.engine.weights,
+                                      [[100, 0, 30], [-50, 80, 0], [0, 0, 0]])
+
+    def test_score_single(self):
+        """测试单条评分与逐项累加一致"""
+        scores = self.engine.score({'tag_x': 1.0, 'f_w': 0.4})
+        self.assertEqual(scores, {'A': 162.0, 'B': -10.0, 'C': 0})
+        # 没有权重项且基础分为整数的品类保持 int，与 round(0, 2) 一致
+        self.assertIs(type(scores['C']), int)
+        self.assertIs(type(scores['A']), float)
+
+    def test_integer_categories_restored(self):
+        """测试整批得分输出为列表时与单条评分的取值类型一致"""
+        X = np.array([[1.0, 0.0, 0.4], [0.0, 0.0, 0.0]])
+        top, winners, _, scores = self.engine.score_batch(X, return_all=True)
+        rows = self.engine.to_python(scores)
+        self.assertEqual([list(map(type, row)) for row in rows], [[float, float, int]] * 2)
+        self.assertEqual(rows[0], list(self.engine.score({'tag_x': 1.0, 'f_w': 0.4}).values()))
+        values = self.engine.top_values(np.array([0.0, 162.0]), np.array([2, 0]))
+        self.assertEqual([repr(v) for v in values], ['0', '162.0'])
+
+    def test_score_batch(self):
+        """测试批量评分：最高分、胜出品类、分差"""
+        X = np.array([[1.0, 0.0, 0.4],
+                      [0.0, 1.0, 0.0],
+                      [0.0, 0.0, 0.0]])
+        top, winners, margins, scores = self.engine.score_batch(X, return_all=True)
+        np.testing.assert_array_equal(winners, [0, 1, 0])
+        np.testing.assert_array_equal(top, [162.0, 120.0, 50.0])
+        np.testing.assert_array_equal(margins, [162.0, 70.0, 10.0])
+        self.assertEqual(scores.shape, (3, 3))
+
+    def test_tie_prefers_first_category(self):
+        """测试并列最高分时取配置中靠前的品类"""
+        engine = ScoringEngine({'A': {'base_score': 10, 'weights': {}},
+                                'B': {'base_score': 10, 'weights': {}}})
+        _, winners, margins = engine.score_batch(np.zeros((1, 0)))
+        self.assertEqual(winners[0], 0)
+        self.assertEqual(margins[0], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+常驻分类服务单元测试
+"""
+import unittest
+import sys
+import os
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.classifier import GlobalLightClassifier
+from src.service import ClassificationService, LatencyStats, MicroBatcher
+
+
+class TestMicroBatcher(unittest.TestCase):
+    """测试微批合并"""
+
+    def test_concurrent_jobs_merged(self):
+        """测试等待窗口内的并发任务合并为一批，结果按任务拆分"""
+        batch_sizes = []
+
+        def classify_fn(titles, sites):
+            batch_sizes.append(len(titles))
+            return [f'{t}@{s}' for t, s in zip(titles, sites)]
+
+        batcher = MicroBatcher(classify_fn, max_batch_size=100, max_wait_ms=200).start()
+        futures = [batcher.submit([f't{i}', f'u{i}'], ['JP', 'US']) for i in range(5)]
+        results = [f.result(timeout=5) for f in futures]
+        batcher.stop()
+
+        self.assertEqual(results[3], ['t3@JP', 'u3@US'])
+        self.assertEqual(batch_sizes, [10])
+        self.assertEqual(batcher.info()['mean_batch_size'], 10.0)
+
+    def test_max_batch_size(self):
+        """测试累计记录数达到上限时立即成批"""
+        batch_sizes = []
+        gate = threading.Event()
+
+        def classify_fn(titles, sites):
+            gate.wait(5)
+            batch_sizes.append(len(titles))
+            return list(titles)
+
+        batcher = MicroBatcher(classify_fn, max_batch_size=3, max_wait_ms=1000).start()
+        futures = [batcher.submit([i], ['US']) for i in range(7)]
+        gate.set()
+        self.assertEqual([f.result(timeout=5)[0] for f in futures], list(range(7)))
+        batcher.stop()
+        self.assertTrue(all(size <= 3 for size in batch_sizes))
+        self.assertEqual(sum(batch_sizes), 7)
+
+    def test_error_propagates(self):
+        """测试批量调用异常传递给同批所有任务"""
+        def classify_fn(titles, sites):
+            raise RuntimeError('boom')
+
+        batcher = MicroBatcher(classify_fn, max_wait_ms=0).start()
+        with self.assertRaises(RuntimeError):
+            batcher.submit(['a'], ['US']).result(timeout=5)
+        batcher.stop()
+
+
+class TestLatencyStats(unittest.TestCase):
+    """测试延迟分位数"""
+
+    def test_percentiles(self):
+        stats = LatencyStats(window=100)
+        for ms in range(1, 201):
+            stats.record(ms / 1000.0)
+        summary = stats.summary()
+        self.assertEqual(summary['count'], 200)
+        self.assertAlmostEqual(summary['p50_ms'], 150.5)
+        self.assertEqual(summary['max_ms'], 200.0)
+
+
+class TestClassificationService(unittest.TestCase):
+    """测试 HTTP 端点，结果与批量处理一致"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.classifier = GlobalLightClassifier('config/signals.json', 'config/scoring_models.json',
+                                               'config/hard_filters.json')
+        cls.service = ClassificationService(cls.classifier, port=0, max_wait_ms=1).start()
+        host, port = cls.service.address
+        cls.base = f'http://{host}:{port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.service.shutdown()
+
+    def _post(self, path, payload):
+        request = urllib.request.Request(self.base + path, data=json.dumps(payload).encode('utf-8'),
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return json.loads(response.read())
+
+    def test_single_and_batch(self):
+        """测试单条与批量端点结果与 process 一致，延迟统计可读"""
+        df = pd.DataFrame({'SKU标题': ['NiceVeedi Ring Light リングライト', 'Godox Speedlite TTL'],
+                           'site': ['JP', 'US']})
+        expected = self.classifier.process(df, mode='columnar')
+
+        single = self._post('/classify', {'title': df.at[0, 'SKU标题'], 'site': 'JP'})
+        self.assertEqual(single['predicted_category'], expected.at[0, 'predicted_category'])
+        self.assertEqual(single['decision_reason'], expected.at[0, 'decision_reason'])
+        self.assertEqual(single['scores_all'], expected.at[0, 'scores_all'])
+
+        batch = self._post('/classify/batch', {'items': [{'title': t, 'site': s}
+                                                         for t, s in zip(df['SKU标题'], df['site'])]})
+        self.assertEqual([r['decision_reason'] for r in batch['results']],
+                         expected['decision_reason'].tolist())
+
+        with urllib.request.urlopen(self.base + '/stats', timeout=10) as response:
+            stats = json.loads(response.read())
+        self.assertGreaterEqual(stats['latency']['/classify']['count'], 1)
+        self.assertIn('p99_ms', stats['latency']['/classify/batch'])
+
+    def test_version_and_reload(self):
+        """测试结果带配置版本；配置未变时重新加载不切换，未知版本返回400"""
+        version = self.classifier.config_hash[:12]
+        self.assertEqual(self._post('/classify', {'title': 'ring light'})['config_version'], version)
+        with urllib.request.urlopen(self.base + '/version', timeout=10) as response:
+            self.assertEqual(json.loads(response.read())['active'], version)
+        self.assertEqual(self._post('/reload', {}), {'version': version, 'changed': False})
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            self._post('/activate', {'version': 'missing'})
+        self.assertEqual(ctx.exception.code, 400)
+
+    def test_bad_request(self):
+        """测试请求体格式错误返回400"""
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            self._post('/classify/batch', {'items': 'not a list'})
+        self.assertEqual(ctx.exception.code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
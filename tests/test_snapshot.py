@@ -0,0 +1,89 @@
+"""
+编译配置快照单元测试
+"""
+import unittest
+import sys
+import os
+import shutil
+import subprocess
+import tempfile
+
+import pandas as pd
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.snapshot import compile_snapshot, load_classifier, load_snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    """测试快照编译、加载与失效"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.config_dir = os.path.join(self.tmp, 'config')
+        shutil.copytree('config', self.config_dir)
+        self.paths = [os.path.join(self.config_dir, name)
+                      for name in ('signals.json', 'scoring_models.json', 'hard_filters.json')]
+        self.snapshot = os.path.join(self.tmp, 'compiled', 'engine.pickle')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_roundtrip(self):
+        """测试加载的快照与直接构建的分类器结果一致，第二次运行命中快照"""
+        compiled, loaded = load_classifier(*self.paths, snapshot_path=self.snapshot, cache_size=10)
+        self.assertFalse(loaded)
+        restored, loaded = load_classifier(*self.paths, snapshot_path=self.snapshot, cache_size=10)
+        self.assertTrue(loaded)
+        self.assertEqual(restored.title_cache.maxsize, 10)
+        self.assertEqual(restored.config_hash, compiled.config_hash)
+
+        df = pd.DataFrame({'SKU标题': ['NiceVeedi Ring Light リングライト', 'Godox Speedlite TTL',
+                                     'LED パネルライト 5600K CRI95 60W', 'tripod stand'],
+                           'site': ['JP', 'US', 'JP', 'US']})
+        for mode in ['row', 'columnar']:
+            pd.testing.assert_frame_equal(restored.process(df, mode=mode), compiled.process(df, mode=mode))
+
+    def test_invalidation(self):
+        """测试配置内容变更、词边界设置不同时快照失效；只改修改时间不失效"""
+        compile_snapshot(*self.paths, self.snapshot)
+
+        stat = os.stat(self.paths[1])
+        os.utime(self.paths[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertIsNotNone(load_snapshot(*self.paths, self.snapshot))
+        self.assertIsNone(load_snapshot(*self.paths, self.snapshot, word_boundary_max_len=4))
+
+        with open(self.paths[2], 'a', encoding='utf-8') as f:
+            f.write('\n')
+        self.assertIsNone(load_snapshot(*self.paths, self.snapshot))
+
+    def test_corrupt_snapshot(self):
+        """测试损坏的快照文件被忽略并重新编译"""
+        os.makedirs(os.path.dirname(self.snapshot))
+        with open(self.snapshot, 'wb') as f:
+            f.write(b'not a pickle')
+        self.assertIsNone(load_snapshot(*self.paths, self.snapshot))
+        _, loaded = load_classifier(*self.paths, snapshot_path=self.snapshot)
+        self.assertFalse(loaded)
+        self.assertIsNotNone(load_snapshot(*self.paths, self.snapshot))
+
+
+class TestLazyImports(unittest.TestCase):
+    """测试纯标题分类不导入 pandas"""
+
+    def test_classify_titles_without_pandas(self):
+        code = ('import sys\n'
+                'from src.snapshot import load_classifier\n'
+                "c, _ = load_classifier('config/signals.json', 'config/scoring_models.json', "
+                "'config/hard_filters.json')\n"
+                "c.classify_titles(['Godox Speedlite TTL'], ['US'])\n"
+                "print('pandas' in sys.modules)\n")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True,
+                                text=True, check=True).stdout
+        self.assertEqual(output.strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
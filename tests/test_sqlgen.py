@@ -0,0 +1,95 @@
+"""
+SQL 编译模块单元测试
+在本地 SQLite 上执行生成的 SQL，与分类器结果逐行比较
+"""
+import unittest
+import sys
+import os
+import json
+import re
+import sqlite3
+
+import pandas as pd
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.benchmark import generate_titles
+from src.classifier import GlobalLightClassifier
+from src.sqlgen import compile_sql
+
+
+class TestCompileSql(unittest.TestCase):
+    """测试生成的 SQL 与 GlobalLightClassifier 第二阶段输出一致"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.classifier = GlobalLightClassifier('config/signals.json', 'config/scoring_models.json',
+                                               'config/hard_filters.json')
+        with open('tests/test_cases.json', 'r', encoding='utf-8') as f:
+            cases = json.load(f)['test_cases']
+        df = generate_titles(cls.classifier.signals, cls.classifier.hard_filters['accessories'], 3000,
+                             seed=3, accessory_rate=0.1)
+        extra = pd.DataFrame({
+            'SKU标题': [case['sku_title'] for case in cases] + [
+                # 3000K-6500K 的色温范围得分为 .125/.875 结尾，检验取整与 Python round 一致
+                'cob video light 3000k-6500k 60w', 'ring light 2700k-6500k cri 96', float('nan'),
+                "o'neill softbox 5600k",
+                # 全部品类得分为负，最高分为 灯光类-其他 的整数0：'Low Score: 0 < 30'
+                '视频灯 @ pano 运动摄影 underwater light 5600K'],
+            'site': [case['site'] for case in cases] + ['US', 'jp', 'US', None, 'jp'],
+        })
+        cls.df = pd.concat([df[['SKU标题', 'site']], extra], ignore_index=True)
+
+        # 第一阶段输出（clean_title、site、raw_* 规格列）作为 SQL 的输入表
+        stage1 = cls.classifier.process(cls.df, stage=1, mode='columnar')
+        cls.connection = sqlite3.connect(':memory:')
+        stage1.astype(object).to_sql('items', cls.connection, index=False)
+        cls.expected = cls.classifier.process(cls.df, stage=2, mode='columnar', typed=True)
+        scores_all = cls.classifier.process(cls.df, stage=2, mode='columnar')['scores_all']
+        cls.expected_scores = pd.DataFrame(list(scores_all))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.connection.close()
+
+    def test_matches_classifier(self):
+        """测试标签、得分、预测品类与裁决原因逐行一致"""
+        result = pd.read_sql_query(compile_sql(self.classifier), self.connection)
+        self.assertEqual(len(result), len(self.df))
+        self.assertEqual(result['predicted_category'].tolist(), self.expected['predicted_category'].tolist())
+        self.assertEqual(result['decision_reason'].tolist(), self.expected['decision_reason'].tolist())
+        self.assertEqual(result['decision_reason'].iloc[-1], 'Low Score: 0 < 30')
+        for tag in self.classifier.tags:
+            self.assertEqual(result[tag].tolist(), self.expected[tag].tolist(), tag)
+        for category in self.classifier.scoring_engine.categories:
+            self.assertEqual(result[f'score_{category}'].tolist(), self.expected_scores[category].tolist(),
+                             category)
+
+    def test_identifiers_defined(self):
+        """测试 SQL 中引用的每个带引号列名都由 CTE 定义（SQLite 会把未定义的列名当作字符串）"""
+        for dialect in ('sqlite', 'ansi'):
+            sql = re.sub(r"'(?:[^']|'')*'", '', compile_sql(self.classifier, dialect=dialect))
+            used = set(re.findall(r'"((?:[^"]|"")*)"', sql))
+            defined = set(re.findall(r'AS "((?:[^"]|"")*)"', sql))
+            self.assertEqual(used - defined, set(), dialect)
+
+    def test_source_subquery(self):
+        """测试输入可以是带括号的子查询"""
+        sql = compile_sql(self.classifier, source="(SELECT * FROM items WHERE site = 'JP')")
+        result = pd.read_sql_query(sql, self.connection)
+        self.assertEqual(len(result), int((self.df['site'] == 'JP').sum()))
+
+    def test_unsupported(self):
+        """测试未知方言与词边界匹配报错"""
+        with self.assertRaises(ValueError):
+            compile_sql(self.classifier, dialect='oracle')
+        bounded = GlobalLightClassifier('config/signals.json', 'config/scoring_models.json',
+                                        'config/hard_filters.json', word_boundary_max_len=4)
+        with self.assertRaises(ValueError):
+            compile_sql(bounded)
+        self.assertIn('POSITION(', compile_sql(self.classifier, dialect='ansi'))
+
+
+if __name__ == '__main__':
+    unittest.main()
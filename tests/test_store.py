@@ -0,0 +1,104 @@
+"""
+持久化分类缓存单元测试
+"""
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.classifier import GlobalLightClassifier
+from src.store import ClassificationStore, config_hash
+
+
+class TestClassificationStore(unittest.TestCase):
+    """测试缓存读写与配置隔离"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_roundtrip(self):
+        """测试写入后按 (标题, 国家) 命中，掩码与向量逐位一致"""
+        store = ClassificationStore(self.tmp, 'hash-a')
+        specs = np.array([[1.0, 0.0, 0.25]])
+        scores = np.array([[12.34, 56.78]])
+        store.save(['ring light'], ['US'], np.array([0b101], dtype=np.uint32), specs, scores,
+                   ['环形灯'], ['High Score: 环形灯 (56.78)'])
+
+        found, tag_masks, specs_out, scores_out, categories, reasons = store.lookup(
+            ['ring light', 'ring light', 'panel'], ['US', 'JP', 'US'], 3, 2)
+        self.assertEqual(found.tolist(), [True, False, False])
+        self.assertEqual(tag_masks.tolist(), [0b101, 0, 0])
+        np.testing.assert_array_equal(specs_out[0], specs[0])
+        np.testing.assert_array_equal(scores_out[0], scores[0])
+        self.assertEqual(categories[0], '环形灯')
+        self.assertEqual(reasons[0], 'High Score: 环形灯 (56.78)')
+        self.assertEqual((store.hits, store.misses), (1, 2))
+        store.close()
+
+    def test_config_hash_isolation(self):
+        """测试不同配置哈希互不命中，prune 删除旧配置条目"""
+        old = ClassificationStore(self.tmp, 'hash-a')
+        old.save(['ring light'], ['US'], [0], np.zeros((1, 1)), np.zeros((1, 1)), ['环形灯'], ['r'])
+        old.close()
+
+        new = ClassificationStore(self.tmp, 'hash-b')
+        found = new.lookup(['ring light'], ['US'], 1, 1)[0]
+        self.assertFalse(found[0])
+        self.assertEqual(new.prune(), 1)
+        new.close()
+
+    def test_config_hash_content(self):
+        """测试配置哈希随内容与额外参数变化"""
+        paths = ['config/signals.json', 'config/scoring_models.json', 'config/hard_filters.json']
+        self.assertEqual(config_hash(*paths), config_hash(*paths))
+        self.assertNotEqual(config_hash(*paths), config_hash(*paths, extra='word_boundary=4'))
+
+
+class TestClassifierStore(unittest.TestCase):
+    """测试持久化缓存不改变分类结果"""
+
+    def test_cached_run_matches(self):
+        """测试首次运行与命中缓存后的输出均与不使用缓存一致"""
+        df = pd.DataFrame({
+            'SKU标题': ['NiceVeedi Ring Light リングライト', 'Godox Speedlite TTL',
+                      'LED パネルライト 5600K CRI95 60W', 'tripod stand'],
+            'site': ['JP', 'US', 'JP', 'US'],
+        })
+        classifier = GlobalLightClassifier('config/signals.json', 'config/scoring_models.json',
+                                           'config/hard_filters.json')
+        expected = classifier.process(df, mode='columnar')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ClassificationStore(tmp, classifier.config_hash)
+            first = classifier.process(df.iloc[:2], mode='columnar', store=store)
+            pd.testing.assert_frame_equal(first, expected.iloc[:2])
+            self.assertEqual((store.hits, store.misses), (0, 2))
+
+            second = classifier.process(df, mode='columnar', store=store)
+            pd.testing.assert_frame_equal(second, expected)
+            self.assertEqual((store.hits, store.misses), (2, 4))
+            store.close()
+
+    def test_row_mode_rejected(self):
+        """测试逐行模式不支持持久化缓存"""
+        classifier = GlobalLightClassifier('config/signals.json', 'config/scoring_models.json',
+                                           'config/hard_filters.json')
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ClassificationStore(tmp, classifier.config_hash)
+            with self.assertRaises(ValueError):
+                classifier.process(pd.DataFrame({'SKU标题': ['light']}), mode='row', store=store)
+            store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
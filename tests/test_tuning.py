@@ -0,0 +1,135 @@
+"""
+权重调优模块单元测试
+"""
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+import numpy as np
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.benchmark import generate_titles
+from src.classifier import GlobalLightClassifier
+from src.features import FeatureSet, FeatureWriter
+from src.scoring import ScoringEngine
+from src.tuning import TuningProblem, WeightSpace, evaluate_snapshot, save_tuned_config, tune
+
+
+def _make_classifier(config_dir='config'):
+    return GlobalLightClassifier(os.path.join(config_dir, 'signals.json'),
+                                 os.path.join(config_dir, 'scoring_models.json'),
+                                 os.path.join(config_dir, 'hard_filters.json'))
+
+
+class TestTuning(unittest.TestCase):
+    """测试批量评估与分类器一致，以及调优结果"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        cls.classifier = _make_classifier()
+        df = generate_titles(cls.classifier.signals, cls.classifier.hard_filters['accessories'], 3000, seed=7)
+        path = os.path.join(cls.tmp, 'features')
+        with FeatureWriter(path, cls.classifier) as writer:
+            _, features = cls.classifier.process(df, mode='columnar', return_features=True)
+            writer.write(features)
+        cls.feature_set = FeatureSet(path)
+
+        # 标注由改动过权重的配置生成，调优应能向它靠拢
+        cls.true_dir = os.path.join(cls.tmp, 'true')
+        shutil.copytree('config', cls.true_dir)
+        models = dict(cls.classifier.scoring_models)
+        models['平板灯'] = dict(models['平板灯'], base_score=models['平板灯']['base_score'] + 40)
+        models['棒灯'] = dict(models['棒灯'], base_score=models['棒灯']['base_score'] - 30)
+        with open(os.path.join(cls.true_dir, 'scoring_models.json'), 'w', encoding='utf-8') as f:
+            json.dump(models, f, ensure_ascii=False, indent=2)
+        _, _, categories, _ = _make_classifier(cls.true_dir).rescore_features(cls.feature_set)
+        cls.labels = categories[np.asarray(cls.feature_set.row_index)]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp)
+
+    def _space(self):
+        return WeightSpace(self.classifier.scoring_models, self.classifier.scoring_engine)
+
+    def test_accuracy_matches_classifier(self):
+        """测试批量评估的准确率与分类器重评分后的准确率一致（含配件拦截与形态锁定）"""
+        problem = TuningProblem(self.classifier, self.feature_set, self.labels)
+        space = self._space()
+        rng = np.random.default_rng(0)
+        thetas = np.vstack([space.initial, np.round(space.initial + rng.normal(size=(3, len(space))) * 20)])
+        train, holdout = problem.accuracy(*space.matrices(thetas))
+        self.assertTrue((holdout == 0).all())
+
+        for theta, accuracy in zip(thetas, train):
+            config_dir = os.path.join(self.tmp, 'candidate')
+            save_tuned_config(space.to_models(theta), 'config', config_dir)
+            report = evaluate_snapshot(_make_classifier(config_dir), self.feature_set, self.labels)
+            self.assertAlmostEqual(accuracy, report['accuracy'], places=12)
+
+    def test_raw_scores_match_engine(self):
+        """测试候选得分与按候选配置构建的 ScoringEngine 逐位一致（含小数权重与只计算部分品类）"""
+        problem = TuningProblem(self.classifier, self.feature_set, self.labels)
+        space = self._space()
+        rng = np.random.default_rng(3)
+        thetas = np.round(space.initial + rng.normal(size=(3, len(space))) * 20, 3)
+        raw = problem.raw_scores(*space.matrices(thetas))
+        for k, theta in enumerate(thetas):
+            engine = ScoringEngine(space.to_models(theta, decimals=3), self.classifier.scoring_engine.features)
+            np.testing.assert_array_equal(raw[:, k, :], engine._accumulate(problem.X))
+        partial = problem.raw_scores(*space.matrices(thetas), categories=[4, 1])
+        np.testing.assert_array_equal(partial, raw[:, :, [4, 1]])
+
+    def test_coordinate_gains(self):
+        """测试单参数增量评估与完整评估一致"""
+        problem = TuningProblem(self.classifier, self.feature_set, self.labels, holdout=0.3, seed=1)
+        space = self._space()
+        theta = space.initial
+        raw = problem.raw_scores(*space.matrices(theta))[:, 0]
+        base_train, base_holdout = problem.accuracy(*space.matrices(theta))
+        deltas = np.array([-60.0, -10.0, 15.0, 45.0])
+        for p in [0, 1, 5, len(space) - 1]:
+            category, feature = space.parameters[p][:2]
+            column = np.ones(len(problem)) if feature is None else problem.X[:, feature]
+            train, holdout = problem.coordinate_gains(raw, category, column, deltas)
+            thetas = np.repeat(theta[np.newaxis], len(deltas), axis=0)
+            thetas[:, p] += deltas
+            full_train, full_holdout = problem.accuracy(*space.matrices(thetas))
+            np.testing.assert_allclose(base_train + train, full_train, atol=1e-12)
+            np.testing.assert_allclose(base_holdout + holdout, full_holdout, atol=1e-12)
+
+    def test_tune_improves(self):
+        """测试调优提高准确率，写出的配置复核结果与搜索一致，且保持原有的键顺序"""
+        problem = TuningProblem(self.classifier, self.feature_set, self.labels)
+        space = self._space()
+        theta, history = tune(problem, space, rounds=3, candidates=16, seed=0)
+        self.assertGreater(history[-1]['train'], history[0]['train'])
+        self.assertEqual(history, sorted(history, key=lambda h: h['train']))
+
+        output_dir = os.path.join(self.tmp, 'tuned')
+        save_tuned_config(space.to_models(theta), 'config', output_dir)
+        with open(os.path.join(output_dir, 'scoring_models.json'), 'r', encoding='utf-8') as f:
+            tuned = json.load(f)
+        for category, model in self.classifier.scoring_models.items():
+            self.assertEqual(list(tuned[category]['weights']), list(model['weights']))
+            self.assertTrue(all(isinstance(w, int) for w in tuned[category]['weights'].values()))
+        report = evaluate_snapshot(_make_classifier(output_dir), self.feature_set, self.labels)
+        self.assertAlmostEqual(report['accuracy'], history[-1]['train'], places=12)
+
+        with self.assertRaises(ValueError):
+            save_tuned_config(tuned, 'config', 'config')
+
+    def test_label_mismatch(self):
+        """测试标注行数与快照不一致时报错"""
+        with self.assertRaises(ValueError):
+            TuningProblem(self.classifier, self.feature_set, self.labels[:-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,11 +4,21 @@
 import unittest
 import sys
 import os
+import re
+import unicodedata
+from unittest import mock
+
+import pandas as pd
 
 # 添加父目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.utils import normalize_text, extract_specs, extract_raw_specs
+from src.utils import (SPEC_FEATURES, RAW_SPEC_COLUMNS, normalize_text, extract_specs,
+                       extract_raw_specs, normalize_series, extract_specs_columns,
+                       extract_raw_specs_columns, extract_spec_values_columns,
+                       scan_specs, extract_spec_values,
+                       extract_kelvin_raw, extract_cri_raw, extract_wattage_raw,
+                       extract_lumens_raw, extract_lux_raw)
 
 
 class TestNormalizeText(unittest.TestCase):
@@ -43,6 +53,19 @@ class TestNormalizeText(unittest.TestCase):
         self.assertEqual(normalize_text(123), "")
         self.assertEqual(normalize_text(None), "")
 
+    def test_matches_reference_implementation(self):
+        """测试ASCII快速路径与通用路径都与 NFKC + lower + re.sub 逐字节一致"""
+        def reference(text):
+            text = unicodedata.normalize('NFKC', text).lower()
+            text = re.sub(r'[^\w\s\.\-ー]', ' ', text)
+            return re.sub(r'\s+', ' ', text).strip()
+
+        texts = [chr(c) for c in range(0x3100)] + [chr(c) for c in range(0xff00, 0x10000)]
+        texts = [t for c in texts for t in (c, f'A{c}b', f' {c}{c} x')]
+        texts += ['\x1cLED\x1f\x0bRing\x85Light\u3000', 'İstanbul ǅ ﬀ ẞ', 'Godox SL-60W (5600K)']
+        for text in texts:
+            self.assertEqual(normalize_text(text), reference(text), repr(text))
+
 
 class TestExtractSpecs(unittest.TestCase):
     """测试规格提取函数（归一化）"""
@@ -250,5 +273,80 @@ class TestExtractRawSpecs(unittest.TestCase):
         self.assertEqual(result['raw_lux'], 0)
 
 
+class TestScanSpecs(unittest.TestCase):
+    """测试规格单遍扫描与逐项提取一致"""
+
+    TEXTS = [
+        "3000k-7200k", "2500 - 8500k cob", "1500k-6000k 5600k", "3000-6500k 3000k-7200k",
+        "123456k", "cri 95-97", "cri 60-65 cri 97", "97cri", "tlci:90", "5 tlci 99 w",
+        "1234,567lm", "12,500lm 5000lx", "light 810000lm", "5000ルクス 120ワット",
+        "5600ケルビン", "ip68 10000lm", "no specs here", "",
+    ]
+
+    def test_matches_individual_extractors(self):
+        """测试与逐项正则提取结果一致（含范围优先级与上下限）"""
+        for text in self.TEXTS:
+            expected = (*extract_kelvin_raw(text), extract_cri_raw(text), extract_wattage_raw(text),
+                        extract_lumens_raw(text), extract_lux_raw(text))
+            self.assertEqual(scan_specs(text), expected, text)
+
+    def test_raw_and_normalized_together(self):
+        """测试一次扫描同时返回原始值与归一化值"""
+        raw, specs = extract_spec_values("120w cri 96 3000k-7200k")
+        self.assertEqual(raw, extract_raw_specs("120w cri 96 3000k-7200k"))
+        self.assertEqual(specs, extract_specs("120w cri 96 3000k-7200k"))
+
+
+class TestColumnFunctions(unittest.TestCase):
+    """测试整列函数与逐条函数结果一致"""
+
+    TEXTS = [
+        "Ｌｅｄライト 120W", "LED!ライト@#", "  led\tlight  ", "3000k-7200k cri 97",
+        "2500 - 8500k cob", "cri 95-97 12,500lm", "light 810000lm 5000ルクス",
+        "123456k 99 w", "tlci:60 ring", "", "5600k",
+    ]
+
+    def test_normalize_series(self):
+        """测试整列标准化"""
+        raw = pd.Series(self.TEXTS + [None, 123])
+        result = normalize_series(raw).tolist()
+        self.assertEqual(result, [normalize_text(t) for t in raw.tolist()])
+
+    def test_normalize_series_ascii(self):
+        """测试纯ASCII标题走 Arrow 内核（含控制字符）、未安装 pyarrow 时回退，结果都与逐条一致"""
+        raw = pd.Series([f'{chr(c)}LED{chr(c)}{chr(c)}Light{chr(c)}' for c in range(128)]
+                        + self.TEXTS + [None], index=range(10, 10 + 128 + len(self.TEXTS) + 1))
+        expected = [normalize_text(t) for t in raw.tolist()]
+
+        result = normalize_series(raw)
+        self.assertEqual(result.tolist(), expected)
+        self.assertTrue(result.index.equals(raw.index))
+        with mock.patch('src.utils._normalize_ascii_arrow', return_value=None):
+            self.assertEqual(normalize_series(raw).tolist(), expected)
+
+    def test_extract_specs_columns(self):
+        """测试整列规格提取（归一化）"""
+        texts = pd.Series([normalize_text(t) for t in self.TEXTS])
+        matrix = extract_specs_columns(texts)
+        for text, row in zip(texts, matrix.tolist()):
+            self.assertEqual(dict(zip(SPEC_FEATURES, row)), extract_specs(text))
+
+    def test_extract_raw_specs_columns(self):
+        """测试整列规格提取（原始值）"""
+        texts = pd.Series([normalize_text(t) for t in self.TEXTS])
+        columns = extract_raw_specs_columns(texts)
+        for i, text in enumerate(texts):
+            row = {col: int(columns[col][i]) for col in RAW_SPEC_COLUMNS}
+            self.assertEqual(row, extract_raw_specs(text))
+
+    def test_extract_spec_values_columns(self):
+        """测试整列一次扫描同时得到原始值与归一化值"""
+        texts = pd.Series([normalize_text(t) for t in self.TEXTS])
+        raw_specs, matrix = extract_spec_values_columns(texts)
+        self.assertEqual(matrix.tolist(), extract_specs_columns(texts).tolist())
+        for col, values in extract_raw_specs_columns(texts).items():
+            self.assertEqual(raw_specs[col].tolist(), values.tolist())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,162 @@
+"""
+权重调优入口
+在特征快照上用坐标下降 + 随机搜索调整 scoring_models.json 的基础分与权重，
+按 hard_filters.json 的裁决规则计算准确率，输出可直接使用的配置目录
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.classifier import GlobalLightClassifier
+from src.features import FeatureSet
+from src.pipeline import read_input
+from src.tuning import TuningProblem, WeightSpace, evaluate_snapshot, save_tuned_config, tune
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='全球灯光类目分类引擎 - 评分权重调优',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  # 先对标注数据保存特征快照（标注列 子类目(中文) 随透传列一起保存）
+  python main.py --data 全市场灯光类.csv --save-features data/features
+
+  # 以 子类目(中文) 为标注调优，留出20%的标题验证，结果写入 data/tuned
+  python tune.py --features data/features --output-dir data/tuned
+
+  # 标注在另一个文件中（与快照的输入行一一对应），按 GMV 加权
+  python tune.py --features data/features --labels 全市场灯光类.csv --gmv-column gmv
+
+  # 检查结果后评估或替换配置
+  python evaluate.py --data 全市场灯光类.csv --config-dir data/tuned
+        '''
+    )
+
+    parser.add_argument('--features', required=True, help='特征快照目录 (main.py --save-features)')
+    parser.add_argument('--labels', help='标注文件（行与快照的输入行一一对应，默认读取快照的透传列）')
+    parser.add_argument('--label-column', default='子类目(中文)', help='标注品类列 (默认: 子类目(中文))')
+    parser.add_argument('--gmv-column', help='GMV 列，提供时按 GMV 加权准确率调优')
+    parser.add_argument('--config-dir', default='config', help='配置文件目录 (默认: config)')
+    parser.add_argument('--output-dir', default='data/tuned', help='调优后的配置目录 (默认: data/tuned)')
+    parser.add_argument('--rounds', type=int, default=10, help='最多搜索轮数 (默认: 10)')
+    parser.add_argument('--candidates', type=int, default=64, help='每轮随机搜索的候选数 (默认: 64)')
+    parser.add_argument('--holdout', type=float, default=0.2, help='留出验证的标题比例 (默认: 0.2)')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子 (默认: 0)')
+    parser.add_argument('--decimals', type=int, default=0, help='权重保留的小数位数 (默认: 0，整数)')
+    parser.add_argument('--fixed-base', action='store_true', help='不调整各品类的基础分')
+    parser.add_argument('--word-boundary', type=int, default=0, metavar='N',
+                        help='须与保存快照时的 --word-boundary 一致 (默认: 0)')
+
+    args = parser.parse_args()
+
+    if not 0 <= args.holdout < 1:
+        print('错误: --holdout 须在 [0, 1) 之间')
+        sys.exit(1)
+    for path in (args.features, args.labels):
+        if path and not os.path.exists(path):
+            print(f"错误: 文件不存在: {path}")
+            sys.exit(1)
+
+    signals_path = os.path.join(args.config_dir, 'signals.json')
+    scoring_path = os.path.join(args.config_dir, 'scoring_models.json')
+    filters_path = os.path.join(args.config_dir, 'hard_filters.json')
+    for path in (signals_path, scoring_path, filters_path):
+        if not os.path.exists(path):
+            print(f"错误: 配置文件不存在: {path}")
+            sys.exit(1)
+
+    try:
+        classifier = GlobalLightClassifier(signals_path, scoring_path, filters_path,
+                                           word_boundary_max_len=args.word_boundary)
+        feature_set = FeatureSet(args.features)
+    except Exception as e:
+        print(f"错误: 初始化失败: {e}")
+        sys.exit(1)
+
+    # 标注与 GMV
+    columns = [args.label_column] + ([args.gmv_column] if args.gmv_column else [])
+    try:
+        if args.labels:
+            df = read_input(args.labels, columns=columns)
+        else:
+            df = feature_set.read_columns(columns)
+    except Exception as e:
+        print(f"错误: 标注加载失败: {e}")
+        sys.exit(1)
+    for col in columns:
+        if col not in df.columns:
+            print(f"错误: 标注数据中没有列: {col}")
+            sys.exit(1)
+    labels = df[args.label_column]
+    weights = df[args.gmv_column] if args.gmv_column else None
+
+    started = time.perf_counter()
+    try:
+        problem = TuningProblem(classifier, feature_set, labels, weights=weights,
+                                holdout=args.holdout, seed=args.seed)
+    except ValueError as e:
+        print(f"错误: {e}")
+        sys.exit(1)
+    space = WeightSpace(classifier.scoring_models, classifier.scoring_engine, tune_base=not args.fixed_base)
+    print(f'特征快照: {args.features} ({len(feature_set)} 行, 标注 {problem.labelled_rows} 行)')
+    print(f'  配件拦截/形态锁定: {problem.fixed_keys} 个标题 (与权重无关)')
+    print(f'  参与搜索: {len(problem)} 个不同特征向量, {len(space)} 个参数 '
+          f'({time.perf_counter() - started:.2f}s)')
+
+    def log(round_number, train, holdout):
+        print(f'  第 {round_number} 轮: 训练 {train:.2%}, 留出 {holdout:.2%} '
+              f'({time.perf_counter() - started:.1f}s)')
+
+    started = time.perf_counter()
+    theta, history = tune(problem, space, rounds=args.rounds, candidates=args.candidates,
+                          seed=args.seed, decimals=args.decimals, log=log)
+    print(f"\n搜索: 训练 {history[0]['train']:.2%} → {history[-1]['train']:.2%}, "
+          f"留出 {history[0]['holdout']:.2%} → {history[-1]['holdout']:.2%}")
+
+    models = space.to_models(theta, args.decimals)
+    try:
+        output = save_tuned_config(models, args.config_dir, args.output_dir)
+    except ValueError as e:
+        print(f"错误: {e}")
+        sys.exit(1)
+
+    # 用调优后的配置重建分类器，逐项按引擎本身的评分与裁决复核
+    tuned = GlobalLightClassifier(os.path.join(args.output_dir, 'signals.json'), output,
+                                  os.path.join(args.output_dir, 'hard_filters.json'),
+                                  word_boundary_max_len=args.word_boundary)
+    before = evaluate_snapshot(classifier, feature_set, labels, weights)
+    after = evaluate_snapshot(tuned, feature_set, labels, weights)
+    print(f"复核: 准确率 {before['accuracy']:.2%} → {after['accuracy']:.2%}")
+    if after['gmv_accuracy'] is not None:
+        print(f"      GMV 加权准确率 {before['gmv_accuracy']:.2%} → {after['gmv_accuracy']:.2%}")
+
+    changes = [(category, name, before_value, after_value)
+               for (_, _, category, name), before_value, after_value
+               in zip(space.parameters, space.initial.tolist(), theta.tolist())
+               if before_value != after_value]
+    print(f'\n调整了 {len(changes)} / {len(space)} 个参数:')
+    for category, name, before_value, after_value in changes[:20]:
+        print(f'  {category:<12} {name:<22} {before_value:>8g} → {after_value:g}')
+    if len(changes) > 20:
+        print('  ... 完整记录见 tuning.json')
+
+    with open(os.path.join(args.output_dir, 'tuning.json'), 'w', encoding='utf-8') as f:
+        json.dump({'features': args.features, 'config_hash': classifier.config_hash,
+                   'accuracy': {'before': before['accuracy'], 'after': after['accuracy']},
+                   'gmv_accuracy': {'before': before['gmv_accuracy'], 'after': after['gmv_accuracy']},
+                   'history': history,
+                   'changes': [{'category': c, 'parameter': n, 'before': b, 'after': a}
+                               for c, n, b, a in changes]},
+                  f, ensure_ascii=False, indent=2)
+    print(f'\n调优后的配置已保存: {args.output_dir}')
+
+
+if __name__ == '__main__':
+    main()